@@ -0,0 +1,59 @@
+# Generated by Django 3.1 on 2020-08-25 09:12
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+CHUNK_SIZE = 1000
+
+
+def populate_user_search_document(apps, schema_editor):
+    User = apps.get_model("account", "User")
+    users = User.objects.order_by("pk").select_related("default_shipping_address")
+    last_pk = 0
+    while True:
+        chunk = list(users.filter(pk__gt=last_pk)[:CHUNK_SIZE])
+        if not chunk:
+            return
+        for user in chunk:
+            search_document = [user.email, user.first_name, user.last_name]
+            address = user.default_shipping_address
+            if address:
+                search_document.extend(
+                    [
+                        address.first_name,
+                        address.last_name,
+                        address.city,
+                        address.country.code,
+                        str(address.country.name),
+                    ]
+                )
+            user.search_document = "\n".join(
+                value for value in search_document if value
+            ).lower()
+        User.objects.bulk_update(chunk, ["search_document"])
+        last_pk = chunk[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("account", "0047_auto_20200810_1415"),
+        ("product", "0037_auto_20171124_0847"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="search_document",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_document"],
+                name="user_search_gin",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.RunPython(populate_user_search_document, migrations.RunPython.noop),
+    ]
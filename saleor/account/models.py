@@ -5,12 +5,16 @@ from django.contrib.auth.models import _user_has_perm  # type: ignore
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
+    Group,
     Permission,
     PermissionsMixin,
 )
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.db.models import JSONField  # type: ignore
 from django.db.models import Q, QuerySet, Value
+from django.db.models.signals import m2m_changed, post_delete
+from django.dispatch import receiver
 from django.forms.models import model_to_dict
 from django.utils import timezone
 from django.utils.crypto import get_random_string
@@ -18,10 +22,17 @@ from django_countries.fields import Country, CountryField
 from phonenumber_field.modelfields import PhoneNumber, PhoneNumberField
 from versatileimagefield.fields import VersatileImageField
 
+from ..core.auth_cache import invalidate_jwt_user_cache, invalidate_jwt_users_cache
 from ..core.models import ModelWithMetadata
 from ..core.permissions import AccountPermissions, BasePermissionEnum, get_permissions
 from ..core.utils.json_serializer import CustomJsonEncoder
+from ..search.tasks import update_user_orders_search_document_task
 from . import CustomerEvents
+from .search import (
+    USER_SEARCH_ATTNAMES,
+    USER_SEARCH_FIELDS,
+    prepare_user_search_document_value,
+)
 from .validators import validate_possible_number
 
 
@@ -125,8 +136,12 @@ class UserManager(BaseUserManager):
         )
 
     def customers(self):
+        # Staff users with orders are matched by a subquery, joining the orders
+        # would return them once per order
+        users_with_orders = self.get_queryset().filter(orders__isnull=False)
         return self.get_queryset().filter(
-            Q(is_staff=False) | (Q(is_staff=True) & Q(orders__isnull=False))
+            Q(is_staff=False)
+            | (Q(is_staff=True) & Q(pk__in=users_with_orders.values("pk")))
         )
 
     def staff(self):
@@ -152,6 +167,7 @@ class User(PermissionsMixin, ModelWithMetadata, AbstractBaseUser):
     )
     avatar = VersatileImageField(upload_to="user-avatars", blank=True, null=True)
     jwt_token_key = models.CharField(max_length=12, default=get_random_string)
+    search_document = models.TextField(blank=True, default="")
 
     USERNAME_FIELD = "email"
 
@@ -163,10 +179,57 @@ class User(PermissionsMixin, ModelWithMetadata, AbstractBaseUser):
             (AccountPermissions.MANAGE_USERS.codename, "Manage customers."),
             (AccountPermissions.MANAGE_STAFF.codename, "Manage staff."),
         )
+        indexes = [
+            GinIndex(
+                name="user_search_gin",
+                fields=["search_document"],
+                opclasses=["gin_trgm_ops"],
+            )
+        ]
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._effective_permissions = None
+        self._search_values = self._get_search_values()
+
+    def _get_search_values(self) -> tuple:
+        # Deferred fields are left out instead of being fetched to compare them
+        return tuple(self.__dict__.get(attname) for attname in USER_SEARCH_ATTNAMES)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            search_fields_changed = (
+                self._state.adding or self._get_search_values() != self._search_values
+            )
+        else:
+            search_fields_changed = bool(USER_SEARCH_FIELDS.intersection(update_fields))
+        search_document_changed = False
+        if search_fields_changed:
+            search_document = prepare_user_search_document_value(self)
+            search_document_changed = search_document != self.search_document
+            self.search_document = search_document
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "search_document"}
+        is_new = self._state.adding
+        super().save(*args, **kwargs)
+        self._search_values = self._get_search_values()
+        if search_document_changed and not is_new:
+            # Search documents of the orders contain the customer's email and name
+            update_user_orders_search_document_task.delay(self.pk)
+        invalidate_jwt_user_cache(self.pk)
+
+    def delete(self, *args, **kwargs):
+        pk = self.pk
+        result = super().delete(*args, **kwargs)
+        invalidate_jwt_user_cache(pk)
+        return result
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        # Pickling the lazy permissions queryset would evaluate it
+        state["_effective_permissions"] = None
+        return state
 
     @property
     def effective_permissions(self) -> "QuerySet[Permission]":
@@ -259,3 +322,32 @@ class StaffNotificationRecipient(models.Model):
 
     def get_email(self):
         return self.user.email if self.user else self.staff_email
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_jwt_user_cache_of_changed_users(
+    sender, instance, action, reverse, pk_set, **_kwargs
+):
+    """Drop cached users after their permission groups or permissions change."""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        invalidate_jwt_user_cache(instance.pk)
+    elif pk_set:
+        invalidate_jwt_user_cache(*pk_set)
+    else:
+        # Users removed by clearing a group or a permission are no longer known
+        invalidate_jwt_users_cache()
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_jwt_user_cache_of_changed_groups(sender, action, **_kwargs):
+    """Drop all cached users after permissions of any group change."""
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_jwt_users_cache()
+
+
+@receiver(post_delete, sender=Group)
+def invalidate_jwt_user_cache_of_deleted_group(sender, **_kwargs):
+    invalidate_jwt_users_cache()
@@ -0,0 +1,34 @@
+# Fields which are a part of the search document of a user
+USER_SEARCH_FIELDS = {
+    "email",
+    "first_name",
+    "last_name",
+    "default_shipping_address",
+    "search_document",
+}
+
+# Attributes holding the values of the search fields, compared on save to find out
+# whether the search document changed
+USER_SEARCH_ATTNAMES = (
+    "email",
+    "first_name",
+    "last_name",
+    "default_shipping_address_id",
+)
+
+
+def prepare_user_search_document_value(user) -> str:
+    """Return the lowercase text matched by the dashboard customer search."""
+    search_document = [user.email, user.first_name, user.last_name]
+    address = user.default_shipping_address
+    if address:
+        search_document.extend(
+            [
+                address.first_name,
+                address.last_name,
+                address.city,
+                address.country.code,
+                str(address.country.name),
+            ]
+        )
+    return "\n".join(value for value in search_document if value).lower()
@@ -1,3 +1,4 @@
+from unittest.mock import patch
 from urllib.parse import urlencode
 
 import i18naddress
@@ -7,6 +8,7 @@ from django.http import QueryDict
 from django.template import Context, Template
 from django_countries.fields import Country
 
+from ...order.models import Order
 from .. import forms, i18n
 from ..models import User
 from ..templatetags.i18n_address_tags import format_address
@@ -304,3 +306,54 @@ def test_remove_staff_member_with_orders(staff_user, permission_manage_products,
 def test_remove_staff_member(staff_user):
     remove_staff_member(staff_user)
     assert not User.objects.filter(pk=staff_user.pk).exists()
+
+
+def test_user_search_document_updated_on_save(customer_user):
+    assert customer_user.search_document == (
+        "test@example.com\nleslie\nwade\njohn\ndoe\nwrocław\npl\npoland"
+    )
+
+    customer_user.last_name = "Smith"
+    customer_user.save(update_fields=["last_name"])
+
+    customer_user.refresh_from_db()
+    assert "smith" in customer_user.search_document
+    assert "wade" not in customer_user.search_document
+
+
+def test_user_search_document_not_updated_on_unrelated_save(customer_user):
+    User.objects.filter(pk=customer_user.pk).update(search_document="")
+
+    customer_user.note = "Note"
+    customer_user.save(update_fields=["note"])
+
+    customer_user.refresh_from_db()
+    assert customer_user.search_document == ""
+
+
+def test_user_search_document_updated_on_save_without_update_fields(customer_user):
+    customer_user.last_name = "Smith"
+    customer_user.save()
+
+    customer_user.refresh_from_db()
+    assert "smith" in customer_user.search_document
+
+
+@patch("saleor.account.models.prepare_user_search_document_value")
+def test_user_search_document_not_prepared_on_unrelated_save(
+    mocked_prepare_value, customer_user
+):
+    user = User.objects.get(pk=customer_user.pk)
+
+    user.note = "Note"
+    user.save()
+
+    mocked_prepare_value.assert_not_called()
+
+
+def test_customers_with_orders_are_not_duplicated(staff_user, order_list):
+    Order.objects.filter(pk__in=[order.pk for order in order_list]).update(
+        user=staff_user
+    )
+
+    assert list(User.objects.customers().filter(is_staff=True)) == [staff_user]
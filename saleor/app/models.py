@@ -2,8 +2,11 @@ from typing import Set
 
 from django.contrib.auth.models import Permission
 from django.db import models
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
 from oauthlib.common import generate_token
 
+from ..core.auth_cache import invalidate_app_cache, invalidate_app_token_cache
 from ..core.models import Job, ModelWithMetadata
 from ..core.permissions import AppPermission
 from .types import AppType
@@ -37,6 +40,16 @@ class App(ModelWithMetadata):
         ordering = ("name", "pk")
         permissions = ((AppPermission.MANAGE_APPS.codename, "Manage apps",),)
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_app_cache(self.pk)
+
+    def delete(self, *args, **kwargs):
+        pk = self.pk
+        result = super().delete(*args, **kwargs)
+        invalidate_app_cache(pk)
+        return result
+
     def get_permissions(self) -> Set[str]:
         """Return the permissions of the app."""
         if not self.is_active:
@@ -70,11 +83,35 @@ class App(ModelWithMetadata):
         return perm_value in self.get_permissions()
 
 
+@receiver(m2m_changed, sender=App.permissions.through)
+def invalidate_app_cache_of_changed_apps(
+    sender, instance, action, reverse, pk_set, **_kwargs
+):
+    """Drop cached apps after their permissions change."""
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            invalidate_app_cache(instance.pk)
+    elif action in ("post_add", "post_remove"):
+        invalidate_app_cache(*pk_set)
+    elif action == "pre_clear":
+        # Apps losing the permission are no longer known after clearing it
+        invalidate_app_cache(*instance.app_set.values_list("pk", flat=True))
+
+
 class AppToken(models.Model):
     app = models.ForeignKey(App, on_delete=models.CASCADE, related_name="tokens")
     name = models.CharField(blank=True, default="", max_length=128)
     auth_token = models.CharField(default=generate_token, unique=True, max_length=30)
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_app_token_cache(self.auth_token)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_app_token_cache(self.auth_token)
+        return result
+
 
 class AppInstallation(Job):
     app_name = models.CharField(max_length=60)
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Iterable, Optional
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
 
 from ..core.prices import quantize_price
 from ..core.taxes import zero_taxed_money
@@ -7,9 +7,92 @@ from ..plugins.manager import get_plugins_manager
 
 if TYPE_CHECKING:
     from prices import TaxedMoney
+    from ..plugins.manager import PluginsManager
     from .models import Checkout, CheckoutLine
 
 
+class CheckoutPricing:
+    """Calculate the prices of a checkout, memoising them.
+
+    Every price is calculated by the plugins only once, the subtotal reuses the
+    line totals and the total reuses the subtotal and the shipping price. Create
+    it once the checkout, its lines and discounts won't change anymore, e.g. for
+    the time of a single request.
+    """
+
+    def __init__(
+        self,
+        checkout: "Checkout",
+        lines: Iterable["CheckoutLine"],
+        discounts: Optional[Iterable[DiscountInfo]] = None,
+        manager: Optional["PluginsManager"] = None,
+    ):
+        self.checkout = checkout
+        self.lines = list(lines)
+        self.discounts = discounts or []
+        self.manager = manager or get_plugins_manager()
+        self._line_totals: Dict[int, "TaxedMoney"] = {}
+        self._subtotal: Optional["TaxedMoney"] = None
+        self._shipping_price: Optional["TaxedMoney"] = None
+        self._total: Optional["TaxedMoney"] = None
+
+    def _get_line_total(self, line: "CheckoutLine") -> "TaxedMoney":
+        if line.pk not in self._line_totals:
+            self._line_totals[line.pk] = self.manager.calculate_checkout_line_total(
+                line, self.discounts
+            )
+        return self._line_totals[line.pk]
+
+    def _get_subtotal(self) -> "TaxedMoney":
+        if self._subtotal is None:
+            self._subtotal = self.manager.calculate_checkout_subtotal(
+                self.checkout,
+                self.lines,
+                self.discounts,
+                line_totals=[self._get_line_total(line) for line in self.lines],
+            )
+        return self._subtotal
+
+    def _get_shipping_price(self) -> "TaxedMoney":
+        if self._shipping_price is None:
+            self._shipping_price = self.manager.calculate_checkout_shipping(
+                self.checkout, self.lines, self.discounts
+            )
+        return self._shipping_price
+
+    def _get_total(self) -> "TaxedMoney":
+        if self._total is None:
+            self._total = self.manager.calculate_checkout_total(
+                self.checkout,
+                self.lines,
+                self.discounts,
+                subtotal=self._get_subtotal(),
+                shipping_price=self._get_shipping_price(),
+            )
+        return self._total
+
+    def line_total(self, line: "CheckoutLine") -> "TaxedMoney":
+        """Return the total price of the line, taxes included."""
+        return quantize_price(self._get_line_total(line), self.checkout.currency)
+
+    def subtotal(self) -> "TaxedMoney":
+        """Return the total cost of all the checkout lines, taxes included."""
+        return quantize_price(self._get_subtotal(), self.checkout.currency)
+
+    def shipping_price(self) -> "TaxedMoney":
+        """Return the checkout shipping price, taxes included."""
+        return quantize_price(self._get_shipping_price(), self.checkout.currency)
+
+    def total(self) -> "TaxedMoney":
+        """Return the total cost of the checkout, taxes included."""
+        return quantize_price(self._get_total(), self.checkout.currency)
+
+    def total_with_gift_cards(self) -> "TaxedMoney":
+        """Return the total cost of the checkout, minus the gift cards balance."""
+        total = self.total() - self.checkout.get_total_gift_cards_balance()
+        return max(total, zero_taxed_money(total.currency))
+
+
 def checkout_shipping_price(
     *,
     checkout: "Checkout",
@@ -43,14 +126,13 @@ def checkout_subtotal(
 
 
 def calculate_checkout_total_with_gift_cards(
-    checkout: "Checkout", discounts: Optional[Iterable[DiscountInfo]] = None
+    checkout: "Checkout",
+    discounts: Optional[Iterable[DiscountInfo]] = None,
+    pricing: Optional[CheckoutPricing] = None,
 ) -> "TaxedMoney":
-    total = (
-        checkout_total(checkout=checkout, lines=list(checkout), discounts=discounts,)
-        - checkout.get_total_gift_cards_balance()
-    )
-
-    return max(total, zero_taxed_money(total.currency))
+    if pricing is None:
+        pricing = CheckoutPricing(checkout, list(checkout), discounts)
+    return pricing.total_with_gift_cards()
 
 
 def checkout_total(
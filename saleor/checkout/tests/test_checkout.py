@@ -1514,3 +1514,48 @@ def test_create_order_with_variant_tracking_false(
         redirect_url="https://www.example.com",
     )
     assert order_1.checkout_token == checkout.token
+
+
+def test_checkout_pricing_memoises_prices(checkout_with_items, shipping_method):
+    checkout = checkout_with_items
+    checkout.shipping_method = shipping_method
+    checkout.save(update_fields=["shipping_method"])
+    lines = list(checkout)
+    manager = get_plugins_manager()
+    pricing = calculations.CheckoutPricing(checkout, lines, manager=manager)
+
+    with patch.object(
+        manager,
+        "calculate_checkout_line_total",
+        wraps=manager.calculate_checkout_line_total,
+    ) as calculate_line_total, patch.object(
+        manager,
+        "calculate_checkout_shipping",
+        wraps=manager.calculate_checkout_shipping,
+    ) as calculate_shipping:
+        total = pricing.total()
+        subtotal = pricing.subtotal()
+        shipping_price = pricing.shipping_price()
+        line_totals = [pricing.line_total(line) for line in lines]
+
+    assert calculate_line_total.call_count == len(lines)
+    assert calculate_shipping.call_count == 1
+    assert total == calculations.checkout_total(checkout=checkout, lines=lines)
+    assert subtotal == calculations.checkout_subtotal(checkout=checkout, lines=lines)
+    assert subtotal == sum(line_totals, zero_taxed_money(checkout.currency))
+    assert shipping_price == calculations.checkout_shipping_price(
+        checkout=checkout, lines=lines
+    )
+
+
+def test_checkout_pricing_total_with_gift_cards(checkout_with_gift_card):
+    checkout = checkout_with_gift_card
+    pricing = calculations.CheckoutPricing(checkout, list(checkout))
+
+    total = pricing.total_with_gift_cards()
+
+    assert total == calculations.calculate_checkout_total_with_gift_cards(checkout)
+    assert total == max(
+        pricing.total() - checkout.get_total_gift_cards_balance(),
+        zero_taxed_money(checkout.currency),
+    )
@@ -44,7 +44,7 @@ from ..order.models import Order, OrderLine
 from ..plugins.manager import get_plugins_manager
 from ..shipping.models import ShippingMethod
 from ..warehouse.availability import check_stock_quantity
-from ..warehouse.management import allocate_stock
+from ..warehouse.management import allocate_stocks_for_order
 from . import AddressType
 from .models import Checkout, CheckoutLine
 
@@ -443,23 +443,28 @@ def get_valid_shipping_methods_for_checkout(
     lines: Iterable[CheckoutLine],
     discounts: Iterable[DiscountInfo],
     country_code: Optional[str] = None,
+    pricing: Optional[calculations.CheckoutPricing] = None,
 ):
-    manager = get_plugins_manager()
+    if pricing is None:
+        pricing = calculations.CheckoutPricing(checkout, lines, discounts)
     return ShippingMethod.objects.applicable_shipping_methods_for_instance(
-        checkout,
-        price=manager.calculate_checkout_subtotal(checkout, lines, discounts).gross,
-        country_code=country_code,
+        checkout, price=pricing.subtotal().gross, country_code=country_code,
     )
 
 
 def is_valid_shipping_method(
-    checkout: Checkout, lines: Iterable[CheckoutLine], discounts: Iterable[DiscountInfo]
+    checkout: Checkout,
+    lines: Iterable[CheckoutLine],
+    discounts: Iterable[DiscountInfo],
+    pricing: Optional[calculations.CheckoutPricing] = None,
 ):
     """Check if shipping method is valid and remove (if not)."""
     if not checkout.shipping_method:
         return False
 
-    valid_methods = get_valid_shipping_methods_for_checkout(checkout, lines, discounts)
+    valid_methods = get_valid_shipping_methods_for_checkout(
+        checkout, lines, discounts, pricing=pricing
+    )
     if valid_methods is None or checkout.shipping_method not in valid_methods:
         clear_shipping_method(checkout)
         return False
@@ -585,7 +590,11 @@ def validate_gift_cards(checkout: Checkout):
         raise NotApplicable(msg)
 
 
-def create_line_for_order(checkout_line: "CheckoutLine", discounts) -> OrderLine:
+def create_line_for_order(
+    checkout_line: "CheckoutLine",
+    discounts,
+    pricing: Optional[calculations.CheckoutPricing] = None,
+) -> OrderLine:
     """Create a line for the given order.
 
     :raises InsufficientStock: when there is not enough items in stock for this variant.
@@ -609,8 +618,11 @@ def create_line_for_order(checkout_line: "CheckoutLine", discounts) -> OrderLine
     if translated_variant_name == variant_name:
         translated_variant_name = ""
 
-    manager = get_plugins_manager()
-    total_line_price = manager.calculate_checkout_line_total(checkout_line, discounts)
+    if pricing is None:
+        pricing = calculations.CheckoutPricing(
+            checkout_line.checkout, [checkout_line], discounts
+        )
+    total_line_price = pricing.line_total(checkout_line)
     unit_price = quantize_price(
         total_line_price / checkout_line.quantity, total_line_price.currency
     )
@@ -636,7 +648,12 @@ def create_line_for_order(checkout_line: "CheckoutLine", discounts) -> OrderLine
 
 
 def prepare_order_data(
-    *, checkout: Checkout, lines: Iterable[CheckoutLine], tracking_code: str, discounts
+    *,
+    checkout: Checkout,
+    lines: Iterable[CheckoutLine],
+    tracking_code: str,
+    discounts,
+    pricing: Optional[calculations.CheckoutPricing] = None,
 ) -> dict:
     """Run checks and return all the data from a given checkout to create an order.
 
@@ -644,17 +661,16 @@ def prepare_order_data(
     """
     order_data = {}
 
-    manager = get_plugins_manager()
-    taxed_total = calculations.checkout_total(
-        checkout=checkout, lines=lines, discounts=discounts
-    )
+    if pricing is None:
+        pricing = calculations.CheckoutPricing(checkout, lines, discounts)
+    taxed_total = pricing.total()
     cards_total = checkout.get_total_gift_cards_balance()
     taxed_total.gross -= cards_total
     taxed_total.net -= cards_total
 
     taxed_total = max(taxed_total, zero_taxed_money(checkout.currency))
 
-    shipping_total = manager.calculate_checkout_shipping(checkout, lines, discounts)
+    shipping_total = pricing.shipping_price()
     order_data.update(_process_shipping_data_for_order(checkout, shipping_total))
     order_data.update(_process_user_data_for_order(checkout))
     order_data.update(
@@ -666,7 +682,8 @@ def prepare_order_data(
     )
 
     order_data["lines"] = [
-        create_line_for_order(checkout_line=line, discounts=discounts) for line in lines
+        create_line_for_order(checkout_line=line, discounts=discounts, pricing=pricing)
+        for line in lines
     ]
 
     # validate checkout gift cards
@@ -678,12 +695,10 @@ def prepare_order_data(
     # assign gift cards to the order
 
     order_data["total_price_left"] = (
-        manager.calculate_checkout_subtotal(checkout, lines, discounts)
-        + shipping_total
-        - checkout.discount
+        pricing.subtotal() + shipping_total - checkout.discount
     ).gross
 
-    manager.preprocess_order_creation(checkout, discounts)
+    pricing.manager.preprocess_order_creation(checkout, discounts)
     return order_data
 
 
@@ -723,10 +738,7 @@ def create_order(
     order.lines.set(order_lines, bulk=False)
 
     # allocate stocks from the lines
-    for line in order_lines:  # type: OrderLine
-        variant = line.variant
-        if variant and variant.track_inventory:
-            allocate_stock(line, checkout.get_country(), line.quantity)
+    allocate_stocks_for_order(order_lines, checkout.get_country())
 
     # Add gift cards to the order
     for gift_card in checkout.gift_cards.select_for_update():
@@ -754,7 +766,10 @@ def create_order(
 
 
 def is_fully_paid(
-    checkout: Checkout, lines: Iterable[CheckoutLine], discounts: Iterable[DiscountInfo]
+    checkout: Checkout,
+    lines: Iterable[CheckoutLine],
+    discounts: Iterable[DiscountInfo],
+    pricing: Optional[calculations.CheckoutPricing] = None,
 ):
     """Check if provided payment methods cover the checkout's total amount.
 
@@ -762,20 +777,21 @@ def is_fully_paid(
     """
     payments = [payment for payment in checkout.payments.all() if payment.is_active]
     total_paid = sum([p.total for p in payments])
-    checkout_total = (
-        calculations.checkout_total(checkout=checkout, lines=lines, discounts=discounts)
-        - checkout.get_total_gift_cards_balance()
-    )
-    checkout_total = max(
-        checkout_total, zero_taxed_money(checkout_total.currency)
-    ).gross
+    if pricing is None:
+        pricing = calculations.CheckoutPricing(checkout, lines, discounts)
+    checkout_total = pricing.total_with_gift_cards().gross
     return total_paid >= checkout_total.amount
 
 
 def clean_checkout(
-    checkout: Checkout, lines: Iterable[CheckoutLine], discounts: Iterable[DiscountInfo]
+    checkout: Checkout,
+    lines: Iterable[CheckoutLine],
+    discounts: Iterable[DiscountInfo],
+    pricing: Optional[calculations.CheckoutPricing] = None,
 ):
     """Check if checkout can be completed."""
+    if pricing is None:
+        pricing = calculations.CheckoutPricing(checkout, lines, discounts)
     if checkout.is_shipping_required():
         if not checkout.shipping_method:
             raise ValidationError(
@@ -787,7 +803,7 @@ def clean_checkout(
                 "Shipping address is not set",
                 code=CheckoutErrorCode.SHIPPING_ADDRESS_NOT_SET.value,
             )
-        if not is_valid_shipping_method(checkout, lines, discounts):
+        if not is_valid_shipping_method(checkout, lines, discounts, pricing):
             raise ValidationError(
                 "Shipping method is not valid for your shipping address",
                 code=CheckoutErrorCode.INVALID_SHIPPING_METHOD.value,
@@ -799,7 +815,7 @@ def clean_checkout(
             code=CheckoutErrorCode.BILLING_ADDRESS_NOT_SET.value,
         )
 
-    if not is_fully_paid(checkout, lines, discounts):
+    if not is_fully_paid(checkout, lines, discounts, pricing):
         raise ValidationError(
             "Provided payment methods can not cover the checkout's total amount",
             code=CheckoutErrorCode.CHECKOUT_NOT_FULLY_PAID.value,
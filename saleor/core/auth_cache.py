@@ -0,0 +1,120 @@
+import hashlib
+import uuid
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+JWT_USER_CACHE_KEY = "jwt_user:{}"
+JWT_USER_VERSION_CACHE_KEY = "jwt_user_version:{}"
+JWT_PERMISSIONS_VERSION_CACHE_KEY = "jwt_permissions_version"
+APP_TOKEN_CACHE_KEY = "app_token:{}"
+APP_VERSION_CACHE_KEY = "app_version:{}"
+
+
+def _get_versions(version_keys: List[str]) -> Dict[str, str]:
+    versions = cache.get_many(version_keys)
+    missing_versions = {
+        key: uuid.uuid4().hex for key in version_keys if key not in versions
+    }
+    if missing_versions:
+        cache.set_many(missing_versions, timeout=None)
+        versions.update(missing_versions)
+    return versions
+
+
+def _delete_versions(*version_keys: str):
+    cache.delete_many(version_keys)
+    # Delete again once the changes are visible to other connections, in case
+    # a concurrent request cached the old data in the meantime.
+    transaction.on_commit(lambda: cache.delete_many(version_keys))
+
+
+def _get_jwt_user_cache_key(email: str, token_key: str) -> str:
+    key = "%s:%s" % (email, token_key)
+    return JWT_USER_CACHE_KEY.format(hashlib.md5(key.encode("utf-8")).hexdigest())
+
+
+def is_jwt_user_cache_enabled() -> bool:
+    return settings.JWT_USER_CACHE_TIMEOUT > 0
+
+
+def get_cached_jwt_user(email: str, token_key: str) -> Optional[Tuple[Any, Set[str]]]:
+    """Return the user and their permissions cached for the token key.
+
+    Entries are valid until the user or any permission group is changed.
+    """
+    cached = cache.get(_get_jwt_user_cache_key(email, token_key))
+    if cached is None:
+        return None
+    versions, user, permissions = cached
+    if cache.get_many(versions.keys()) != versions:
+        return None
+    return user, permissions
+
+
+def cache_jwt_user(email: str, token_key: str, user, permissions: Set[str]):
+    versions = _get_versions(
+        [JWT_USER_VERSION_CACHE_KEY.format(user.pk), JWT_PERMISSIONS_VERSION_CACHE_KEY]
+    )
+    cache.set(
+        _get_jwt_user_cache_key(email, token_key),
+        (versions, user, permissions),
+        settings.JWT_USER_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_jwt_user_cache(*user_ids: int):
+    """Drop cached users, e.g. after changing their data, groups or permissions."""
+    _delete_versions(*[JWT_USER_VERSION_CACHE_KEY.format(pk) for pk in user_ids])
+
+
+def invalidate_jwt_users_cache():
+    """Drop all cached users, e.g. after changing permission groups."""
+    _delete_versions(JWT_PERMISSIONS_VERSION_CACHE_KEY)
+
+
+def _get_app_token_cache_key(auth_token: str) -> str:
+    # Raw tokens are never used as cache keys
+    token_hash = hashlib.sha256(auth_token.encode("utf-8")).hexdigest()
+    return APP_TOKEN_CACHE_KEY.format(token_hash)
+
+
+def is_app_token_cache_enabled() -> bool:
+    return settings.APP_TOKEN_CACHE_TIMEOUT > 0
+
+
+def get_cached_app(auth_token: str) -> Optional[Tuple[Any, Set[str]]]:
+    """Return the active app and its permissions cached for the auth token.
+
+    Entries are valid until the token or the app is changed.
+    """
+    cached = cache.get(_get_app_token_cache_key(auth_token))
+    if cached is None:
+        return None
+    versions, app, permissions = cached
+    if cache.get_many(versions.keys()) != versions:
+        return None
+    return app, permissions
+
+
+def cache_app(auth_token: str, app, permissions: Set[str]):
+    versions = _get_versions([APP_VERSION_CACHE_KEY.format(app.pk)])
+    cache.set(
+        _get_app_token_cache_key(auth_token),
+        (versions, app, permissions),
+        settings.APP_TOKEN_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_app_token_cache(*auth_tokens: str):
+    """Drop cached apps of the auth tokens, e.g. after deleting the tokens."""
+    keys = [_get_app_token_cache_key(auth_token) for auth_token in auth_tokens]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_app_cache(*app_ids: int):
+    """Drop cached apps of all their tokens, e.g. after changing their permissions."""
+    _delete_versions(*[APP_VERSION_CACHE_KEY.format(pk) for pk in app_ids])
@@ -0,0 +1,52 @@
+import uuid
+from typing import Dict, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+RESPONSE_CACHE_TAG_KEY = "graphql_response_tag:{}"
+# All responses are tagged with it, purging it drops the whole response cache
+ALL_RESPONSES_TAG = "*"
+
+
+def is_response_cache_enabled() -> bool:
+    return settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT > 0
+
+
+def get_response_tag_versions(tags: Iterable[str]) -> Dict[str, str]:
+    """Return the current versions of the given response cache tags.
+
+    Every cached response is tagged with `ALL_RESPONSES_TAG` too.
+    """
+    tag_keys = [
+        RESPONSE_CACHE_TAG_KEY.format(tag) for tag in {*tags, ALL_RESPONSES_TAG}
+    ]
+    tag_versions = cache.get_many(tag_keys)
+    missing_tag_versions = {
+        tag_key: uuid.uuid4().hex for tag_key in tag_keys if tag_key not in tag_versions
+    }
+    if missing_tag_versions:
+        cache.set_many(missing_tag_versions, timeout=None)
+        tag_versions.update(missing_tag_versions)
+    return tag_versions
+
+
+def are_response_tag_versions_current(tag_versions: Dict[str, str]) -> bool:
+    return cache.get_many(tag_versions.keys()) == tag_versions
+
+
+def purge_response_cache(*tags: str):
+    """Purge cached API responses tagged with any of the given database tables.
+
+    Responses are tagged only with the tables read while executing them, data
+    served from other caches or changed outside of requests has to be purged
+    explicitly when it's invalidated.
+    """
+    if not is_response_cache_enabled():
+        return
+    tag_keys = [RESPONSE_CACHE_TAG_KEY.format(tag) for tag in tags]
+    cache.delete_many(tag_keys)
+    # Purge again once the changes are visible to other connections, in case
+    # a concurrent request cached a response with the old data in the meantime.
+    transaction.on_commit(lambda: cache.delete_many(tag_keys))
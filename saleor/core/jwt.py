@@ -1,5 +1,5 @@
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Set
 
 import graphene
 import jwt
@@ -8,7 +8,8 @@ from django.core.handlers.wsgi import WSGIRequest
 
 from ..account.models import User
 from ..app.models import App
-from .permissions import get_permission_names, get_permissions_from_names
+from .auth_cache import cache_jwt_user, get_cached_jwt_user, is_jwt_user_cache_enabled
+from .permissions import get_permission_names, get_permissions_enum_dict
 
 JWT_ALGORITHM = "HS256"
 JWT_AUTH_HEADER = "HTTP_AUTHORIZATION"
@@ -96,10 +97,36 @@ def get_token_from_request(request: WSGIRequest) -> Optional[str]:
     return auth[1]
 
 
+def _get_user_permission_names(user: User) -> Set[str]:
+    permissions = user.effective_permissions.values_list(
+        "content_type__app_label", "codename"
+    ).order_by()
+    return {"%s.%s" % (app_label, codename) for app_label, codename in permissions}
+
+
 def get_user_from_payload(payload: Dict[str, Any]) -> Optional[User]:
-    user = User.objects.filter(email=payload["email"], is_active=True).first()
+    """Return the active user the token was issued for.
+
+    The user and their permissions are cached per token key, so authenticating
+    with a warm cache doesn't hit the database. The permissions are stored on the
+    user the same way the authentication backend caches them.
+    """
+    email = payload["email"]
     user_jwt_token = payload.get("token")
-    if not user_jwt_token or not user:
+    if not user_jwt_token:
+        raise jwt.InvalidTokenError(
+            "Invalid token. Create new one by using tokenCreate mutation."
+        )
+
+    use_cache = is_jwt_user_cache_enabled()
+    cached = get_cached_jwt_user(email, user_jwt_token) if use_cache else None
+    if cached is not None:
+        user, permissions = cached
+        user._effective_permissions_cache = permissions
+        return user
+
+    user = User.objects.filter(email=email, is_active=True).first()
+    if not user:
         raise jwt.InvalidTokenError(
             "Invalid token. Create new one by using tokenCreate mutation."
         )
@@ -107,6 +134,10 @@ def get_user_from_payload(payload: Dict[str, Any]) -> Optional[User]:
         raise jwt.InvalidTokenError(
             "Invalid token. Create new one by using tokenCreate mutation."
         )
+    if use_cache:
+        permissions = _get_user_permission_names(user)
+        cache_jwt_user(email, user_jwt_token, user, permissions)
+        user._effective_permissions_cache = permissions
     return user
 
 
@@ -120,11 +151,18 @@ def get_user_from_access_token(token: str) -> Optional[User]:
     permissions = payload.get(PERMISSIONS_FIELD, None)
     user = get_user_from_payload(payload)
     if user and permissions is not None:
-        token_permissions = get_permissions_from_names(permissions)
-        token_codenames = [perm.codename for perm in token_permissions]
+        permissions_enums = get_permissions_enum_dict()
+        token_codenames = [permissions_enums[name].codename for name in permissions]
+        user_permissions = getattr(user, "_effective_permissions_cache", None)
         user.effective_permissions = user.effective_permissions.filter(
             codename__in=token_codenames
         )
+        if user_permissions is not None:
+            user._effective_permissions_cache = {
+                perm
+                for perm in user_permissions
+                if perm.split(".")[1] in token_codenames
+            }
     return user
 
 
@@ -1,6 +1,6 @@
 import jwt
 import pytest
-from django.contrib.auth.models import Permission
+from django.contrib.auth.models import Group, Permission
 from freezegun import freeze_time
 from jwt import ExpiredSignatureError, InvalidSignatureError, InvalidTokenError
 
@@ -175,3 +175,117 @@ def test_user_has_old_token_type(rf, staff_user, settings):
     backend = JSONWebTokenBackend()
     with pytest.raises(InvalidTokenError):
         backend.authenticate(request)
+
+
+def test_user_authenticated_from_cache(
+    rf, staff_user, permission_manage_orders, django_assert_num_queries
+):
+    staff_user.user_permissions.add(permission_manage_orders)
+    access_token = create_access_token(staff_user)
+    backend = JSONWebTokenBackend()
+    backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+
+    with django_assert_num_queries(0):
+        user = backend.authenticate(
+            rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}")
+        )
+        assert user == staff_user
+        assert user.has_perm("order.manage_orders")
+        assert not user.has_perm("product.manage_products")
+
+
+def test_cached_user_dropped_on_save(rf, staff_user):
+    access_token = create_access_token(staff_user)
+    backend = JSONWebTokenBackend()
+    backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+
+    staff_user.is_active = False
+    staff_user.save(update_fields=["is_active"])
+
+    with pytest.raises(InvalidTokenError):
+        backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+
+
+def test_cached_user_dropped_on_token_key_rotation(rf, staff_user):
+    access_token = create_access_token(staff_user)
+    backend = JSONWebTokenBackend()
+    backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+
+    staff_user.jwt_token_key = "New key"
+    staff_user.save(update_fields=["jwt_token_key"])
+
+    with pytest.raises(InvalidTokenError):
+        backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+
+
+def test_cached_user_dropped_on_permissions_change(
+    rf, staff_user, permission_manage_orders
+):
+    access_token = create_access_token(staff_user)
+    backend = JSONWebTokenBackend()
+    backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+
+    staff_user.user_permissions.add(permission_manage_orders)
+
+    user = backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+    assert user.has_perm("order.manage_orders")
+
+
+def test_cached_user_dropped_on_groups_change(rf, staff_user, permission_manage_orders):
+    group = Group.objects.create(name="Orders")
+    group.permissions.add(permission_manage_orders)
+    access_token = create_access_token(staff_user)
+    backend = JSONWebTokenBackend()
+    backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+
+    group.user_set.add(staff_user)
+
+    user = backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+    assert user.has_perm("order.manage_orders")
+
+
+def test_cached_user_dropped_on_group_permissions_change(
+    rf, staff_user, permission_manage_orders
+):
+    group = Group.objects.create(name="Orders")
+    staff_user.groups.add(group)
+    access_token = create_access_token(staff_user)
+    backend = JSONWebTokenBackend()
+    backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+
+    group.permissions.add(permission_manage_orders)
+
+    user = backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+    assert user.has_perm("order.manage_orders")
+
+
+def test_cached_user_dropped_on_group_delete(rf, staff_user, permission_manage_orders):
+    group = Group.objects.create(name="Orders")
+    group.permissions.add(permission_manage_orders)
+    staff_user.groups.add(group)
+    access_token = create_access_token(staff_user)
+    backend = JSONWebTokenBackend()
+    backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+
+    group.delete()
+
+    user = backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+    assert not user.has_perm("order.manage_orders")
+
+
+def test_cached_user_permissions_limited_by_token(rf, staff_user, app):
+    staff_user.user_permissions.set(
+        Permission.objects.filter(codename__in=["manage_apps", "manage_checkouts"])
+    )
+    app.permissions.set(Permission.objects.filter(codename__in=["manage_checkouts"]))
+    backend = JSONWebTokenBackend()
+    access_token = create_access_token(staff_user)
+    backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+
+    access_token_for_app = create_access_token_for_app(app, staff_user)
+    user = backend.authenticate(
+        rf.request(HTTP_AUTHORIZATION=f"JWT {access_token_for_app}")
+    )
+
+    assert user.has_perm("checkout.manage_checkouts")
+    assert not user.has_perm("app.manage_apps")
@@ -1,9 +1,12 @@
 import pytest
+from django.core.management import call_command
 from django.utils.text import slugify
 
-from ...account.models import Address
+from ...account.models import Address, User
+from ...order.models import Order
 from ...product.models import Product
 from ...search.backends.postgresql import search_storefront
+from ...search.utils import update_product_search_vector
 
 PRODUCTS = [
     ("Arabica Coffee", "The best grains in galactic"),
@@ -53,6 +56,53 @@ def test_storefront_product_fuzzy_name_search(named_products, phrase, product_nu
     assert named_products[product_num] in results
 
 
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_storefront_product_search_by_sku_and_attribute_value(product):
+    variant = product.variants.get()
+    attribute_value = product.attributes.first().values.first()
+    update_product_search_vector(product)
+
+    assert list(execute_search(variant.sku)) == [product]
+    assert list(execute_search(attribute_value.name)) == [product]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_product_save_keeps_updated_search_vector(product):
+    variant = product.variants.get()
+    update_product_search_vector(product)
+
+    product.name = "New name"
+    product.save()
+
+    assert list(execute_search(variant.sku)) == [product]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_update_products_search_vector_command(named_products):
+    Product.objects.update(search_vector=None)
+    assert not execute_search("blue")
+
+    call_command("update_products_search_vector")
+
+    assert list(execute_search("blue")) == [named_products[1]]
+
+
+@pytest.mark.django_db
+def test_update_dashboard_search_document_command(order, customer_user):
+    Order.objects.update(search_document="")
+    User.objects.update(search_document="")
+
+    call_command("update_dashboard_search_document")
+
+    assert Order.objects.filter(search_document__contains="leslie").get() == order
+    assert User.objects.filter(search_document__contains="wrocław").get() == (
+        customer_user
+    )
+
+
 def unpublish_product(product):
     prod_to_unpublish = product
     prod_to_unpublish.is_published = False
@@ -65,6 +65,7 @@ from ...product.thumbnails import (
     create_collection_background_image_thumbnails,
     create_product_thumbnails,
 )
+from ...product.utils.attributes import update_products_attribute_sort_keys
 from ...shipping.models import ShippingMethod, ShippingMethodType, ShippingZone
 from ...warehouse.management import increase_stock
 from ...warehouse.models import Stock, Warehouse
@@ -329,6 +330,7 @@ def create_products_by_schema(placeholder_dir, create_images):
     assign_attributes_to_variants(
         variant_attributes=types["product.assignedvariantattribute"]
     )
+    update_products_attribute_sort_keys(Product.objects.all())
     create_collections(
         data=types["product.collection"], placeholder_dir=placeholder_dir
     )
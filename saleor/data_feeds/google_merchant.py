@@ -1,26 +1,36 @@
 import csv
 import gzip
-from typing import Iterable
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional
 
 from django.conf import settings
 from django.contrib.sites.models import Site
 from django.contrib.syndication.views import add_domain
 from django.core.files.storage import default_storage
+from django.db.models import Q
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.utils.encoding import smart_text
 from django_countries.fields import Country
 
 from ..core.taxes import charge_taxes_on_shipping
-from ..discount import DiscountInfo
+from ..discount import DiscountInfo, DiscountsIndex
 from ..discount.utils import fetch_discounts
 from ..plugins.manager import get_plugins_manager
 from ..product.models import Attribute, AttributeValue, Category, ProductVariant
-from ..warehouse.availability import is_variant_in_stock
+from ..warehouse.availability import get_stock_quantities, is_variant_in_stock
+
+if TYPE_CHECKING:
+    # flake8: noqa
+    from ..plugins.manager import PluginsManager
 
 CATEGORY_SEPARATOR = " > "
 
 FILE_PATH = "google-feed.csv.gz"
 
+# Number of variants for which feed items are prepared at once
+FEED_CHUNK_SIZE = 1000
+
 ATTRIBUTES = [
     "id",
     "title",
@@ -53,6 +63,7 @@ def get_feed_items():
     items = items.prefetch_related(
         "images",
         "product__category",
+        "product__collections",
         "product__images",
         "product__product_type__product_attributes",
         "product__product_type__variant_attributes",
@@ -60,6 +71,33 @@ def get_feed_items():
     return items
 
 
+def get_feed_items_chunks(
+    items, chunk_size: int = FEED_CHUNK_SIZE
+) -> Iterator[List[ProductVariant]]:
+    """Yield given feed items in chunks of consecutive pks."""
+    items = items.order_by("pk")
+    last_pk = 0
+    while True:
+        chunk = list(items.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1].pk
+
+
+def get_items_in_stock(items: Iterable[ProductVariant]) -> Dict[int, bool]:
+    """Return availability of many items in the default country at once."""
+    country = settings.DEFAULT_COUNTRY
+    stock_quantities = get_stock_quantities(
+        (item, country) for item in items if item.track_inventory
+    )
+    return {
+        item.pk: not item.track_inventory
+        or stock_quantities[(item.pk, country)].available_quantity > 0
+        for item in items
+    }
+
+
 def item_id(item: ProductVariant):
     return item.sku
 
@@ -122,6 +160,7 @@ def item_tax(
     item: ProductVariant,
     discounts: Iterable[DiscountInfo],
     is_charge_taxes_on_shipping: bool,
+    plugins: Optional["PluginsManager"] = None,
 ):
     """Return item tax.
 
@@ -129,10 +168,10 @@ def item_tax(
     Read more:
     https://support.google.com/merchants/answer/6324454
     """
+    if not plugins:
+        plugins = get_plugins_manager()
     country = Country(settings.DEFAULT_COUNTRY)
-    tax_rate = get_plugins_manager().get_tax_rate_percentage_value(
-        item.product.product_type, country
-    )
+    tax_rate = plugins.get_tax_rate_percentage_value(item.product.product_type, country)
     if tax_rate:
         tax_ship = "yes" if is_charge_taxes_on_shipping else "no"
         return "%s::%s:%s" % (country.code, tax_rate, tax_ship)
@@ -151,8 +190,10 @@ def item_image_link(item: ProductVariant, current_site):
     return None
 
 
-def item_availability(item: ProductVariant):
-    if is_variant_in_stock(item, settings.DEFAULT_COUNTRY):
+def item_availability(item: ProductVariant, in_stock: Optional[bool] = None):
+    if in_stock is None:
+        in_stock = is_variant_in_stock(item, settings.DEFAULT_COUNTRY)
+    if in_stock:
         return "in stock"
     return "out of stock"
 
@@ -195,6 +236,8 @@ def item_attributes(
     attributes_dict,
     attribute_values_dict,
     is_charge_taxes_on_shipping: bool,
+    plugins: Optional["PluginsManager"] = None,
+    in_stock: Optional[bool] = None,
 ):
     product_data = {
         "id": item_id(item),
@@ -203,7 +246,7 @@ def item_attributes(
         "condition": item_condition(item),
         "mpn": item_mpn(item),
         "item_group_id": item_group_id(item),
-        "availability": item_availability(item),
+        "availability": item_availability(item, in_stock),
         "google_product_category": item_google_product_category(item, category_paths),
     }
 
@@ -217,7 +260,7 @@ def item_attributes(
     if sale_price != price:
         product_data["sale_price"] = sale_price
 
-    tax = item_tax(item, discounts, is_charge_taxes_on_shipping)
+    tax = item_tax(item, discounts, is_charge_taxes_on_shipping, plugins)
     if tax:
         product_data["tax"] = tax
 
@@ -228,39 +271,114 @@ def item_attributes(
     return product_data
 
 
-def write_feed(file_obj):
-    """Write feed contents info provided file object."""
+def get_feed_rows(items) -> Iterator[dict]:
+    """Yield feed rows of given items.
+
+    Items are processed in chunks. Stock of the whole chunk is checked with one
+    query, while discounts, attributes, category paths and the plugins manager
+    are shared by all items.
+    """
     is_charge_taxes_on_shipping = charge_taxes_on_shipping()
-    writer = csv.DictWriter(file_obj, ATTRIBUTES, dialect=csv.excel_tab)
-    writer.writeheader()
     categories = Category.objects.all()
-    discounts = fetch_discounts(timezone.now())
+    discounts = DiscountsIndex(fetch_discounts(timezone.now()))
     attributes_dict = {a.slug: a.pk for a in Attribute.objects.all()}
     attribute_values_dict = {
         smart_text(a.pk): smart_text(a) for a in AttributeValue.objects.all()
     }
-    category_paths = {}
+    category_paths: Dict[int, str] = {}
     current_site = Site.objects.get_current()
-    for item in get_feed_items():
-        item_data = item_attributes(
-            item,
-            categories,
-            category_paths,
-            current_site,
-            discounts,
-            attributes_dict,
-            attribute_values_dict,
-            is_charge_taxes_on_shipping,
-        )
+    plugins = get_plugins_manager()
+    for chunk in get_feed_items_chunks(items):
+        items_in_stock = get_items_in_stock(chunk)
+        for item in chunk:
+            yield item_attributes(
+                item,
+                categories,
+                category_paths,
+                current_site,
+                discounts,
+                attributes_dict,
+                attribute_values_dict,
+                is_charge_taxes_on_shipping,
+                plugins=plugins,
+                in_stock=items_in_stock[item.pk],
+            )
+
+
+def write_feed(file_obj, rows: Optional[Iterable[dict]] = None):
+    """Write feed contents info provided file object.
+
+    Rows of all variants are written unless other rows are given.
+    """
+    if rows is None:
+        rows = get_feed_rows(get_feed_items())
+    writer = csv.DictWriter(file_obj, ATTRIBUTES, dialect=csv.excel_tab)
+    writer.writeheader()
+    for item_data in rows:
         writer.writerow(item_data)
 
 
-def update_feed(file_path=FILE_PATH):
+def read_feed(file_obj) -> Iterator[dict]:
+    """Read rows of a feed written by `write_feed`."""
+    yield from csv.DictReader(file_obj, dialect=csv.excel_tab)
+
+
+def get_incremental_feed_rows(previous_rows: Iterable[dict], since) -> List[dict]:
+    """Return feed rows updated with variants changed since given time.
+
+    Rows of unchanged variants are copied from the previous feed, rows of
+    removed variants are dropped and rows of changed variants are generated.
+    """
+    changed_items = get_feed_items().filter(
+        Q(updated_at__gt=since) | Q(product__updated_at__gt=since)
+    )
+    changed_ids = set(changed_items.values_list("sku", flat=True))
+    current_ids = set(ProductVariant.objects.values_list("sku", flat=True))
+    rows = [
+        row
+        for row in previous_rows
+        if row["id"] in current_ids and row["id"] not in changed_ids
+    ]
+    rows.extend(get_feed_rows(changed_items))
+    return rows
+
+
+def get_generation_time_path(file_path: str) -> str:
+    return f"{file_path}.generated-at"
+
+
+def get_generation_time(file_path: str) -> Optional[datetime]:
+    """Return when the generation of the feed saved in the path has started."""
+    time_path = get_generation_time_path(file_path)
+    if not default_storage.exists(time_path):
+        return None
+    with default_storage.open(time_path, "rb") as time_file:
+        return parse_datetime(time_file.read().decode().strip())
+
+
+def update_feed(file_path=FILE_PATH, incremental=False):
     """Save updated feed into path provided as argument.
 
-    Default path is defined in module as FILE_PATH.
+    Default path is defined in module as FILE_PATH. In incremental mode only rows
+    of variants changed since the generation of the saved feed has started are
+    regenerated. Stock and discount changes don't mark variants as changed, so
+    the full feed should still be generated regularly.
     """
+    generated_at = timezone.now()
+    rows = None
+    since = get_generation_time(file_path) if incremental else None
+    if since and default_storage.exists(file_path):
+        with default_storage.open(file_path, "rb") as input_file:
+            with gzip.open(input_file, "rt") as previous_feed:
+                rows = get_incremental_feed_rows(read_feed(previous_feed), since)
+
+    # Saved again only after the feed, so an interrupted generation leads to
+    # a full one next time
+    time_path = get_generation_time_path(file_path)
+    default_storage.delete(time_path)
     with default_storage.open(file_path, "wb") as output_file:
         output = gzip.open(output_file, "wt")
-        write_feed(output)
+        write_feed(output, rows)
         output.close()
+    with default_storage.open(time_path, "wb") as time_file:
+        time_file.write(generated_at.isoformat().encode())
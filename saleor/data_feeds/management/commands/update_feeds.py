@@ -6,5 +6,13 @@ from ...google_merchant import update_feed
 class Command(BaseCommand):
     help = "Update Google merchant feed"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            dest="incremental",
+            help="Regenerate only variants changed since the last update.",
+        )
+
     def handle(self, *args, **options):
-        update_feed()
+        update_feed(incremental=options["incremental"])
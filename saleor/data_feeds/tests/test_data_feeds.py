@@ -1,18 +1,30 @@
 import csv
+from datetime import timedelta
 from io import StringIO
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
+from django.core.files.storage import default_storage
+from django.utils import timezone
 from django.utils.encoding import smart_text
 from django_prices_vatlayer.models import VAT
 
 from ...core.taxes import charge_taxes_on_shipping
 from ...product.models import AttributeValue, Category
 from ..google_merchant import (
+    ATTRIBUTES,
+    FILE_PATH,
     get_feed_items,
+    get_feed_items_chunks,
+    get_generation_time,
+    get_generation_time_path,
+    get_incremental_feed_rows,
+    get_items_in_stock,
     item_attributes,
     item_availability,
     item_google_product_category,
     item_tax,
+    read_feed,
+    update_feed,
     write_feed,
 )
 
@@ -93,3 +105,101 @@ def test_write_feed(product, monkeypatch):
     ]
     for field in google_required_fields:
         assert field in header
+
+
+def test_get_feed_items_chunks(product_list):
+    variant_ids = sorted(
+        variant.pk for product in product_list for variant in product.variants.all()
+    )
+
+    chunks = get_feed_items_chunks(get_feed_items(), chunk_size=2)
+
+    assert [[item.pk for item in chunk] for chunk in chunks] == [
+        variant_ids[:2],
+        variant_ids[2:],
+    ]
+
+
+def test_get_items_in_stock(variant, variant_without_inventory_tracking):
+    variant.stocks.all().delete()
+    variant_without_inventory_tracking.stocks.all().delete()
+
+    items_in_stock = get_items_in_stock([variant, variant_without_inventory_tracking])
+
+    assert items_in_stock == {
+        variant.pk: False,
+        variant_without_inventory_tracking.pk: True,
+    }
+
+
+def test_write_feed_with_rows(product):
+    rows = [{"id": "123", "title": "Test"}]
+    buffer = StringIO()
+
+    write_feed(buffer, rows)
+    buffer.seek(0)
+
+    assert [dict(row) for row in read_feed(buffer)] == [
+        {**{attribute: "" for attribute in ATTRIBUTES}, "id": "123", "title": "Test"}
+    ]
+
+
+def test_get_incremental_feed_rows_without_changes(product, site_settings):
+    variant = product.variants.get()
+    previous_rows = [
+        {"id": variant.sku, "title": "Previous title"},
+        {"id": "removed-sku", "title": "Removed variant"},
+    ]
+
+    rows = get_incremental_feed_rows(previous_rows, timezone.now())
+
+    assert rows == [{"id": variant.sku, "title": "Previous title"}]
+
+
+def test_get_incremental_feed_rows_with_changed_variant(product, site_settings):
+    variant = product.variants.get()
+    previous_rows = [{"id": variant.sku, "title": "Previous title"}]
+
+    rows = get_incremental_feed_rows(previous_rows, timezone.now() - timedelta(days=1))
+
+    assert len(rows) == 1
+    assert rows[0]["id"] == variant.sku
+    assert rows[0]["title"] == variant.display_product()
+
+
+def test_update_feed_saves_generation_start_time(product, site_settings, media_root):
+    started_at = timezone.now()
+
+    update_feed()
+
+    generated_at = get_generation_time(FILE_PATH)
+    assert started_at <= generated_at <= timezone.now()
+
+
+@patch("saleor.data_feeds.google_merchant.get_incremental_feed_rows")
+def test_update_feed_incremental_since_generation_start_time(
+    get_incremental_feed_rows_mock, product, site_settings, media_root
+):
+    get_incremental_feed_rows_mock.return_value = []
+    update_feed()
+    previous_generated_at = get_generation_time(FILE_PATH)
+
+    update_feed(incremental=True)
+
+    get_incremental_feed_rows_mock.assert_called_once()
+    _, since = get_incremental_feed_rows_mock.call_args[0]
+    assert since == previous_generated_at
+    assert get_generation_time(FILE_PATH) >= previous_generated_at
+
+
+@patch("saleor.data_feeds.google_merchant.get_incremental_feed_rows")
+def test_update_feed_incremental_without_generation_time(
+    get_incremental_feed_rows_mock, product, site_settings, media_root
+):
+    update_feed()
+    default_storage.delete(get_generation_time_path(FILE_PATH))
+
+    update_feed(incremental=True)
+
+    get_incremental_feed_rows_mock.assert_not_called()
+    assert get_generation_time(FILE_PATH)
@@ -1,10 +1,13 @@
+from collections import defaultdict
+from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, List, Set, Union
+from typing import TYPE_CHECKING, DefaultDict, Iterable, List, Set, Union
 
 from django.conf import settings
 
 if TYPE_CHECKING:
     # flake8: noqa
+    from ..product.models import Product
     from .models import Sale, Voucher
 
 
@@ -36,3 +39,43 @@ class DiscountInfo:
     product_ids: Union[List[int], Set[int]]
     category_ids: Union[List[int], Set[int]]
     collection_ids: Union[List[int], Set[int]]
+
+
+class DiscountsIndex(Sequence):
+    """Sequence of discounts indexed by the products, categories and collections.
+
+    Can be used anywhere a list of `DiscountInfo` is expected. Looking up the
+    discounts of a product doesn't require checking every discount.
+    """
+
+    def __init__(self, discounts: Iterable[DiscountInfo]):
+        self._discounts = list(discounts)
+        self._by_product: DefaultDict[int, List[int]] = defaultdict(list)
+        self._by_category: DefaultDict[int, List[int]] = defaultdict(list)
+        self._by_collection: DefaultDict[int, List[int]] = defaultdict(list)
+        for position, discount in enumerate(self._discounts):
+            for product_id in discount.product_ids:
+                self._by_product[product_id].append(position)
+            for category_id in discount.category_ids:
+                self._by_category[category_id].append(position)
+            for collection_id in discount.collection_ids:
+                self._by_collection[collection_id].append(position)
+
+    def __getitem__(self, index):
+        return self._discounts[index]
+
+    def __len__(self):
+        return len(self._discounts)
+
+    def __repr__(self):
+        return "DiscountsIndex(%r)" % (self._discounts,)
+
+    def get_product_discounts(
+        self, product: "Product", collection_ids: Iterable[int]
+    ) -> List[DiscountInfo]:
+        """Return discounts covering the product, in their original order."""
+        positions = set(self._by_product.get(product.id, []))
+        positions.update(self._by_category.get(product.category_id, []))
+        for collection_id in collection_ids:
+            positions.update(self._by_collection.get(collection_id, []))
+        return [self._discounts[position] for position in sorted(positions)]
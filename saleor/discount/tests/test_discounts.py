@@ -1,20 +1,24 @@
 from datetime import timedelta
 from decimal import Decimal
+from unittest.mock import patch
 
 import pytest
 from django.utils import timezone
 from prices import Money
 
 from ...checkout.utils import get_voucher_discount_for_checkout
-from ...product.models import Product, ProductVariant
-from .. import DiscountInfo, DiscountValueType, VoucherType
+from ...product.models import Category, Product, ProductVariant
+from .. import DiscountInfo, DiscountsIndex, DiscountValueType, VoucherType
 from ..models import NotApplicable, Sale, Voucher, VoucherCustomer
 from ..templatetags.voucher import discount_as_negative
 from ..utils import (
     add_voucher_usage_by_customer,
+    calculate_discounted_prices,
     decrease_voucher_usage,
+    fetch_cached_discounts,
     get_product_discount_on_sale,
     increase_voucher_usage,
+    invalidate_discounts_cache,
     remove_voucher_usage_by_customer,
     validate_voucher,
 )
@@ -169,6 +173,49 @@ def test_sale_applies_to_correct_products(product_type, category):
         get_product_discount_on_sale(sec_variant.product, set(), discount)
 
 
+def test_discounts_index(product, category, collection):
+    other_category = Category.objects.create(name="Other", slug="other")
+    discounts = [
+        DiscountInfo(
+            sale=Sale(name=name, value=1),
+            product_ids=product_ids,
+            category_ids=category_ids,
+            collection_ids=collection_ids,
+        )
+        for name, product_ids, category_ids, collection_ids in [
+            ("product", {product.id}, set(), set()),
+            ("other category", set(), {other_category.id}, set()),
+            ("collection", set(), set(), {collection.id}),
+            ("category", {product.id}, {category.id}, set()),
+        ]
+    ]
+    index = DiscountsIndex(discounts)
+
+    assert list(index) == discounts
+    product_discounts = index.get_product_discounts(product, {collection.id})
+    assert [d.sale.name for d in product_discounts] == [
+        "product",
+        "collection",
+        "category",
+    ]
+    product_discounts = index.get_product_discounts(product, set())
+    assert [d.sale.name for d in product_discounts] == ["product", "category"]
+
+
+def test_calculate_discounted_prices(product, discount_info):
+    prices = [Money(10, "USD"), Money(3, "USD")]
+    expected_prices = [Money(5, "USD"), Money(0, "USD")]
+
+    for discounts in [[discount_info], DiscountsIndex([discount_info])]:
+        discounted_prices = calculate_discounted_prices(
+            product=product,
+            prices=prices,
+            collections=product.collections.all(),
+            discounts=discounts,
+        )
+        assert discounted_prices == expected_prices
+
+
 def test_increase_voucher_usage():
     voucher = Voucher.objects.create(
         code="unique",
@@ -330,6 +377,67 @@ def test_sale_active(current_date, start_date, end_date, is_active):
     assert is_active == sale_is_active
 
 
+def test_fetch_cached_discounts(sale, django_assert_num_queries):
+    now = timezone.now()
+    discounts = fetch_cached_discounts(now)
+
+    with django_assert_num_queries(0):
+        cached_discounts = fetch_cached_discounts(now + timedelta(hours=1))
+
+    assert [discount.sale for discount in discounts] == [sale]
+    assert list(cached_discounts) == list(discounts)
+
+
+def test_fetch_cached_discounts_after_sale_end(sale):
+    now = timezone.now()
+    sale.end_date = now + timedelta(days=1)
+    sale.save(update_fields=["end_date"])
+
+    assert fetch_cached_discounts(now)
+    assert not fetch_cached_discounts(now + timedelta(days=2))
+
+
+def test_fetch_cached_discounts_before_sale_start(sale):
+    now = timezone.now()
+    sale.start_date = now + timedelta(days=1)
+    sale.save(update_fields=["start_date"])
+
+    assert not fetch_cached_discounts(now)
+    assert fetch_cached_discounts(now + timedelta(days=2))
+
+
+def test_fetch_cached_discounts_timeout(sale, settings):
+    settings.DISCOUNTS_CACHE_TIMEOUT = 60
+    now = timezone.now()
+
+    with patch("saleor.discount.utils.cache.set") as mocked_cache_set:
+        fetch_cached_discounts(now)
+
+    assert mocked_cache_set.call_args[0][2] == 60
+
+
+def test_fetch_cached_discounts_disabled(sale, settings):
+    settings.DISCOUNTS_CACHE_TIMEOUT = 0
+    now = timezone.now()
+    fetch_cached_discounts(now)
+
+    sale.delete()
+
+    assert not fetch_cached_discounts(now)
+
+
+def test_invalidate_discounts_cache(sale, product):
+    now = timezone.now()
+    discounts = fetch_cached_discounts(now)
+    assert discounts[0].product_ids == {product.pk}
+
+    sale.products.remove(product)
+    invalidate_discounts_cache()
+
+    discounts = fetch_cached_discounts(now)
+    assert discounts[0].product_ids == set()
+
+
 def test_discount_as_negative():
     discount = Money(10, "USD")
     result = discount_as_negative(discount)
@@ -1,14 +1,18 @@
 import datetime
 from collections import defaultdict
-from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
 
-from django.db.models import F
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Max, Min, Q
 from django.utils import timezone
 from prices import Money
 
 from ..checkout import calculations
+from ..core.cache import purge_response_cache
 from ..core.taxes import zero_money
-from . import DiscountInfo
+from . import DiscountInfo, DiscountsIndex
 from .models import NotApplicable, Sale, VoucherCustomer
 
 if TYPE_CHECKING:
@@ -70,6 +74,8 @@ def get_product_discounts(
 ) -> Money:
     """Return discount values for all discounts applicable to a product."""
     product_collections = set(pc.id for pc in collections)
+    if isinstance(discounts, DiscountsIndex):
+        discounts = discounts.get_product_discounts(product, product_collections)
     for discount in discounts or []:
         try:
             yield get_product_discount_on_sale(product, product_collections, discount)
@@ -85,6 +91,24 @@ def calculate_discounted_price(
     discounts: Optional[Iterable[DiscountInfo]]
 ) -> Money:
     """Return minimum product's price of all prices with discounts applied."""
+    return calculate_discounted_prices(
+        product=product, prices=[price], collections=collections, discounts=discounts
+    )[0]
+
+
+def calculate_discounted_prices(
+    *,
+    product: "Product",
+    prices: Iterable[Money],
+    collections: Iterable["Collection"],
+    discounts: Optional[Iterable[DiscountInfo]]
+) -> List[Money]:
+    """Return minimum prices of all prices with discounts applied.
+
+    Discounts applicable to the product are looked up once for all prices,
+    e.g. prices of all the product's variants.
+    """
+    prices = list(prices)
     if discounts:
         discount_prices = list(
             get_product_discounts(
@@ -92,8 +116,10 @@ def calculate_discounted_price(
             )
         )
         if discount_prices:
-            price = min(discount(price) for discount in discount_prices)
-    return price
+            prices = [
+                min(discount(price) for discount in discount_prices) for price in prices
+            ]
+    return prices
 
 
 def get_discounted_lines(lines, voucher):
@@ -220,3 +246,64 @@ def fetch_discounts(date: datetime.date) -> List[DiscountInfo]:
 
 def fetch_active_discounts() -> List[DiscountInfo]:
     return fetch_discounts(timezone.now())
+
+
+DISCOUNTS_CACHE_KEY = "active_discounts"
+# Tables of the objects which prices are calculated with the active discounts
+DISCOUNTED_TABLES = ("product_product", "product_productvariant", "checkout_checkout")
+
+
+def _get_discounts_validity(
+    date: datetime.datetime,
+) -> Tuple[Optional[datetime.datetime], Optional[datetime.datetime]]:
+    """Return the time range around `date` in which the set of active sales is fixed.
+
+    The range starts at the latest sale start or end before `date` and lasts
+    until the nearest sale start or end after it.
+    """
+    boundaries = Sale.objects.aggregate(
+        last_start=Max("start_date", filter=Q(start_date__lte=date)),
+        last_end=Max("end_date", filter=Q(end_date__lt=date)),
+        next_start=Min("start_date", filter=Q(start_date__gt=date)),
+        next_end=Min("end_date", filter=Q(end_date__gte=date)),
+    )
+    past = [boundaries["last_start"], boundaries["last_end"]]
+    future = [boundaries["next_start"], boundaries["next_end"]]
+    valid_since = max([d for d in past if d is not None], default=None)
+    valid_until = min([d for d in future if d is not None], default=None)
+    return valid_since, valid_until
+
+
+def fetch_cached_discounts(date: datetime.datetime) -> DiscountsIndex:
+    """Return discounts active at given date, reusing them between requests.
+
+    The discounts are indexed and stored in the cache until the nearest start or
+    end of any sale, for at most `DISCOUNTS_CACHE_TIMEOUT` seconds. Changes to
+    sales or their catalogues have to be followed by `invalidate_discounts_cache`.
+    """
+    cached = cache.get(DISCOUNTS_CACHE_KEY)
+    if cached is not None:
+        valid_since, valid_until, discounts = cached
+        if (valid_since is None or valid_since <= date) and (
+            valid_until is None or date < valid_until
+        ):
+            return discounts
+
+    valid_since, valid_until = _get_discounts_validity(date)
+    discounts = DiscountsIndex(fetch_discounts(date))
+    timeout = settings.DISCOUNTS_CACHE_TIMEOUT
+    if valid_until is not None:
+        timeout = min(timeout, (valid_until - timezone.now()).total_seconds())
+    if timeout > 0:
+        cache.set(DISCOUNTS_CACHE_KEY, (valid_since, valid_until, discounts), timeout)
+    return discounts
+
+
+def invalidate_discounts_cache():
+    cache.delete(DISCOUNTS_CACHE_KEY)
+    # Clear the cache again once the changes are visible to other connections,
+    # in case a concurrent request stored the old discounts in the meantime.
+    transaction.on_commit(lambda: cache.delete(DISCOUNTS_CACHE_KEY))
+    # Responses don't depend on the discount tables when the discounts were
+    # served from the cache, purge the ones containing the discounted prices.
+    purge_response_cache(*DISCOUNTED_TABLES)
@@ -5,6 +5,7 @@ from django.core.exceptions import ValidationError
 
 from ...account import models
 from ...account.error_codes import AccountErrorCode
+from ...core.auth_cache import invalidate_jwt_user_cache
 from ...core.permissions import AccountPermissions
 from ..core.mutations import BaseBulkMutation, ModelBulkDeleteMutation
 from ..core.types.common import AccountError, StaffError
@@ -21,6 +22,12 @@ class UserBulkDelete(ModelBulkDeleteMutation):
     class Meta:
         abstract = True
 
+    @classmethod
+    def bulk_action(cls, queryset):
+        user_ids = list(queryset.values_list("pk", flat=True))
+        super().bulk_action(queryset)
+        invalidate_jwt_user_cache(*user_ids)
+
 
 class CustomerBulkDelete(CustomerDeleteMixin, UserBulkDelete):
     class Meta:
@@ -109,4 +116,6 @@ class UserBulkSetActive(BaseBulkMutation):
 
     @classmethod
     def bulk_action(cls, queryset, is_active):
+        user_ids = list(queryset.values_list("pk", flat=True))
         queryset.update(is_active=is_active)
+        invalidate_jwt_user_cache(*user_ids)
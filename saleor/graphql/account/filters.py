@@ -4,7 +4,11 @@ from django.db.models import Count, Sum
 from ...account.models import User
 from ..core.filters import EnumFilter, ObjectTypeFilter
 from ..core.types.common import DateRangeInput, IntRangeInput, PriceRangeInput
-from ..utils.filters import filter_by_query_param, filter_range_field
+from ..utils.filters import (
+    filter_by_query_param,
+    filter_by_search_document,
+    filter_range_field,
+)
 from .enums import StaffMemberStatus
 
 
@@ -35,18 +39,7 @@ def filter_status(qs, _, value):
 
 
 def filter_staff_search(qs, _, value):
-    search_fields = (
-        "email",
-        "first_name",
-        "last_name",
-        "default_shipping_address__first_name",
-        "default_shipping_address__last_name",
-        "default_shipping_address__city",
-        "default_shipping_address__country",
-    )
-    if value:
-        qs = filter_by_query_param(qs, value, search_fields)
-    return qs
+    return filter_by_search_document(qs, value)
 
 
 def filter_search(qs, _, value):
@@ -267,6 +267,10 @@ class BaseAddressUpdate(ModelMutation, I18nMixin):
         cls.clean_instance(info, address)
         cls.save(info, address, cleaned_input)
         cls._save_m2m(info, address, cleaned_input)
+        if user and user.default_shipping_address_id == address.pk:
+            # The default shipping address is a part of the user's search document
+            user.default_shipping_address = address
+            user.save(update_fields=["search_document"])
         address = info.context.plugins.change_user_address(address, None, user)
         success_response = cls.success_response(address)
         success_response.user = user
@@ -11,7 +11,7 @@ from ...core.permissions import AccountPermissions
 from ...payment import gateway
 from ...payment.utils import fetch_customer_id
 from ..utils import format_permissions_for_display, get_user_or_app_from_context
-from ..utils.filters import filter_by_query_param
+from ..utils.filters import filter_by_search_document
 from .types import AddressValidationData, ChoiceValue
 from .utils import (
     get_allowed_fields_camel_case,
@@ -19,23 +19,10 @@ from .utils import (
     get_user_permissions,
 )
 
-USER_SEARCH_FIELDS = (
-    "email",
-    "first_name",
-    "last_name",
-    "default_shipping_address__first_name",
-    "default_shipping_address__last_name",
-    "default_shipping_address__city",
-    "default_shipping_address__country",
-)
-
 
 def resolve_customers(info, query, **_kwargs):
     qs = models.User.objects.customers()
-    qs = filter_by_query_param(
-        queryset=qs, query=query, search_fields=USER_SEARCH_FIELDS
-    )
-    return qs.distinct()
+    return filter_by_search_document(qs, query)
 
 
 def resolve_permission_groups(info, **_kwargs):
@@ -44,10 +31,7 @@ def resolve_permission_groups(info, **_kwargs):
 
 def resolve_staff_users(info, query, **_kwargs):
     qs = models.User.objects.staff()
-    qs = filter_by_query_param(
-        queryset=qs, query=query, search_fields=USER_SEARCH_FIELDS
-    )
-    return qs.distinct()
+    return filter_by_search_document(qs, query)
 
 
 def resolve_user(info, id):
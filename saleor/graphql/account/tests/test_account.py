@@ -23,6 +23,7 @@ from ....core.jwt import create_token
 from ....core.permissions import AccountPermissions, OrderPermissions
 from ....order.models import FulfillmentStatus, Order
 from ....product.tests.utils import create_image
+from ....search.utils import update_users_search_document
 from ...core.utils import str_to_enum
 from ...tests.utils import (
     assert_no_permission,
@@ -2668,6 +2669,25 @@ def test_customer_update_own_address(
     assert address_obj.city == address_data["city"].upper()
 
 
+def test_customer_update_own_default_address_updates_search_document(
+    user_api_client, customer_user, graphql_address_data
+):
+    address_obj = customer_user.default_shipping_address
+    address_data = graphql_address_data
+    address_data["city"] = "Poznań"
+
+    variables = {
+        "addressId": graphene.Node.to_global_id("Address", address_obj.id),
+        "address": address_data,
+    }
+    response = user_api_client.post_graphql(ACCOUNT_ADDRESS_UPDATE_MUTATION, variables)
+    get_graphql_content(response)
+
+    customer_user.refresh_from_db()
+    assert "poznań" in customer_user.search_document
+    assert "wrocław" not in customer_user.search_document
+
+
 def test_customer_update_own_address_not_updated_when_validation_fails(
     user_api_client, customer_user, graphql_address_data
 ):
@@ -3671,6 +3691,7 @@ def test_query_customer_members_with_filter_search(
             ),
         ]
     )
+    update_users_search_document(User.objects.all())
 
     variables = {"filter": customer_filter}
     response = staff_api_client.post_graphql(
@@ -3776,6 +3797,7 @@ def test_query_staff_members_with_filter_search(
             ),
         ]
     )
+    update_users_search_document(User.objects.all())
 
     variables = {"filter": staff_member_filter}
     response = staff_api_client.post_graphql(
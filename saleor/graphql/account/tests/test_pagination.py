@@ -3,6 +3,7 @@ from django.contrib.auth import models as auth_models
 
 from ....account.models import User
 from ....order.models import Order
+from ....search.utils import update_users_search_document
 from ...tests.utils import get_graphql_content
 
 
@@ -50,6 +51,7 @@ def customers_for_search(db, address):
             ),
         ]
     )
+    update_users_search_document(User.objects.all())
     return accounts
 
 
@@ -121,6 +123,7 @@ def staff_for_search(db, address):
             ),
         ]
     )
+    update_users_search_document(User.objects.all())
     return accounts
 
 
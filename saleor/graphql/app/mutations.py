@@ -14,6 +14,7 @@ from ...core.permissions import (
     get_permissions,
     get_permissions_enum_list,
 )
+from ...webhook.utils import invalidate_webhook_subscriptions_cache
 from ..account.utils import can_manage_app
 from ..core.enums import PermissionEnum
 from ..core.mutations import BaseMutation, ModelDeleteMutation, ModelMutation
@@ -219,6 +220,10 @@ class AppUpdate(ModelMutation):
             ensure_can_manage_permissions(requestor, permissions)
         return cleaned_input
 
+    @classmethod
+    def post_save_action(cls, info, instance, cleaned_input):
+        invalidate_webhook_subscriptions_cache()
+
 
 class AppDelete(ModelDeleteMutation):
     class Arguments:
@@ -245,6 +250,12 @@ class AppDelete(ModelDeleteMutation):
             code = AppErrorCode.OUT_OF_SCOPE_APP.value
             raise ValidationError({"id": ValidationError(msg, code=code)})
 
+    @classmethod
+    def perform_mutation(cls, _root, info, **data):
+        response = super().perform_mutation(_root, info, **data)
+        invalidate_webhook_subscriptions_cache()
+        return response
+
 
 class AppActivate(ModelMutation):
     class Arguments:
@@ -274,6 +285,7 @@ class AppActivate(ModelMutation):
         cls.clean_instance(info, app)
         app.is_active = True
         cls.save(info, app, cleaned_input=None)
+        invalidate_webhook_subscriptions_cache()
         return cls.success_response(app)
 
 
@@ -302,6 +314,7 @@ class AppDeactivate(ModelMutation):
         cls.clean_instance(info, app)
         app.is_active = False
         cls.save(info, app, cleaned_input=None)
+        invalidate_webhook_subscriptions_cache()
         return cls.success_response(app)
 
 
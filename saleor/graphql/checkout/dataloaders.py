@@ -1,7 +1,19 @@
 from collections import defaultdict
 
-from ...checkout.models import CheckoutLine
+from promise import Promise
+
+from ...checkout.calculations import CheckoutPricing
+from ...checkout.models import Checkout, CheckoutLine
 from ..core.dataloaders import DataLoader
+from ..discount.dataloaders import DiscountsByDateTimeLoader
+
+
+class CheckoutByTokenLoader(DataLoader):
+    context_key = "checkout_by_token"
+
+    def batch_load(self, keys):
+        checkouts = Checkout.objects.in_bulk(keys)
+        return [checkouts.get(token) for token in keys]
 
 
 class CheckoutLinesByCheckoutTokenLoader(DataLoader):
@@ -13,3 +25,26 @@ class CheckoutLinesByCheckoutTokenLoader(DataLoader):
         for variant in lines.iterator():
             line_map[variant.checkout_id].append(variant)
         return [line_map.get(checkout_id, []) for checkout_id in keys]
+
+
+class CheckoutPricingByCheckoutTokenLoader(DataLoader):
+    """Load pricing memoising the prices of checkouts for the whole request."""
+
+    context_key = "checkout_pricing_by_checkout"
+
+    def batch_load(self, keys):
+        def with_checkouts_data(data):
+            checkouts, lines, discounts = data
+            return [
+                CheckoutPricing(
+                    checkout, checkout_lines, discounts, manager=self.context.plugins
+                )
+                for checkout, checkout_lines in zip(checkouts, lines)
+            ]
+
+        checkouts = CheckoutByTokenLoader(self.context).load_many(keys)
+        lines = CheckoutLinesByCheckoutTokenLoader(self.context).load_many(keys)
+        discounts = DiscountsByDateTimeLoader(self.context).load(
+            self.context.request_time
+        )
+        return Promise.all([checkouts, lines, discounts]).then(with_checkouts_data)
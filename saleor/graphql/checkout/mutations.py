@@ -8,7 +8,10 @@ from django.db.models import Prefetch
 
 from ...account.error_codes import AccountErrorCode
 from ...checkout import models
-from ...checkout.calculations import calculate_checkout_total_with_gift_cards
+from ...checkout.calculations import (
+    CheckoutPricing,
+    calculate_checkout_total_with_gift_cards,
+)
 from ...checkout.error_codes import CheckoutErrorCode
 from ...checkout.utils import (
     abort_order_data,
@@ -34,7 +37,7 @@ from ...payment import PaymentError, gateway, models as payment_models
 from ...payment.interface import AddressData
 from ...payment.utils import store_customer_id
 from ...product import models as product_models
-from ...warehouse.availability import check_stock_quantity, get_available_quantity
+from ...warehouse.availability import check_stock_quantity_bulk
 from ..account.i18n import I18nMixin
 from ..account.types import AddressInput
 from ..core.mutations import BaseMutation, ModelMutation
@@ -102,7 +105,7 @@ def update_checkout_shipping_method_if_invalid(
 
 def check_lines_quantity(variants, quantities, country):
     """Check if stock is sufficient for each line in the list of dicts."""
-    for variant, quantity in zip(variants, quantities):
+    for quantity in quantities:
         if quantity < 0:
             raise ValidationError(
                 {
@@ -122,19 +125,16 @@ def check_lines_quantity(variants, quantities, country):
                     )
                 }
             )
-        try:
-            check_stock_quantity(variant, country, quantity)
-        except InsufficientStock as e:
-            available_quantity = get_available_quantity(e.item, country)
-            message = (
-                "Could not add item "
-                + "%(item_name)s. Only %(remaining)d remaining in stock."
-                % {
-                    "remaining": available_quantity,
-                    "item_name": e.item.display_product(),
-                }
-            )
-            raise ValidationError({"quantity": ValidationError(message, code=e.code)})
+    try:
+        check_stock_quantity_bulk(variants, country, quantities)
+    except InsufficientStock as e:
+        available_quantity = e.context["available_quantity"]
+        message = (
+            "Could not add item "
+            + "%(item_name)s. Only %(remaining)d remaining in stock."
+            % {"remaining": available_quantity, "item_name": e.item.display_product()}
+        )
+        raise ValidationError({"quantity": ValidationError(message, code=e.code)})
 
 
 class CheckoutLineInput(graphene.InputObjectType):
@@ -775,11 +775,11 @@ class CheckoutComplete(BaseMutation):
         error_type_field = "checkout_errors"
 
     @classmethod
-    def validate_payment_amount(cls, discounts, payment, checkout):
+    def validate_payment_amount(cls, discounts, payment, checkout, pricing=None):
         if (
             payment.total
             != calculate_checkout_total_with_gift_cards(
-                checkout, discounts
+                checkout, discounts, pricing
             ).gross.amount
         ):
             gateway.payment_refund_or_void(payment)
@@ -811,12 +811,22 @@ class CheckoutComplete(BaseMutation):
         discounts = info.context.discounts
         user = info.context.user
 
-        clean_checkout_shipping(checkout, lines, discounts, CheckoutErrorCode)
-        clean_checkout_payment(checkout, lines, discounts, CheckoutErrorCode)
+        # Prices are calculated once and shared by all the validation steps and
+        # the order creation
+        pricing = CheckoutPricing(
+            checkout, lines, discounts, manager=info.context.plugins
+        )
+
+        clean_checkout_shipping(
+            checkout, lines, discounts, CheckoutErrorCode, pricing=pricing
+        )
+        clean_checkout_payment(
+            checkout, lines, discounts, CheckoutErrorCode, pricing=pricing
+        )
 
         payment = checkout.get_last_active_payment()
 
-        cls.validate_payment_amount(discounts, payment, checkout)
+        cls.validate_payment_amount(discounts, payment, checkout, pricing)
 
         redirect_url = data.get("redirect_url", "")
         if redirect_url:
@@ -834,6 +844,7 @@ class CheckoutComplete(BaseMutation):
                     lines=lines,
                     tracking_code=analytics.get_client_id(info.context),
                     discounts=discounts,
+                    pricing=pricing,
                 )
             except InsufficientStock as e:
                 gateway.payment_refund_or_void(payment)
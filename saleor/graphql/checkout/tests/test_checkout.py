@@ -24,6 +24,7 @@ from ....plugins.manager import PluginsManager
 from ....plugins.tests.sample_plugins import ActiveDummyPaymentGateway
 from ....warehouse.models import Stock
 from ....warehouse.tests.utils import get_available_quantity_for_stock
+from ....webhook.event_types import WebhookEventType
 from ...tests.utils import assert_no_permission, get_graphql_content
 from ..mutations import (
     clean_shipping_method,
@@ -112,12 +113,18 @@ MUTATION_CHECKOUT_CREATE = """
 """
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_checkout_event.delay")
 def test_checkout_create_triggers_webhooks(
-    mocked_webhook_trigger, user_api_client, stock, graphql_address_data, settings
+    mocked_webhook_trigger,
+    user_api_client,
+    stock,
+    graphql_address_data,
+    settings,
+    webhook,
 ):
     """Create checkout object using GraphQL API."""
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
+    webhook.events.create(event_type=WebhookEventType.CHECKOUT_CREATED)
     variant = stock.product_variant
     variant_id = graphene.Node.to_global_id("ProductVariant", variant.id)
     test_email = "test@example.com"
@@ -2921,3 +2928,52 @@ def test_clean_checkout_no_payment(checkout_with_item, shipping_method, address)
 
     msg = "Provided payment methods can not cover the checkout's total amount"
     assert e.value.error_list[0].message == msg
+
+
+QUERY_CHECKOUT_PRICES = """
+    query getCheckout($token: UUID!) {
+        checkout(token: $token) {
+            totalPrice {
+                gross {
+                    amount
+                }
+            }
+            subtotalPrice {
+                gross {
+                    amount
+                }
+            }
+            lines {
+                totalPrice {
+                    gross {
+                        amount
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+@patch.object(
+    PluginsManager,
+    "calculate_checkout_line_total",
+    autospec=True,
+    side_effect=PluginsManager.calculate_checkout_line_total,
+)
+def test_checkout_prices_calculate_line_totals_once(
+    mocked_calculate_line_total, api_client, checkout_with_items
+):
+    lines = list(checkout_with_items)
+    variables = {"token": str(checkout_with_items.token)}
+
+    response = api_client.post_graphql(QUERY_CHECKOUT_PRICES, variables)
+
+    content = get_graphql_content(response)
+    assert mocked_calculate_line_total.call_count == len(lines)
+    data = content["data"]["checkout"]
+    subtotal = calculations.checkout_subtotal(checkout=checkout_with_items, lines=lines)
+    assert data["subtotalPrice"]["gross"]["amount"] == subtotal.gross.amount
+    assert sum(
+        line["totalPrice"]["gross"]["amount"] for line in data["lines"]
+    ) == float(subtotal.gross.amount)
@@ -1,24 +1,28 @@
 import graphene
-from promise import Promise
 
-from ...checkout import calculations, models
+from ...checkout import models
 from ...checkout.utils import get_valid_shipping_methods_for_checkout
 from ...core.exceptions import PermissionDenied
 from ...core.permissions import AccountPermissions, CheckoutPermissions
-from ...core.taxes import display_gross_prices, zero_taxed_money
+from ...core.taxes import display_gross_prices
 from ...plugins.manager import get_plugins_manager
 from ..account.utils import requestor_has_access
 from ..core.connection import CountableDjangoObjectType
 from ..core.scalars import UUID
 from ..core.types.money import TaxedMoney
 from ..decorators import permission_required
-from ..discount.dataloaders import DiscountsByDateTimeLoader
 from ..giftcard.types import GiftCard
 from ..meta.deprecated.resolvers import resolve_meta, resolve_private_meta
 from ..meta.types import ObjectWithMetadata
 from ..shipping.types import ShippingMethod
 from ..utils import get_user_or_app_from_context
-from .dataloaders import CheckoutLinesByCheckoutTokenLoader
+from .dataloaders import CheckoutByTokenLoader, CheckoutPricingByCheckoutTokenLoader
+
+
+def load_checkout_pricing(info, checkout: models.Checkout):
+    """Load the pricing shared by all price fields of the checkout in the request."""
+    CheckoutByTokenLoader(info.context).prime(checkout.token, checkout)
+    return CheckoutPricingByCheckoutTokenLoader(info.context).load(checkout.token)
 
 
 class GatewayConfigLine(graphene.ObjectType):
@@ -68,15 +72,10 @@ class CheckoutLine(CountableDjangoObjectType):
 
     @staticmethod
     def resolve_total_price(self, info):
-        def calculate_total_price(discounts):
-            return info.context.plugins.calculate_checkout_line_total(
-                checkout_line=self, discounts=discounts
-            )
-
         return (
-            DiscountsByDateTimeLoader(info.context)
-            .load(info.context.request_time)
-            .then(calculate_total_price)
+            CheckoutPricingByCheckoutTokenLoader(info.context)
+            .load(self.checkout_id)
+            .then(lambda pricing: pricing.line_total(self))
         )
 
     @staticmethod
@@ -161,62 +160,32 @@ class Checkout(CountableDjangoObjectType):
 
     @staticmethod
     def resolve_total_price(root: models.Checkout, info):
-        def calculate_total_price(data):
-            lines, discounts = data
-            taxed_total = (
-                calculations.checkout_total(
-                    checkout=root, lines=lines, discounts=discounts
-                )
-                - root.get_total_gift_cards_balance()
-            )
-            return max(taxed_total, zero_taxed_money())
-
-        lines = CheckoutLinesByCheckoutTokenLoader(info.context).load(root.token)
-        discounts = DiscountsByDateTimeLoader(info.context).load(
-            info.context.request_time
+        return load_checkout_pricing(info, root).then(
+            lambda pricing: pricing.total_with_gift_cards()
         )
 
-        return Promise.all([lines, discounts]).then(calculate_total_price)
-
     @staticmethod
     def resolve_subtotal_price(root: models.Checkout, info):
-        def calculate_subtotal_price(data):
-            lines, discounts = data
-            return calculations.checkout_subtotal(
-                checkout=root, lines=lines, discounts=discounts
-            )
-
-        lines = CheckoutLinesByCheckoutTokenLoader(info.context).load(root.token)
-        discounts = DiscountsByDateTimeLoader(info.context).load(
-            info.context.request_time
+        return load_checkout_pricing(info, root).then(
+            lambda pricing: pricing.subtotal()
         )
 
-        return Promise.all([lines, discounts]).then(calculate_subtotal_price)
-
     @staticmethod
     def resolve_shipping_price(root: models.Checkout, info):
-        def calculate_shipping_price(data):
-            lines, discounts = data
-            return calculations.checkout_shipping_price(
-                checkout=root, lines=lines, discounts=discounts
-            )
-
-        lines = CheckoutLinesByCheckoutTokenLoader(info.context).load(root.token)
-        discounts = DiscountsByDateTimeLoader(info.context).load(
-            info.context.request_time
+        return load_checkout_pricing(info, root).then(
+            lambda pricing: pricing.shipping_price()
         )
 
-        return Promise.all([lines, discounts]).then(calculate_shipping_price)
-
     @staticmethod
     def resolve_lines(root: models.Checkout, *_args):
         return root.lines.prefetch_related("variant")
 
     @staticmethod
     def resolve_available_shipping_methods(root: models.Checkout, info):
-        def calculate_available_shipping_methods(data):
-            lines, discounts = data
-            available = get_valid_shipping_methods_for_checkout(root, lines, discounts)
+        def calculate_available_shipping_methods(pricing):
+            available = get_valid_shipping_methods_for_checkout(
+                root, pricing.lines, pricing.discounts, pricing=pricing
+            )
             if available is None:
                 return []
 
@@ -234,12 +203,7 @@ class Checkout(CountableDjangoObjectType):
                     shipping_method.price = taxed_price.net
             return available
 
-        lines = CheckoutLinesByCheckoutTokenLoader(info.context).load(root.token)
-        discounts = DiscountsByDateTimeLoader(info.context).load(
-            info.context.request_time
-        )
-
-        return Promise.all([lines, discounts]).then(
+        return load_checkout_pricing(info, root).then(
             calculate_available_shipping_methods
         )
 
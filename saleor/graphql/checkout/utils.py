@@ -1,7 +1,8 @@
-from typing import Iterable, Union
+from typing import Iterable, Optional, Union
 
 from django.core.exceptions import ValidationError
 
+from ...checkout.calculations import CheckoutPricing
 from ...checkout.error_codes import CheckoutErrorCode
 from ...checkout.models import Checkout, CheckoutLine
 from ...checkout.utils import is_fully_paid, is_valid_shipping_method
@@ -14,6 +15,7 @@ def clean_checkout_shipping(
     lines: Iterable[CheckoutLine],
     discounts: Iterable[DiscountInfo],
     error_code: Union[CheckoutErrorCode, PaymentErrorCode],
+    pricing: Optional[CheckoutPricing] = None,
 ):
     if checkout.is_shipping_required():
         if not checkout.shipping_method:
@@ -34,7 +36,7 @@ def clean_checkout_shipping(
                     )
                 }
             )
-        if not is_valid_shipping_method(checkout, lines, discounts):
+        if not is_valid_shipping_method(checkout, lines, discounts, pricing):
             raise ValidationError(
                 {
                     "shipping_method": ValidationError(
@@ -64,9 +66,10 @@ def clean_checkout_payment(
     lines: Iterable[CheckoutLine],
     discounts: Iterable[DiscountInfo],
     error_code: CheckoutErrorCode,
+    pricing: Optional[CheckoutPricing] = None,
 ):
     clean_billing_address(checkout, error_code)
-    if not is_fully_paid(checkout, lines, discounts):
+    if not is_fully_paid(checkout, lines, discounts, pricing):
         raise ValidationError(
             "Provided payment methods can not cover the checkout's total amount",
             code=error_code.CHECKOUT_NOT_FULLY_PAID,
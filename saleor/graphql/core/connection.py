@@ -1,8 +1,22 @@
+import hashlib
 import json
-from typing import Any, Dict, Iterable, List, Tuple, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import graphene
-from django.db.models import Model as DjangoModel, Q, QuerySet
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist, ValidationError
+from django.db import connections
+from django.db.models import (
+    BooleanField,
+    Expression,
+    F,
+    Field,
+    Model as DjangoModel,
+    Q,
+    QuerySet,
+    Value,
+)
 from graphene.relay.connection import Connection
 from graphene_django.types import DjangoObjectType
 from graphql.error import GraphQLError
@@ -10,6 +24,7 @@ from graphql_relay.connection.connectiontypes import Edge, PageInfo
 from graphql_relay.utils import base64, unbase64
 
 from ..core.enums import OrderDirection
+from ..query_cache import limit_response_cache_timeout
 
 ConnectionArguments = Dict[str, Any]
 
@@ -92,6 +107,109 @@ def _prepare_filter(
     return filter_kwargs
 
 
+class RowValueComparison(Expression):
+    """Compare two row values, e.g. `(name, slug) > (%s, %s)`.
+
+    Unlike the equivalent chain of `OR`ed conditions, PostgreSQL can match the
+    comparison against a composite index on the compared columns.
+    """
+
+    def __init__(self, lhs, rhs, operator):
+        super().__init__(output_field=BooleanField())
+        self.lhs = list(lhs)
+        self.rhs = list(rhs)
+        self.operator = operator
+
+    def get_source_expressions(self):
+        return [*self.lhs, *self.rhs]
+
+    def set_source_expressions(self, exprs):
+        size = len(self.lhs)
+        self.lhs, self.rhs = exprs[:size], exprs[size:]
+
+    def as_sql(self, compiler, connection):
+        params: List[Any] = []
+        rows = []
+        for expressions in (self.lhs, self.rhs):
+            row_sql = []
+            for expression in expressions:
+                sql, expression_params = compiler.compile(expression)
+                row_sql.append(sql)
+                params.extend(expression_params)
+            rows.append("(%s)" % ", ".join(row_sql))
+        return "%s %s %s" % (rows[0], self.operator, rows[1]), params
+
+
+def _get_sorting_field_path(model, field_name: str) -> Optional[List[Field]]:
+    """Return the model fields a sorting field in filter format goes through.
+
+    Return None unless the path ends with a concrete, non-relational field.
+    """
+    opts = model._meta
+    field_path = []
+    for elem in field_name.split("__"):
+        if opts is None:
+            return None
+        try:
+            field = opts.pk if elem == "pk" else opts.get_field(elem)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete or field.many_to_many or field.one_to_many:
+            return None
+        field_path.append(field)
+        opts = field.related_model._meta if field.is_relation else None
+    if field_path[-1].is_relation:
+        return None
+    return field_path
+
+
+def _prepare_row_value_filter(
+    qs: QuerySet, cursor: List[str], sorting_fields: List[str], sorting_direction: str
+) -> Optional[RowValueComparison]:
+    """Create a row value comparison of the sorting fields and the cursor.
+
+    Return None when the comparison can't replace the filter prepared by
+    `_prepare_filter`: when sorting by annotations or by null values. A row
+    comparison never matches rows with nulls, which is only correct for
+    descending order, where PostgreSQL puts nulls first.
+    """
+    if None in cursor:
+        return None
+    fields = []
+    for field_name in sorting_fields:
+        if field_name in qs.query.annotations:
+            return None
+        field_path = _get_sorting_field_path(qs.model, field_name)
+        if field_path is None:
+            return None
+        if sorting_direction == "gt" and any(field.null for field in field_path):
+            return None
+        fields.append(field_path[-1])
+
+    try:
+        values = [
+            Value(field.to_python(value), output_field=field)
+            for field, value in zip(fields, cursor)
+        ]
+    except ValidationError:
+        raise GraphQLError("Received cursor is invalid.")
+    operator = ">" if sorting_direction == "gt" else "<"
+    return RowValueComparison(
+        [F(field_name) for field_name in sorting_fields], values, operator
+    )
+
+
+def _prepare_cursor_filter(
+    qs: QuerySet, cursor: List[str], sorting_fields: List[str], sorting_direction: str
+) -> Union[Q, RowValueComparison]:
+    row_value_filter = _prepare_row_value_filter(
+        qs, cursor, sorting_fields, sorting_direction
+    )
+    if row_value_filter is not None:
+        return row_value_filter
+    return _prepare_filter(cursor, sorting_fields, sorting_direction)
+
+
 def _validate_connection_args(args):
     first = args.get("first")
     last = args.get("last")
@@ -212,7 +330,9 @@ def connection_from_queryset_slice(
     if cursor and len(cursor) != len(sorting_fields):
         raise GraphQLError("Received cursor is invalid.")
     filter_kwargs = (
-        _prepare_filter(cursor, sorting_fields, sorting_direction) if cursor else Q()
+        _prepare_cursor_filter(qs, cursor, sorting_fields, sorting_direction)
+        if cursor
+        else Q()
     )
     qs = qs.filter(filter_kwargs)
     qs = qs[:end_margin]
@@ -253,17 +373,93 @@ class NonNullConnection(Connection):
         )
 
 
+TOTAL_COUNT_CACHE_KEY = "total_count:{}:{}"
+
+
+def _get_estimated_count(qs: QuerySet) -> Optional[int]:
+    """Return the number of rows the PostgreSQL planner expects the query to return.
+
+    The planner bases the estimate on table statistics (`pg_class.reltuples`),
+    which are refreshed by `ANALYZE`, so it gets less accurate with every filter.
+    """
+    connection = connections[qs.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = qs.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def get_total_count(qs: QuerySet) -> Tuple[int, bool]:
+    """Return the number of objects in the queryset and whether it is exact.
+
+    Counts are cached per query for `GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT` seconds,
+    if enabled. Queries expected to return at least
+    `GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD` rows are not counted when it's set;
+    the planner estimate is returned instead.
+    """
+    try:
+        sql, params = qs.query.sql_with_params()
+    except EmptyResultSet:
+        return 0, True
+    cache_timeout = settings.GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT
+    if cache_timeout > 0:
+        query_hash = hashlib.md5(repr((sql, params)).encode("utf-8")).hexdigest()
+        cache_key = TOTAL_COUNT_CACHE_KEY.format(qs.model._meta.label_lower, query_hash)
+        total_count = cache.get(cache_key)
+        if total_count is not None:
+            return total_count
+
+    threshold = settings.GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD
+    estimated_count = _get_estimated_count(qs) if threshold else None
+    if estimated_count is not None and estimated_count >= threshold:
+        total_count = (estimated_count, False)
+    else:
+        total_count = (qs.count(), True)
+    if cache_timeout > 0:
+        cache.set(cache_key, total_count, cache_timeout)
+    return total_count
+
+
 class CountableConnection(NonNullConnection):
     class Meta:
         abstract = True
 
     total_count = graphene.Int(description="A total count of items in the collection.")
+    is_total_count_exact = graphene.Boolean(
+        description=(
+            "Determines if `totalCount` is an exact count. For large collections, "
+            "an estimate is returned instead."
+        )
+    )
+
+    @staticmethod
+    def _get_total_count(root, info) -> Tuple[int, bool]:
+        if not hasattr(root, "_total_count"):
+            if isinstance(root.iterable, list):
+                root._total_count = (len(root.iterable), True)
+            else:
+                root._total_count = get_total_count(root.iterable)
+                # Counts may be served from their own cache, which isn't purged
+                # along with the cached response
+                limit_response_cache_timeout(
+                    info.context, settings.GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT
+                )
+        return root._total_count
+
+    @staticmethod
+    def resolve_total_count(root, info, **_kwargs):
+        total_count, _ = CountableConnection._get_total_count(root, info)
+        return total_count
 
     @staticmethod
-    def resolve_total_count(root, *_args, **_kwargs):
-        if isinstance(root.iterable, list):
-            return len(root.iterable)
-        return root.iterable.count()
+    def resolve_is_total_count_exact(root, info, **_kwargs):
+        _, is_exact = CountableConnection._get_total_count(root, info)
+        return is_exact
 
 
 class CountableDjangoObjectType(DjangoObjectType):
@@ -271,9 +467,11 @@ class CountableDjangoObjectType(DjangoObjectType):
         abstract = True
 
     @classmethod
-    def __init_subclass_with_meta__(cls, *args, **kwargs):
-        # Force it to use the countable connection
-        countable_conn = CountableConnection.create_type(
+    def __init_subclass_with_meta__(cls, *args, connection_class=None, **kwargs):
+        # Force it to use the countable connection; types may extend it by passing
+        # a subclass of `CountableConnection` as `connection_class`.
+        connection_class = connection_class or CountableConnection
+        countable_conn = connection_class.create_type(
             "{}CountableConnection".format(cls.__name__), node=cls
         )
         super().__init_subclass_with_meta__(*args, connection=countable_conn, **kwargs)
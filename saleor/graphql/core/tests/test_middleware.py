@@ -2,7 +2,7 @@ from unittest.mock import Mock
 
 from django.urls import reverse
 
-from ...middleware import app_middleware
+from ...middleware import app_middleware, get_app
 
 
 def test_app_middleware_accepts_api_requests(app, rf):
@@ -15,3 +15,78 @@ def test_app_middleware_accepts_api_requests(app, rf):
     app_middleware(lambda root, info: info.context, Mock(), Mock(context=request))
 
     assert request.app == app
+
+
+def test_get_app_loads_permissions(app, permission_manage_products):
+    app.permissions.add(permission_manage_products)
+    token = app.tokens.first().auth_token
+
+    app_from_token = get_app(token)
+
+    assert app_from_token == app
+    assert app_from_token.get_permissions() == {"product.manage_products"}
+
+
+def test_get_app_inactive(app):
+    app.is_active = False
+    app.save(update_fields=["is_active"])
+
+    assert get_app(app.tokens.first().auth_token) is None
+
+
+def test_get_app_from_cache(app, permission_manage_products, django_assert_num_queries):
+    app.permissions.add(permission_manage_products)
+    token = app.tokens.first().auth_token
+    get_app(token)
+
+    with django_assert_num_queries(0):
+        app_from_token = get_app(token)
+        assert app_from_token == app
+        assert app_from_token.has_perm("product.manage_products")
+
+
+def test_cached_app_dropped_on_deactivation(app):
+    token = app.tokens.first().auth_token
+    get_app(token)
+
+    app.is_active = False
+    app.save(update_fields=["is_active"])
+
+    assert get_app(token) is None
+
+
+def test_cached_app_dropped_on_token_delete(app):
+    app_token = app.tokens.first()
+    get_app(app_token.auth_token)
+
+    app_token.delete()
+
+    assert get_app(app_token.auth_token) is None
+
+
+def test_cached_app_dropped_on_permissions_change(app, permission_manage_products):
+    token = app.tokens.first().auth_token
+    get_app(token)
+
+    app.permissions.add(permission_manage_products)
+
+    assert get_app(token).has_perm("product.manage_products")
+
+
+def test_cached_app_dropped_on_permission_apps_change(app, permission_manage_products):
+    token = app.tokens.first().auth_token
+    get_app(token)
+
+    permission_manage_products.app_set.add(app)
+
+    assert get_app(token).has_perm("product.manage_products")
+
+
+def test_cached_app_dropped_on_permission_apps_clear(app, permission_manage_products):
+    app.permissions.add(permission_manage_products)
+    token = app.tokens.first().auth_token
+    get_app(token)
+
+    permission_manage_products.app_set.clear()
+
+    assert not get_app(token).has_perm("product.manage_products")
@@ -2,9 +2,18 @@ import math
 
 import graphene
 import pytest
+from graphql.error import GraphQLError
 
+from ....product.models import Product
 from ....tests.models import Book
-from ..connection import CountableDjangoObjectType
+from ..connection import (
+    CountableDjangoObjectType,
+    RowValueComparison,
+    _get_estimated_count,
+    _prepare_cursor_filter,
+    _prepare_filter,
+    get_total_count,
+)
 from ..fields import FilterInputConnectionField
 
 
@@ -218,3 +227,132 @@ def test_pagination_backward_last_page_info(books):
     page_info = content["books"]["pageInfo"]
     assert page_info["hasNextPage"]
     assert page_info["hasPreviousPage"] is False
+
+
+def test_cursor_filter_uses_row_value_comparison():
+    qs = Product.objects.order_by("name", "slug")
+
+    cursor_filter = _prepare_cursor_filter(qs, ["Name", "slug"], ["name", "slug"], "gt")
+
+    assert isinstance(cursor_filter, RowValueComparison)
+    sql = str(qs.filter(cursor_filter).query)
+    assert '("product_product"."name", "product_product"."slug") > (' in sql
+
+
+def test_cursor_filter_uses_row_value_comparison_for_nulls_first():
+    qs = Product.objects.order_by("-updated_at", "-name", "-slug")
+    cursor = ["2020-08-27 10:05:00+00:00", "Name", "slug"]
+
+    cursor_filter = _prepare_cursor_filter(
+        qs, cursor, ["updated_at", "name", "slug"], "lt"
+    )
+
+    assert isinstance(cursor_filter, RowValueComparison)
+
+
+@pytest.mark.parametrize(
+    "cursor, sorting_fields, sorting_direction",
+    [
+        # nullable fields sorted in ascending order
+        (["2020-08-27 10:05:00+00:00", "slug"], ["updated_at", "slug"], "gt"),
+        # cursor with null values
+        ([None, "Name", "slug"], ["updated_at", "name", "slug"], "lt"),
+        # fields that are not model columns
+        (["1", "slug"], ["min_variants_price_amount", "slug"], "gt"),
+        (["Type", "slug"], ["product_type", "slug"], "gt"),
+    ],
+)
+def test_cursor_filter_falls_back_to_nested_conditions(
+    cursor, sorting_fields, sorting_direction
+):
+    qs = Product.objects.all()
+
+    cursor_filter = _prepare_cursor_filter(
+        qs, cursor, sorting_fields, sorting_direction
+    )
+
+    assert cursor_filter == _prepare_filter(cursor, sorting_fields, sorting_direction)
+
+
+def test_cursor_filter_with_invalid_cursor_value():
+    qs = Product.objects.all()
+
+    with pytest.raises(GraphQLError):
+        _prepare_cursor_filter(qs, ["not-a-date", "slug"], ["updated_at", "slug"], "lt")
+
+
+QUERY_TOTAL_COUNT = """
+    query BooksTotalCount {
+        books(first: 1) {
+            totalCount
+            isTotalCountExact
+        }
+    }
+"""
+
+
+def test_total_count(books):
+    result = schema.execute(QUERY_TOTAL_COUNT)
+
+    assert not result.errors
+    assert result.data["books"] == {
+        "totalCount": len(books),
+        "isTotalCountExact": True,
+    }
+
+
+def test_total_count_cached_per_query(books, settings):
+    settings.GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT = 30
+    qs = Book.objects.all()
+
+    assert get_total_count(qs) == (len(books), True)
+    Book.objects.create(name="New book")
+
+    assert get_total_count(qs) == (len(books), True)
+    assert get_total_count(qs.filter(name__startswith="New")) == (1, True)
+
+
+def test_total_count_not_cached_by_default(books):
+    qs = Book.objects.all()
+
+    assert get_total_count(qs) == (len(books), True)
+    Book.objects.create(name="New book")
+
+    assert get_total_count(qs) == (len(books) + 1, True)
+
+
+def test_total_count_estimated_above_threshold(books, settings, monkeypatch):
+    settings.GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD = 1000
+    monkeypatch.setattr(
+        "saleor.graphql.core.connection._get_estimated_count", lambda qs: 1500
+    )
+
+    result = schema.execute(QUERY_TOTAL_COUNT)
+
+    assert not result.errors
+    assert result.data["books"] == {"totalCount": 1500, "isTotalCountExact": False}
+
+
+def test_total_count_exact_below_threshold(books, settings, monkeypatch):
+    settings.GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD = 1000
+    monkeypatch.setattr(
+        "saleor.graphql.core.connection._get_estimated_count", lambda qs: 999
+    )
+
+    assert get_total_count(Book.objects.all()) == (len(books), True)
+
+
+def test_total_count_estimation_disabled_by_default(books, monkeypatch):
+    monkeypatch.setattr(
+        "saleor.graphql.core.connection._get_estimated_count", lambda qs: 1500
+    )
+
+    assert get_total_count(Book.objects.all()) == (len(books), True)
+
+
+def test_total_count_of_empty_query(db):
+    assert get_total_count(Book.objects.filter(pk__in=[])) == (0, True)
+
+
+def test_get_estimated_count(books):
+    assert isinstance(_get_estimated_count(Book.objects.all()), int)
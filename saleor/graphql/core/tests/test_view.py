@@ -1,11 +1,19 @@
+from concurrent.futures import ThreadPoolExecutor
 from unittest import mock
 
 import graphene
 import pytest
+from django.db import connection
 from django.test import override_settings
+from django.utils import timezone
 
+from ....core.cache import purge_response_cache
 from ....demo.views import EXAMPLE_QUERY
+from ....discount.utils import fetch_cached_discounts
+from ....product.models import Category, ProductVariant
+from ....product.tasks import update_products_minimal_variant_prices_task
 from ...product.types import Product
+from ...query_cache import DocumentCache, TableTracker, document_cache, get_query_hash
 from ...tests.fixtures import (
     ACCESS_CONTROL_ALLOW_CREDENTIALS,
     ACCESS_CONTROL_ALLOW_HEADERS,
@@ -14,6 +22,7 @@ from ...tests.fixtures import (
     API_PATH,
 )
 from ...tests.utils import _get_graphql_content_from_response, get_graphql_content
+from ...views import GraphQLView
 
 
 def test_batch_queries(category, product, api_client):
@@ -56,6 +65,96 @@ def test_batch_queries(category, product, api_client):
     assert data["category"]["name"] == category.name
 
 
+@mock.patch.object(
+    GraphQLView, "get_isolated_response", return_value=({"data": {}}, 200)
+)
+def test_batch_queries_executed_concurrently(
+    mocked_get_isolated_response, api_client, settings
+):
+    settings.GRAPHQL_BATCH_MAX_WORKERS = 4
+    data = [{"query": "{ __typename }"}, {"query": "query Shop { __typename }"}]
+
+    response = api_client.post(data)
+
+    assert response.status_code == 200
+    assert mocked_get_isolated_response.call_count == 2
+
+
+@mock.patch("saleor.graphql.views.ThreadPoolExecutor", wraps=ThreadPoolExecutor)
+def test_batch_queries_responses_from_thread_pool(
+    mocked_thread_pool_executor,
+    transactional_db,
+    category,
+    product,
+    api_client,
+    settings,
+):
+    settings.GRAPHQL_BATCH_MAX_WORKERS = 2
+    query_product = """
+        query GetProduct($id: ID!) {
+            product(id: $id) {
+                name
+            }
+        }
+    """
+    data = [
+        {
+            "query": QUERY_CATEGORY_NAME,
+            "variables": {"id": graphene.Node.to_global_id("Category", category.pk)},
+        },
+        {
+            "query": query_product,
+            "variables": {"id": graphene.Node.to_global_id("Product", product.pk)},
+        },
+    ]
+
+    response = api_client.post(data)
+
+    batch_content = get_graphql_content(response)
+    mocked_thread_pool_executor.assert_called_once_with(max_workers=2)
+    # Responses are returned in the order of the operations
+    assert batch_content[0]["data"]["category"]["name"] == category.name
+    assert batch_content[1]["data"]["product"]["name"] == product.name
+
+
+@mock.patch.object(
+    GraphQLView, "parse_query", autospec=True, side_effect=GraphQLView.parse_query
+)
+def test_batch_operations_parsed_once(
+    mocked_parse_query, category, api_client, settings
+):
+    settings.GRAPHQL_BATCH_MAX_WORKERS = 0
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60
+    variables = {"id": graphene.Node.to_global_id("Category", category.pk)}
+    data = [
+        {"query": QUERY_CATEGORY_NAME, "variables": variables},
+        {"query": "query Shop { __typename }"},
+    ]
+
+    response = api_client.post(data)
+
+    batch_content = get_graphql_content(response)
+    assert batch_content[0]["data"]["category"]["name"] == category.name
+    assert mocked_parse_query.call_count == 2
+
+
+@mock.patch.object(GraphQLView, "get_isolated_response")
+def test_batch_with_mutation_executed_serially(
+    mocked_get_isolated_response, api_client, settings
+):
+    settings.GRAPHQL_BATCH_MAX_WORKERS = 4
+    data = [
+        {"query": "{ __typename }"},
+        {"query": 'mutation { tokenVerify(token: "") { isValid } }'},
+    ]
+
+    response = api_client.post(data)
+
+    batch_content = get_graphql_content(response)
+    assert len(batch_content) == 2
+    mocked_get_isolated_response.assert_not_called()
+
+
 @pytest.mark.parametrize("playground_on, status", [(True, 200), (False, 405)])
 def test_graphql_view_get_enabled_or_disabled(client, settings, playground_on, status):
     settings.PLAYGROUND_ENABLED = playground_on
@@ -289,3 +388,325 @@ def test_example_query(api_client, product):
     response = api_client.post_graphql(EXAMPLE_QUERY)
     content = get_graphql_content(response)
     assert content["data"]["products"]["edges"][0]["node"]["name"] == product.name
+
+
+def test_parsed_query_is_cached(api_client, product, settings):
+    settings.GRAPHQL_QUERY_CACHE_SIZE = 10
+    query = "{ products(first: 1) { edges { node { name } } } }"
+    document_cache.clear()
+
+    response = api_client.post_graphql(query)
+    content = get_graphql_content(response)
+    assert content["data"]["products"]["edges"][0]["node"]["name"] == product.name
+    assert document_cache.get(get_query_hash(query)) is not None
+
+    with mock.patch(
+        "graphql.backend.core.GraphQLCoreBackend.document_from_string"
+    ) as mocked_document_from_string:
+        response = api_client.post_graphql(query)
+    get_graphql_content(response)
+    mocked_document_from_string.assert_not_called()
+
+
+def test_document_cache_evicts_least_recently_used():
+    cache = DocumentCache(maxsize=2)
+    cache.set("a", mock.Mock())
+    cache.set("b", mock.Mock())
+    cache.get("a")
+    cache.set("c", mock.Mock())
+
+    assert len(cache) == 2
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+
+
+def test_invalid_query_is_not_cached(api_client, settings):
+    settings.GRAPHQL_QUERY_CACHE_SIZE = 10
+    query = "{ products(first: 1) { edges { node { notAField } } } }"
+    document_cache.clear()
+
+    response = api_client.post_graphql(query)
+
+    assert response.status_code == 400
+    assert document_cache.get(get_query_hash(query)) is None
+
+
+def test_persisted_query_not_found(api_client):
+    query_hash = get_query_hash("{ shop { description } }")
+    data = {"extensions": {"persistedQuery": {"version": 1, "sha256Hash": query_hash}}}
+
+    response = api_client.post(data)
+
+    content = _get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "PersistedQueryNotFound"
+
+
+def test_persisted_query_registered_and_executed_by_hash(api_client, site_settings):
+    query = "{ shop { name } }"
+    extensions = {"persistedQuery": {"version": 1, "sha256Hash": get_query_hash(query)}}
+
+    response = api_client.post({"query": query, "extensions": extensions})
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+
+    response = api_client.post({"extensions": extensions})
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+
+
+def test_persisted_query_hash_mismatch(api_client):
+    extensions = {"persistedQuery": {"version": 1, "sha256Hash": "wrong-hash"}}
+
+    response = api_client.post({"query": "{ shop { name } }", "extensions": extensions})
+
+    assert response.status_code == 400
+    content = _get_graphql_content_from_response(response)
+    assert "does not match" in content["errors"][0]["message"]
+
+
+QUERY_CATEGORY_NAME = """
+    query GetCategory($id: ID!) {
+        category(id: $id) {
+            name
+        }
+    }
+"""
+
+MUTATION_CATEGORY_UPDATE = """
+    mutation UpdateCategory($id: ID!, $name: String!) {
+        categoryUpdate(id: $id, input: {name: $name}) {
+            category {
+                name
+            }
+        }
+    }
+"""
+
+
+def _query_category_name(client, category):
+    variables = {"id": graphene.Node.to_global_id("Category", category.pk)}
+    response = client.post_graphql(QUERY_CATEGORY_NAME, variables)
+    content = get_graphql_content(response)
+    return content["data"]["category"]["name"]
+
+
+def test_anonymous_query_response_is_cached(api_client, category, settings):
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60
+    name = category.name
+
+    assert _query_category_name(api_client, category) == name
+    Category.objects.filter(pk=category.pk).update(name="New name")
+
+    assert _query_category_name(api_client, category) == name
+
+
+def test_response_cache_disabled(api_client, category, settings):
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 0
+
+    _query_category_name(api_client, category)
+    Category.objects.filter(pk=category.pk).update(name="New name")
+
+    assert _query_category_name(api_client, category) == "New name"
+
+
+def test_authenticated_query_response_is_not_cached(
+    staff_api_client, category, settings
+):
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60
+
+    _query_category_name(staff_api_client, category)
+    Category.objects.filter(pk=category.pk).update(name="New name")
+
+    assert _query_category_name(staff_api_client, category) == "New name"
+
+
+def test_response_cache_keyed_by_variables(
+    api_client, category, category_with_image, settings
+):
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60
+
+    assert _query_category_name(api_client, category) == category.name
+    assert (
+        _query_category_name(api_client, category_with_image)
+        == category_with_image.name
+    )
+
+
+def test_response_cache_purged_by_mutation(
+    api_client, staff_api_client, category, permission_manage_products, settings
+):
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60
+    _query_category_name(api_client, category)
+    variables = {
+        "id": graphene.Node.to_global_id("Category", category.pk),
+        "name": "New name",
+    }
+
+    response = staff_api_client.post_graphql(
+        MUTATION_CATEGORY_UPDATE, variables, permissions=[permission_manage_products],
+    )
+    get_graphql_content(response)
+
+    assert _query_category_name(api_client, category) == "New name"
+
+
+def test_response_cache_purged_only_by_read_tables(api_client, category, settings):
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60
+    name = category.name
+    _query_category_name(api_client, category)
+    Category.objects.filter(pk=category.pk).update(name="New name")
+
+    purge_response_cache("menu_menu")
+
+    assert _query_category_name(api_client, category) == name
+    purge_response_cache("product_category")
+    assert _query_category_name(api_client, category) == "New name"
+
+
+QUERY_PRODUCT_PRICES = """
+    query GetProductPrices($id: ID!) {
+        product(id: $id) {
+            minimalVariantPrice {
+                amount
+            }
+            pricing {
+                priceRange {
+                    start {
+                        gross {
+                            amount
+                        }
+                    }
+                }
+            }
+        }
+    }
+"""
+
+MUTATION_SALE_UPDATE = """
+    mutation UpdateSale($id: ID!, $value: Decimal!) {
+        saleUpdate(id: $id, input: {value: $value}) {
+            discountErrors {
+                field
+            }
+        }
+    }
+"""
+
+
+def _query_product_prices(client, product):
+    variables = {"id": graphene.Node.to_global_id("Product", product.pk)}
+    response = client.post_graphql(QUERY_PRODUCT_PRICES, variables)
+    data = get_graphql_content(response)["data"]["product"]
+    return (
+        data["minimalVariantPrice"]["amount"],
+        data["pricing"]["priceRange"]["start"]["gross"]["amount"],
+    )
+
+
+@mock.patch(
+    "saleor.graphql.discount.mutations"
+    ".update_products_minimal_variant_prices_of_discount_task"
+)
+def test_response_cache_purged_by_sale_update(
+    mocked_update_prices_task,
+    api_client,
+    staff_api_client,
+    product,
+    sale,
+    permission_manage_discounts,
+    settings,
+):
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60
+    # The response isn't tagged with the sale when the discounts are cached
+    fetch_cached_discounts(timezone.now())
+    assert _query_product_prices(api_client, product) == (10, 5)
+    variables = {"id": graphene.Node.to_global_id("Sale", sale.pk), "value": 7}
+
+    response = staff_api_client.post_graphql(
+        MUTATION_SALE_UPDATE, variables, permissions=[permission_manage_discounts]
+    )
+    content = get_graphql_content(response)
+
+    assert not content["data"]["saleUpdate"]["discountErrors"]
+    assert _query_product_prices(api_client, product) == (10, 3)
+    mocked_update_prices_task.delay.assert_called_once_with(sale.pk)
+
+
+def test_response_cache_purged_by_minimal_variant_prices_task(
+    api_client, product, settings
+):
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60
+    assert _query_product_prices(api_client, product) == (10, 10)
+    ProductVariant.objects.filter(product=product).update(price_amount=20)
+
+    update_products_minimal_variant_prices_task(product_ids=[product.pk])
+
+    assert _query_product_prices(api_client, product) == (20, 20)
+
+
+def test_response_with_errors_is_not_cached(api_client, settings):
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60
+    variables = {"id": graphene.Node.to_global_id("Product", 1)}
+
+    with mock.patch("saleor.graphql.views.store_response") as mocked_store_response:
+        response = api_client.post_graphql(QUERY_CATEGORY_NAME, variables)
+
+    assert response.json()["errors"]
+    mocked_store_response.assert_not_called()
+
+
+QUERY_CATEGORIES_TOTAL_COUNT = """
+    query {
+        categories(first: 10) {
+            totalCount
+        }
+    }
+"""
+
+
+def test_response_cache_timeout_limited_by_total_count_cache(
+    api_client, category, settings
+):
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60
+    settings.GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT = 10
+
+    with mock.patch("saleor.graphql.views.store_response") as mocked_store_response:
+        response = api_client.post_graphql(QUERY_CATEGORIES_TOTAL_COUNT)
+
+    assert get_graphql_content(response)["data"]["categories"]["totalCount"] == 1
+    timeout = mocked_store_response.call_args[0][3]
+    assert timeout == 10
+
+
+def test_response_cache_timeout_not_limited_by_disabled_total_count_cache(
+    api_client, category, settings
+):
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60
+    settings.GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT = 0
+
+    with mock.patch("saleor.graphql.views.store_response") as mocked_store_response:
+        response = api_client.post_graphql(QUERY_CATEGORIES_TOTAL_COUNT)
+
+    get_graphql_content(response)
+    timeout = mocked_store_response.call_args[0][3]
+    assert timeout == 60
+
+
+@mock.patch("saleor.core.cache.cache")
+def test_purge_response_cache_when_disabled(mocked_cache, settings):
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 0
+
+    purge_response_cache("product_category")
+
+    mocked_cache.delete_many.assert_not_called()
+
+
+def test_table_tracker_collects_read_and_written_tables(category):
+    table_tracker = TableTracker()
+
+    with connection.execute_wrapper(table_tracker):
+        Category.objects.filter(pk=category.pk).update(name="New name")
+        list(Category.objects.filter(products__isnull=True))
+
+    assert table_tracker.written_tables == {"product_category"}
+    assert table_tracker.read_tables == {"product_category", "product_product"}
@@ -2,6 +2,7 @@ import graphene
 
 from ...core.permissions import DiscountPermissions
 from ...discount import models
+from ...discount.utils import invalidate_discounts_cache
 from ..core.mutations import ModelBulkDeleteMutation
 from ..core.types.common import DiscountError
 
@@ -19,6 +20,11 @@ class SaleBulkDelete(ModelBulkDeleteMutation):
         error_type_class = DiscountError
         error_type_field = "discount_errors"
 
+    @classmethod
+    def bulk_action(cls, queryset):
+        super().bulk_action(queryset)
+        invalidate_discounts_cache()
+
 
 class VoucherBulkDelete(ModelBulkDeleteMutation):
     class Arguments:
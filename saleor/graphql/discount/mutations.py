@@ -5,6 +5,7 @@ from ...core.permissions import DiscountPermissions
 from ...core.utils.promo_code import generate_promo_code, is_available_promo_code
 from ...discount import models
 from ...discount.error_codes import DiscountErrorCode
+from ...discount.utils import invalidate_discounts_cache
 from ...product.tasks import (
     update_products_minimal_variant_prices_of_catalogues_task,
     update_products_minimal_variant_prices_of_discount_task,
@@ -268,6 +269,7 @@ class SaleInput(graphene.InputObjectType):
 class SaleUpdateMinimalVariantPriceMixin:
     @classmethod
     def success_response(cls, instance):
+        invalidate_discounts_cache()
         # Update the "minimal_variant_prices" of the associated, discounted
         # products (including collections and categories).
         update_products_minimal_variant_prices_of_discount_task.delay(instance.pk)
@@ -344,6 +346,7 @@ class SaleAddCatalogues(SaleBaseCatalogueMutation):
             info, data.get("id"), only_type=Sale, field="sale_id"
         )
         cls.add_catalogues_to_node(sale, data.get("input"))
+        invalidate_discounts_cache()
         return SaleAddCatalogues(sale=sale)
 
 
@@ -360,4 +363,5 @@ class SaleRemoveCatalogues(SaleBaseCatalogueMutation):
             info, data.get("id"), only_type=Sale, field="sale_id"
         )
         cls.remove_catalogues_from_node(sale, data.get("input"))
+        invalidate_discounts_cache()
         return SaleRemoveCatalogues(sale=sale)
@@ -1,7 +1,9 @@
 import graphene
 import pytest
+from django.utils import timezone
 
 from ....discount.models import Sale, Voucher
+from ....discount.utils import fetch_cached_discounts
 from ...tests.utils import get_graphql_content
 
 
@@ -22,6 +24,7 @@ def voucher_list():
 
 
 def test_delete_sales(staff_api_client, sale_list, permission_manage_discounts):
+    assert len(fetch_cached_discounts(timezone.now())) == 3
     query = """
     mutation saleBulkDelete($ids: [ID]!) {
         saleBulkDelete(ids: $ids) {
@@ -40,6 +43,7 @@ def test_delete_sales(staff_api_client, sale_list, permission_manage_discounts):
 
     assert content["data"]["saleBulkDelete"]["count"] == 3
     assert not Sale.objects.filter(id__in=[sale.id for sale in sale_list]).exists()
+    assert not fetch_cached_discounts(timezone.now())
 
 
 def test_delete_vouchers(staff_api_client, voucher_list, permission_manage_discounts):
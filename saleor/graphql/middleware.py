@@ -5,10 +5,14 @@ import opentracing.tags
 from django.conf import settings
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import AnonymousUser
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import CharField, Q, Value
+from django.db.models.functions import Concat
 from django.utils.functional import SimpleLazyObject
 from graphql import ResolveInfo
 
 from ..app.models import App
+from ..core.auth_cache import cache_app, get_cached_app, is_app_token_cache_enabled
 from ..core.exceptions import ReadOnlyException
 from ..core.tracing import should_trace
 from .views import API_PATH, GraphQLView
@@ -46,8 +50,38 @@ class OpentracingGrapheneMiddleware:
 
 
 def get_app(auth_token) -> Optional[App]:
+    """Return the active app the token belongs to, with its permissions loaded.
+
+    Apps are cached per token, so authenticating with a warm cache doesn't hit
+    the database.
+    """
+    use_cache = is_app_token_cache_enabled()
+    cached = get_cached_app(auth_token) if use_cache else None
+    if cached is not None:
+        app, permissions = cached
+        app._app_perm_cache = permissions
+        return app
+
     qs = App.objects.filter(tokens__auth_token=auth_token, is_active=True)
-    return qs.first()
+    app = qs.annotate(
+        permission_names=ArrayAgg(
+            Concat(
+                "permissions__content_type__app_label",
+                Value("."),
+                "permissions__codename",
+                output_field=CharField(),
+            ),
+            filter=Q(permissions__isnull=False),
+            distinct=True,
+        )
+    ).first()
+    if not app:
+        return None
+    permissions = set(app.permission_names)
+    if use_cache:
+        cache_app(auth_token, app, permissions)
+    app._app_perm_cache = permissions
+    return app
 
 
 def app_middleware(next, root, info, **kwargs):
@@ -3,6 +3,7 @@ import graphene
 from ....core.permissions import OrderPermissions
 from ....order import models
 from ....order.actions import cancel_order
+from ....plugins.webhook.plugin import batch_order_events
 from ...core.mutations import BaseBulkMutation
 from ...core.types.common import OrderError
 from ..mutations.orders import clean_order_cancel
@@ -32,5 +33,6 @@ class OrderBulkCancel(BaseBulkMutation):
 
     @classmethod
     def bulk_action(cls, queryset, user):
-        for order in queryset:
-            cancel_order(order=order, user=user)
+        with batch_order_events():
+            for order in queryset:
+                cancel_order(order=order, user=user)
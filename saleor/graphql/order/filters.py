@@ -1,5 +1,5 @@
 import django_filters
-from django.db.models import Sum
+from django.db.models import Q, Sum
 
 from ...order.models import Order
 from ..core.filters import ListObjectTypeFilter, ObjectTypeFilter
@@ -36,6 +36,7 @@ def filter_status(qs, _, value):
 
 
 def filter_customer(qs, _, value):
+    # The search document contains discount names, so it can't be used here
     customer_fields = [
         "user_email",
         "user__first_name",
@@ -51,15 +52,11 @@ def filter_created_range(qs, _, value):
 
 
 def filter_order_search(qs, _, value):
-    order_fields = [
-        "pk",
-        "discount_name",
-        "translated_discount_name",
-        "user_email",
-        "user__first_name",
-        "user__last_name",
-    ]
-    qs = filter_by_query_param(qs, value, order_fields)
+    if value:
+        lookup = Q(search_document__contains=value.lower())
+        if value.isdigit():
+            lookup |= Q(pk=value)
+        qs = qs.filter(lookup)
     return qs
 
 
@@ -17,7 +17,7 @@ from ....order.utils import (
     recalculate_order,
     update_order_prices,
 )
-from ....warehouse.management import allocate_stock
+from ....warehouse.management import allocate_stocks_for_order
 from ...account.i18n import I18nMixin
 from ...account.types import AddressInput
 from ...core.mutations import BaseMutation, ModelDeleteMutation, ModelMutation
@@ -263,19 +263,17 @@ class DraftOrderComplete(BaseMutation):
 
         order.save()
 
-        for line in order:
-            if line.variant.track_inventory:
-                try:
-                    allocate_stock(line, country, line.quantity)
-                except InsufficientStock as exc:
-                    raise ValidationError(
-                        {
-                            "lines": ValidationError(
-                                f"Insufficient product stock: {exc.item}",
-                                code=OrderErrorCode.INSUFFICIENT_STOCK,
-                            )
-                        }
+        try:
+            allocate_stocks_for_order(order.lines.select_related("variant"), country)
+        except InsufficientStock as exc:
+            raise ValidationError(
+                {
+                    "lines": ValidationError(
+                        f"Insufficient product stock: {exc.item}",
+                        code=OrderErrorCode.INSUFFICIENT_STOCK,
                     )
+                }
+            )
         order_created(order, user=info.context.user, from_draft=True)
 
         return DraftOrderComplete(order=order)
@@ -18,6 +18,7 @@ from ....order.models import Order, OrderEvent
 from ....payment import ChargeStatus, CustomPaymentChoices, PaymentError
 from ....payment.models import Payment
 from ....plugins.manager import PluginsManager
+from ....search.utils import update_orders_search_document
 from ....shipping.models import ShippingMethod
 from ....warehouse.models import Allocation, Stock
 from ....warehouse.tests.utils import get_available_quantity_for_stock
@@ -2753,6 +2754,7 @@ def test_order_query_with_filter_customer_fields(
 
     order = Order(user=customer_user, token=str(uuid.uuid4()))
     Order.objects.bulk_create([order, Order(token=str(uuid.uuid4()))])
+    update_orders_search_document(Order.objects.all())
 
     variables = {"filter": orders_filter}
     staff_api_client.user.user_permissions.add(permission_manage_orders)
@@ -2790,6 +2792,7 @@ def test_draft_order_query_with_filter_customer_fields(
     Order.objects.bulk_create(
         [order, Order(token=str(uuid.uuid4()), status=OrderStatus.DRAFT)]
     )
+    update_orders_search_document(Order.objects.all())
 
     variables = {"filter": orders_filter}
     staff_api_client.user.user_permissions.add(permission_manage_orders)
@@ -2802,6 +2805,25 @@ def test_draft_order_query_with_filter_customer_fields(
     assert orders[0]["node"]["id"] == order_id
 
 
+def test_draft_order_query_filter_customer_skips_discount_name(
+    draft_orders_query_with_filter,
+    staff_api_client,
+    permission_manage_orders,
+    draft_order,
+):
+    draft_order.discount_name = "Leslie Sale"
+    draft_order.user_email = "customer@example.com"
+    draft_order.user = None
+    draft_order.save()
+
+    variables = {"filter": {"customer": "Leslie"}}
+    staff_api_client.user.user_permissions.add(permission_manage_orders)
+    response = staff_api_client.post_graphql(draft_orders_query_with_filter, variables)
+
+    content = get_graphql_content(response)
+    assert content["data"]["draftOrders"]["edges"] == []
+
+
 @pytest.mark.parametrize(
     "orders_filter, count",
     [
@@ -3027,6 +3049,7 @@ def test_orders_query_with_filter_search(
             ),
         ]
     )
+    update_orders_search_document(Order.objects.all())
     variables = {"filter": orders_filter}
     staff_api_client.user.user_permissions.add(permission_manage_orders)
     response = staff_api_client.post_graphql(orders_query_with_filter, variables)
@@ -3090,6 +3113,7 @@ def test_draft_orders_query_with_filter_search(
             ),
         ]
     )
+    update_orders_search_document(Order.objects.all())
     variables = {"filter": draft_orders_filter}
     staff_api_client.user.user_permissions.add(permission_manage_orders)
     response = staff_api_client.post_graphql(draft_orders_query_with_filter, variables)
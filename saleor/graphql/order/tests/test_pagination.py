@@ -8,6 +8,7 @@ from prices import Money, TaxedMoney
 
 from ....order.models import Order, OrderStatus
 from ....payment import ChargeStatus
+from ....search.utils import update_orders_search_document
 from ...tests.utils import get_graphql_content
 
 
@@ -418,6 +419,7 @@ def test_orders_query_pagination_with_filter_search(
             ),
         ]
     )
+    update_orders_search_document(Order.objects.all())
     page_size = 2
     variables = {"first": page_size, "after": None, "filter": orders_filter}
     staff_api_client.user.user_permissions.add(permission_manage_orders)
@@ -490,6 +492,7 @@ def test_draft_orders_query_pagination_with_filter_search(
             ),
         ]
     )
+    update_orders_search_document(Order.objects.all())
     page_size = 2
     variables = {"first": page_size, "after": None, "filter": draft_orders_filter}
     staff_api_client.user.user_permissions.add(permission_manage_orders)
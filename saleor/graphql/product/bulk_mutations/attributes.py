@@ -2,6 +2,8 @@ import graphene
 
 from ....core.permissions import ProductPermissions
 from ....product import models
+from ....product.tasks import update_products_attribute_sort_keys_task
+from ....product.utils.attributes import invalidate_attributes_lookup
 from ...core.mutations import ModelBulkDeleteMutation
 from ...core.types.common import ProductError
 
@@ -19,6 +21,12 @@ class AttributeBulkDelete(ModelBulkDeleteMutation):
         error_type_class = ProductError
         error_type_field = "product_errors"
 
+    @classmethod
+    def bulk_action(cls, queryset):
+        slugs = list(queryset.values_list("slug", flat=True))
+        queryset.delete()
+        invalidate_attributes_lookup(*slugs)
+
 
 class AttributeValueBulkDelete(ModelBulkDeleteMutation):
     class Arguments:
@@ -34,3 +42,18 @@ class AttributeValueBulkDelete(ModelBulkDeleteMutation):
         permissions = (ProductPermissions.MANAGE_PRODUCTS,)
         error_type_class = ProductError
         error_type_field = "product_errors"
+
+    @classmethod
+    def bulk_action(cls, queryset):
+        attributes = list(
+            models.Attribute.objects.filter(values__in=queryset).distinct()
+        )
+        product_type_ids = list(
+            models.ProductType.objects.filter(product_attributes__in=attributes)
+            .values_list("pk", flat=True)
+            .distinct()
+        )
+        queryset.delete()
+        invalidate_attributes_lookup(*[attribute.slug for attribute in attributes])
+        if product_type_ids:
+            update_products_attribute_sort_keys_task.delay(product_type_ids)
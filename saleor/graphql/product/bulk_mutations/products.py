@@ -5,11 +5,16 @@ from django.core.exceptions import ValidationError
 from django.db import transaction
 
 from ....core.permissions import ProductPermissions
+from ....discount.utils import invalidate_discounts_cache
 from ....product import models
 from ....product.error_codes import ProductErrorCode
-from ....product.tasks import update_product_minimal_variant_price_task
+from ....product.tasks import (
+    update_product_minimal_variant_price_task,
+    update_products_search_vector_task,
+)
 from ....product.utils import delete_categories
 from ....product.utils.attributes import generate_name_for_variant
+from ....search.utils import update_product_search_vector
 from ....warehouse import models as warehouse_models
 from ....warehouse.error_codes import StockErrorCode
 from ...core.mutations import (
@@ -54,6 +59,8 @@ class CategoryBulkDelete(ModelBulkDeleteMutation):
     @classmethod
     def bulk_action(cls, queryset):
         delete_categories(queryset.values_list("pk", flat=True))
+        # Deleted categories are no longer discounted by sales
+        invalidate_discounts_cache()
 
 
 class CollectionBulkDelete(ModelBulkDeleteMutation):
@@ -322,6 +329,7 @@ class ProductVariantBulkCreate(BaseMutation):
 
         # Recalculate the "minimal variant price" for the parent product
         update_product_minimal_variant_price_task.delay(product.pk)
+        update_product_search_vector(product)
 
         return ProductVariantBulkCreate(
             count=len(instances), product_variants=instances
@@ -343,6 +351,16 @@ class ProductVariantBulkDelete(ModelBulkDeleteMutation):
         error_type_class = ProductError
         error_type_field = "product_errors"
 
+    @classmethod
+    def bulk_action(cls, queryset):
+        product_ids = list(
+            queryset.values_list("product_id", flat=True).distinct().order_by()
+        )
+        queryset.delete()
+        # Search vectors of the products contain the SKUs of their variants
+        if product_ids:
+            update_products_search_vector_task.delay(product_ids)
+
 
 class ProductVariantStocksCreate(BaseMutation):
     product_variant = graphene.Field(
@@ -0,0 +1,235 @@
+import hashlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Union
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db.models import Count, Q, QuerySet
+
+from ...product import models
+from .enums import StockAvailability
+from .filters import filter_products_by_stock_availability
+
+PRODUCT_FACETS_CACHE_KEY = "product_facets:{}"
+
+
+@dataclass
+class AttributeValueFacetData:
+    value_id: int
+    count: int
+
+
+@dataclass
+class AttributeFacetData:
+    attribute_id: int
+    values: List[AttributeValueFacetData] = field(default_factory=list)
+
+
+@dataclass
+class PriceRangeFacetData:
+    gte: Optional[float]
+    lte: Optional[float]
+    count: int
+
+
+@dataclass
+class StockAvailabilityFacetData:
+    availability: str
+    count: int
+
+
+@dataclass
+class ProductFacetsData:
+    attributes: List[AttributeFacetData] = field(default_factory=list)
+    price_ranges: List[PriceRangeFacetData] = field(default_factory=list)
+    stock_availability: List[StockAvailabilityFacetData] = field(default_factory=list)
+
+
+def _get_facet_attributes(products, attribute_slugs, has_access_to_all):
+    attributes = models.Attribute.objects.all()
+    if not has_access_to_all:
+        attributes = attributes.get_public_attributes()
+    if attribute_slugs is not None:
+        attributes = attributes.filter(slug__in=attribute_slugs)
+    else:
+        product_types = products.values("product_type_id")
+        attributes = attributes.filter(
+            Q(filterable_in_storefront=True)
+            & (
+                Q(product_types__in=product_types)
+                | Q(product_variant_types__in=product_types)
+            )
+        ).distinct()
+    return attributes.prefetch_related("values")
+
+
+def _count_products_by_value(products, value_ids) -> Dict[int, int]:
+    # Attributes are assigned either to the products or to the variants of
+    # a product type, so the counts of a value never share any products.
+    product_ids = products.values("pk")
+    assigned_to_products = (
+        models.AssignedProductAttribute.values.through.objects.filter(
+            attributevalue_id__in=value_ids,
+            assignedproductattribute__product_id__in=product_ids,
+        )
+        .values("attributevalue_id")
+        .annotate(count=Count("assignedproductattribute__product_id", distinct=True))
+        .values_list("attributevalue_id", "count")
+    )
+    assigned_to_variants = (
+        models.AssignedVariantAttribute.values.through.objects.filter(
+            attributevalue_id__in=value_ids,
+            assignedvariantattribute__variant__product_id__in=product_ids,
+        )
+        .values("attributevalue_id")
+        .annotate(
+            count=Count("assignedvariantattribute__variant__product_id", distinct=True)
+        )
+        .values_list("attributevalue_id", "count")
+    )
+    counts: Dict[int, int] = defaultdict(int)
+    for value_id, count in chain(assigned_to_products, assigned_to_variants):
+        counts[value_id] += count
+    return counts
+
+
+def _get_attribute_facets(products, attributes) -> List[AttributeFacetData]:
+    facets = [
+        AttributeFacetData(
+            attribute_id=attribute.pk,
+            values=[
+                AttributeValueFacetData(value_id=value.pk, count=0)
+                for value in attribute.values.all()
+            ],
+        )
+        for attribute in attributes
+    ]
+    value_ids = [value.value_id for facet in facets for value in facet.values]
+    if not value_ids:
+        return facets
+
+    # Values are matched the same way as the attributes filter does, assigned
+    # either to the products or to their variants.
+    counts = _count_products_by_value(products, value_ids)
+    for facet in facets:
+        for value_facet in facet.values:
+            value_facet.count = counts.get(value_facet.value_id, 0)
+    return facets
+
+
+def _get_price_range_q(gte: Optional[float], lte: Optional[float]) -> Q:
+    lookup = Q()
+    if gte is not None:
+        lookup &= Q(minimal_variant_price_amount__gte=gte)
+    if lte is not None:
+        lookup &= Q(minimal_variant_price_amount__lte=lte)
+    return lookup
+
+
+def _get_price_and_stock_facets(products, price_ranges):
+    all_products = models.Product.objects.all()
+    in_stock = filter_products_by_stock_availability(
+        all_products, StockAvailability.IN_STOCK
+    )
+    out_of_stock = filter_products_by_stock_availability(
+        all_products, StockAvailability.OUT_OF_STOCK
+    )
+    aggregates = {
+        "in_stock": Count("pk", filter=Q(pk__in=in_stock.values("pk"))),
+        "out_of_stock": Count("pk", filter=Q(pk__in=out_of_stock.values("pk"))),
+    }
+    for index, (gte, lte) in enumerate(price_ranges):
+        aggregates[f"price_range_{index}"] = Count(
+            "pk", filter=_get_price_range_q(gte, lte)
+        )
+
+    counts = products.aggregate(**aggregates)
+    return _create_price_and_stock_facets(price_ranges, counts)
+
+
+def _create_price_and_stock_facets(price_ranges, counts):
+    # Facets missing in the counts have no matching products
+    price_range_facets = [
+        PriceRangeFacetData(
+            gte=gte, lte=lte, count=counts.get(f"price_range_{index}", 0)
+        )
+        for index, (gte, lte) in enumerate(price_ranges)
+    ]
+    stock_facets = [
+        StockAvailabilityFacetData(
+            availability=StockAvailability.IN_STOCK.value,
+            count=counts.get("in_stock", 0),
+        ),
+        StockAvailabilityFacetData(
+            availability=StockAvailability.OUT_OF_STOCK.value,
+            count=counts.get("out_of_stock", 0),
+        ),
+    ]
+    return price_range_facets, stock_facets
+
+
+def _get_cache_key(products, attribute_slugs, price_ranges, has_access_to_all):
+    try:
+        sql, params = products.query.sql_with_params()
+    except EmptyResultSet:
+        return None
+    slugs = sorted(attribute_slugs) if attribute_slugs is not None else None
+    key = repr((sql, params, slugs, price_ranges, has_access_to_all))
+    return PRODUCT_FACETS_CACHE_KEY.format(hashlib.md5(key.encode("utf-8")).hexdigest())
+
+
+def get_product_facets(
+    products: Union[QuerySet, List[models.Product]],
+    attribute_slugs: Optional[Iterable[str]] = None,
+    price_ranges: Optional[Iterable[dict]] = None,
+    has_access_to_all: bool = False,
+) -> ProductFacetsData:
+    """Return the facet counts of the given, already filtered products.
+
+    Attribute value counts are grouped by value in one query for the values
+    assigned to products and another for those assigned to variants. The price
+    range and stock availability counts are computed in a single query. Results
+    are cached for `PRODUCT_FACETS_CACHE_TIMEOUT` seconds per filtered product
+    query.
+    """
+    if isinstance(products, list):
+        products_ids = [product.pk for product in products]
+    else:
+        products_ids = products.order_by().values("pk")
+    products = models.Product.objects.filter(pk__in=products_ids)
+    if attribute_slugs is not None:
+        attribute_slugs = list(attribute_slugs)
+    price_ranges = [
+        (price_range.get("gte"), price_range.get("lte"))
+        for price_range in price_ranges or []
+    ]
+
+    cache_key = _get_cache_key(
+        products, attribute_slugs, price_ranges, has_access_to_all
+    )
+    if cache_key is None:
+        # The filters can't match any product.
+        price_range_facets, stock_facets = _create_price_and_stock_facets(
+            price_ranges, {}
+        )
+        return ProductFacetsData(
+            price_ranges=price_range_facets, stock_availability=stock_facets
+        )
+    facets = cache.get(cache_key)
+    if facets is not None:
+        return facets
+
+    attributes = _get_facet_attributes(products, attribute_slugs, has_access_to_all)
+    price_range_facets, stock_facets = _get_price_and_stock_facets(
+        products, price_ranges
+    )
+    facets = ProductFacetsData(
+        attributes=_get_attribute_facets(products, attributes),
+        price_ranges=price_range_facets,
+        stock_availability=stock_facets,
+    )
+    cache.set(cache_key, facets, settings.PRODUCT_FACETS_CACHE_TIMEOUT)
+    return facets
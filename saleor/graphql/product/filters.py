@@ -16,6 +16,7 @@ from ...product.models import (
     ProductType,
     ProductVariant,
 )
+from ...product.utils.attributes import get_attributes_lookup
 from ...search.backends import picker
 from ...warehouse.models import Stock
 from ..core.filters import EnumFilter, ListObjectTypeFilter, ObjectTypeFilter
@@ -47,25 +48,18 @@ def filter_fields_containing_value(*search_fields: str):
 def _clean_product_attributes_filter_input(
     filter_value,
 ) -> Dict[int, List[Optional[int]]]:
-    attributes = Attribute.objects.prefetch_related("values")
-    attributes_map: Dict[str, int] = {
-        attribute.slug: attribute.pk for attribute in attributes
-    }
-    values_map: Dict[str, Dict[str, int]] = {
-        attr.slug: {value.slug: value.pk for value in attr.values.all()}
-        for attr in attributes
-    }
+    attributes_lookup = get_attributes_lookup(
+        {attr_name for attr_name, _ in filter_value}
+    )
     queries: Dict[int, List[Optional[int]]] = defaultdict(list)
     # Convert attribute:value pairs into a dictionary where
     # attributes are keys and values are grouped in lists
     for attr_name, val_slugs in filter_value:
-        if attr_name not in attributes_map:
+        if attr_name not in attributes_lookup:
             raise ValueError("Unknown attribute name: %r" % (attr_name,))
-        attr_pk = attributes_map[attr_name]
+        attr_pk, values_map = attributes_lookup[attr_name]
         attr_val_pk = [
-            values_map[attr_name][val_slug]
-            for val_slug in val_slugs
-            if val_slug in values_map[attr_name]
+            values_map[val_slug] for val_slug in val_slugs if val_slug in values_map
         ]
         queries[attr_pk] += attr_val_pk
 
@@ -9,6 +9,11 @@ from django.utils.text import slugify
 from ....core.permissions import ProductPermissions
 from ....product import AttributeInputType, models
 from ....product.error_codes import ProductErrorCode
+from ....product.tasks import (
+    update_products_attribute_sort_keys_task,
+    update_products_search_vector_task,
+)
+from ....product.utils.attributes import invalidate_attributes_lookup
 from ...core.mutations import BaseMutation, ModelDeleteMutation, ModelMutation
 from ...core.types.common import ProductAttributeError, ProductError
 from ...core.utils import (
@@ -23,6 +28,29 @@ from ..enums import AttributeInputTypeEnum, AttributeTypeEnum
 from ..types import Attribute, AttributeValue
 
 
+def update_attribute_sort_keys(attribute: models.Attribute):
+    """Update sort keys of products using the attribute after its values change."""
+    product_type_ids = list(attribute.product_types.values_list("pk", flat=True))
+    if product_type_ids:
+        update_products_attribute_sort_keys_task.delay(product_type_ids)
+
+
+def update_attribute_value_search_vectors(value: models.AttributeValue):
+    """Update search vectors of products using the value after it's renamed."""
+    product_ids = set(
+        models.Product.objects.filter(attributes__values=value).values_list(
+            "pk", flat=True
+        )
+    )
+    product_ids.update(
+        models.ProductVariant.objects.filter(attributes__values=value).values_list(
+            "product_id", flat=True
+        )
+    )
+    if product_ids:
+        update_products_search_vector_task.delay(list(product_ids))
+
+
 class AttributeValueCreateInput(graphene.InputObjectType):
     name = graphene.String(required=True, description=AttributeValueDescriptions.NAME)
 
@@ -264,12 +292,16 @@ class AttributeUpdate(AttributeMixin, ModelMutation):
     @classmethod
     def _save_m2m(cls, info, instance, cleaned_data):
         super()._save_m2m(info, instance, cleaned_data)
-        for attribute_value in cleaned_data.get("remove_values", []):
+        remove_values = cleaned_data.get("remove_values", [])
+        for attribute_value in remove_values:
             attribute_value.delete()
+        if remove_values:
+            update_attribute_sort_keys(instance)
 
     @classmethod
     def perform_mutation(cls, _root, info, id, input):
         instance = cls.get_node_or_error(info, id, only_type=Attribute)
+        old_slug = instance.slug
 
         # Do cleaning and uniqueness checks
         cleaned_input = cls.clean_input(info, instance, input)
@@ -284,6 +316,7 @@ class AttributeUpdate(AttributeMixin, ModelMutation):
         # Commit it
         instance.save()
         cls._save_m2m(info, instance, cleaned_input)
+        invalidate_attributes_lookup(old_slug, instance.slug)
 
         # Return the attribute that was created
         return AttributeUpdate(attribute=instance)
@@ -449,6 +482,8 @@ class AttributeAssign(BaseMutation):
         # Commit
         cls.save_field_values(product_type, "AttributeProduct", product_attrs_pks)
         cls.save_field_values(product_type, "AttributeVariant", variant_attrs_pks)
+        if product_attrs_pks:
+            update_products_attribute_sort_keys_task.delay([product_type.pk])
 
         return cls(product_type=product_type)
 
@@ -501,6 +536,7 @@ class AttributeUnassign(BaseMutation):
         # Commit
         cls.save_field_values(product_type, "product_attributes", attribute_pks)
         cls.save_field_values(product_type, "variant_attributes", attribute_pks)
+        update_products_attribute_sort_keys_task.delay([product_type.pk])
 
         return cls(product_type=product_type)
 
@@ -516,6 +552,11 @@ class AttributeDelete(ModelDeleteMutation):
         error_type_class = ProductError
         error_type_field = "product_errors"
 
+    @classmethod
+    def success_response(cls, instance):
+        invalidate_attributes_lookup(instance.slug)
+        return super().success_response(instance)
+
 
 class AttributeUpdateMeta(UpdateMetaBaseMutation):
     class Meta:
@@ -612,6 +653,7 @@ class AttributeValueCreate(ModelMutation):
 
         instance.save()
         cls._save_m2m(info, instance, cleaned_input)
+        invalidate_attributes_lookup(attribute.slug)
         return AttributeValueCreate(attribute=attribute, attributeValue=instance)
 
 
@@ -647,6 +689,9 @@ class AttributeValueUpdate(ModelMutation):
 
     @classmethod
     def success_response(cls, instance):
+        invalidate_attributes_lookup(instance.attribute.slug)
+        update_attribute_sort_keys(instance.attribute)
+        update_attribute_value_search_vectors(instance)
         response = super().success_response(instance)
         response.attribute = instance.attribute
         return response
@@ -667,6 +712,8 @@ class AttributeValueDelete(ModelDeleteMutation):
 
     @classmethod
     def success_response(cls, instance):
+        invalidate_attributes_lookup(instance.attribute.slug)
+        update_attribute_sort_keys(instance.attribute)
         response = super().success_response(instance)
         response.attribute = instance.attribute
         return response
@@ -812,4 +859,5 @@ class AttributeReorderValues(BaseMutation):
         with transaction.atomic():
             perform_reordering(values_m2m, operations)
         attribute.refresh_from_db(fields=["values"])
+        update_attribute_sort_keys(attribute)
         return AttributeReorderValues(attribute=attribute)
@@ -11,10 +11,12 @@ from graphql_relay import from_global_id
 
 from ....core.exceptions import PermissionDenied
 from ....core.permissions import ProductPermissions
+from ....discount.utils import invalidate_discounts_cache
 from ....product import models
 from ....product.error_codes import ProductErrorCode
 from ....product.tasks import (
     update_product_minimal_variant_price_task,
+    update_products_attribute_sort_keys_task,
     update_products_minimal_variant_prices_of_catalogues_task,
     update_variants_names,
 )
@@ -27,7 +29,9 @@ from ....product.utils import delete_categories
 from ....product.utils.attributes import (
     associate_attribute_values_to_instance,
     generate_name_for_variant,
+    update_product_attribute_sort_keys,
 )
+from ....search.utils import update_product_search_vector
 from ...core.mutations import BaseMutation, ModelDeleteMutation, ModelMutation
 from ...core.scalars import Decimal, WeightScalar
 from ...core.types import SeoInput, Upload
@@ -113,6 +117,8 @@ class CategoryCreate(ModelMutation):
     @classmethod
     def save(cls, info, instance, cleaned_input):
         instance.save()
+        # Sales of parent categories apply to the new category as well
+        invalidate_discounts_cache()
         if cleaned_input.get("background_image"):
             create_category_background_image_thumbnails.delay(instance.pk)
 
@@ -153,6 +159,7 @@ class CategoryDelete(ModelDeleteMutation):
         db_id = instance.id
 
         delete_categories([db_id])
+        invalidate_discounts_cache()
 
         instance.id = db_id
         return cls.success_response(instance)
@@ -960,6 +967,8 @@ class ProductCreate(ModelMutation):
         attributes = cleaned_input.get("attributes")
         if attributes:
             AttributeAssignmentMixin.save(instance, attributes)
+        update_product_attribute_sort_keys(instance)
+        update_product_search_vector(instance)
 
     @classmethod
     def create_variant_stocks(cls, variant, stocks):
@@ -1037,6 +1046,8 @@ class ProductUpdate(ProductCreate):
         attributes = cleaned_input.get("attributes")
         if attributes:
             AttributeAssignmentMixin.save(instance, attributes)
+            update_product_attribute_sort_keys(instance)
+        update_product_search_vector(instance)
 
 
 class ProductDelete(ModelDeleteMutation):
@@ -1302,6 +1313,7 @@ class ProductVariantCreate(ModelMutation):
             AttributeAssignmentMixin.save(instance, attributes)
             instance.name = generate_name_for_variant(instance)
             instance.save(update_fields=["name"])
+        update_product_search_vector(instance.product)
 
     @classmethod
     def create_variant_stocks(cls, variant, stocks):
@@ -1362,6 +1374,7 @@ class ProductVariantDelete(ModelDeleteMutation):
     def success_response(cls, instance):
         # Update the "minimal_variant_prices" of the parent product
         update_product_minimal_variant_price_task.delay(instance.product_id)
+        update_product_search_vector(instance.product)
         return super().success_response(instance)
 
 
@@ -1495,6 +1508,7 @@ class ProductTypeCreate(ModelMutation):
         variant_attributes = cleaned_data.get("variant_attributes")
         if product_attributes is not None:
             instance.product_attributes.set(product_attributes)
+            update_products_attribute_sort_keys_task.delay([instance.pk])
         if variant_attributes is not None:
             instance.variant_attributes.set(variant_attributes)
 
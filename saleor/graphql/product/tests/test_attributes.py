@@ -21,7 +21,11 @@ from ....product.models import (
     ProductType,
     ProductVariant,
 )
-from ....product.utils.attributes import associate_attribute_values_to_instance
+from ....product.utils.attributes import (
+    associate_attribute_values_to_instance,
+    get_attributes_lookup,
+    update_product_attribute_sort_keys,
+)
 from ...core.utils import snake_to_camel_case
 from ...tests.utils import get_graphql_content
 from ..enums import AttributeTypeEnum, AttributeValueType
@@ -1001,6 +1005,27 @@ CREATE_ATTRIBUTE_VALUE_QUERY = """
 """
 
 
+def test_create_attribute_value_invalidates_attributes_lookup(
+    staff_api_client, color_attribute, permission_manage_products
+):
+    get_attributes_lookup([color_attribute.slug])
+    attribute_id = graphene.Node.to_global_id("Attribute", color_attribute.id)
+    variables = {"name": "Pink", "attributeId": attribute_id}
+
+    response = staff_api_client.post_graphql(
+        CREATE_ATTRIBUTE_VALUE_QUERY,
+        variables,
+        permissions=[permission_manage_products],
+    )
+    get_graphql_content(response)
+
+    value = color_attribute.values.get(slug="pink")
+    _, values_lookup = get_attributes_lookup([color_attribute.slug])[
+        color_attribute.slug
+    ]
+    assert values_lookup["pink"] == value.pk
+
+
 def test_create_attribute_value(
     staff_api_client, color_attribute, permission_manage_products
 ):
@@ -1101,6 +1126,48 @@ def test_update_attribute_value(
     assert name in [value["name"] for value in data["attribute"]["values"]]
 
 
+def test_update_attribute_value_updates_product_attribute_sort_keys(
+    staff_api_client, product, permission_manage_products
+):
+    update_product_attribute_sort_keys(product)
+    value = product.attributes.first().values.first()
+    node_id = graphene.Node.to_global_id("AttributeValue", value.id)
+    variables = {"name": "Crimson", "id": node_id}
+
+    response = staff_api_client.post_graphql(
+        UPDATE_ATTRIBUTE_VALUE_QUERY,
+        variables,
+        permissions=[permission_manage_products],
+    )
+    get_graphql_content(response)
+
+    sort_key = product.attribute_sort_keys.get(attribute=value.attribute)
+    assert sort_key.concatenated_values == "Crimson"
+
+
+@mock.patch(
+    "saleor.graphql.product.mutations.attributes.update_products_search_vector_task"
+)
+def test_update_attribute_value_updates_products_search_vector(
+    mocked_update_search_vector_task,
+    staff_api_client,
+    product,
+    permission_manage_products,
+):
+    value = product.attributes.first().values.first()
+    node_id = graphene.Node.to_global_id("AttributeValue", value.id)
+    variables = {"name": "Crimson", "id": node_id}
+
+    response = staff_api_client.post_graphql(
+        UPDATE_ATTRIBUTE_VALUE_QUERY,
+        variables,
+        permissions=[permission_manage_products],
+    )
+    get_graphql_content(response)
+
+    mocked_update_search_vector_task.delay.assert_called_once_with([product.pk])
+
+
 def test_update_attribute_value_name_not_unique(
     staff_api_client, pink_attribute_value, permission_manage_products
 ):
@@ -13,6 +13,7 @@ from ....product.models import (
     ProductType,
     ProductVariant,
 )
+from ....product.utils.attributes import update_product_attribute_sort_keys
 from ...tests.utils import get_graphql_content
 
 
@@ -101,6 +102,35 @@ def test_delete_attribute_values(
     ).exists()
 
 
+def test_delete_attribute_values_updates_product_attribute_sort_keys(
+    staff_api_client, product, permission_manage_products
+):
+    query = """
+    mutation attributeValueBulkDelete($ids: [ID]!) {
+        attributeValueBulkDelete(ids: $ids) {
+            count
+        }
+    }
+    """
+    update_product_attribute_sort_keys(product)
+    attribute = product.product_type.product_attributes.first()
+    variables = {
+        "ids": [
+            graphene.Node.to_global_id("AttributeValue", value.id)
+            for value in attribute.values.all()
+        ]
+    }
+
+    response = staff_api_client.post_graphql(
+        query, variables, permissions=[permission_manage_products]
+    )
+    get_graphql_content(response)
+
+    sort_key = product.attribute_sort_keys.get(attribute=attribute)
+    assert sort_key.values_order == 1
+    assert sort_key.concatenated_values == ""
+
+
 MUTATION_CATEGORY_BULK_DELETE = """
     mutation categoryBulkDelete($ids: [ID]!) {
         categoryBulkDelete(ids: $ids) {
@@ -110,7 +140,13 @@ MUTATION_CATEGORY_BULK_DELETE = """
 """
 
 
-def test_delete_categories(staff_api_client, category_list, permission_manage_products):
+@patch("saleor.graphql.product.bulk_mutations.products.invalidate_discounts_cache")
+def test_delete_categories(
+    mocked_invalidate_discounts_cache,
+    staff_api_client,
+    category_list,
+    permission_manage_products,
+):
     variables = {
         "ids": [
             graphene.Node.to_global_id("Category", category.id)
@@ -128,6 +164,7 @@ def test_delete_categories(staff_api_client, category_list, permission_manage_pr
     assert not Category.objects.filter(
         id__in=[category.id for category in category_list]
     ).exists()
+    mocked_invalidate_discounts_cache.assert_called_once_with()
 
 
 @patch("saleor.product.utils.update_products_minimal_variant_prices_task")
@@ -322,3 +359,37 @@ def test_delete_product_variants(
     assert not ProductVariant.objects.filter(
         id__in=[variant.id for variant in product_variant_list]
     ).exists()
+
+
+@patch(
+    "saleor.graphql.product.bulk_mutations.products"
+    ".update_products_search_vector_task"
+)
+def test_delete_product_variants_updates_products_search_vector(
+    mocked_update_search_vector_task,
+    staff_api_client,
+    product_variant_list,
+    permission_manage_products,
+):
+    query = """
+    mutation productVariantBulkDelete($ids: [ID]!) {
+        productVariantBulkDelete(ids: $ids) {
+            count
+        }
+    }
+    """
+    variables = {
+        "ids": [
+            graphene.Node.to_global_id("ProductVariant", variant.id)
+            for variant in product_variant_list
+        ]
+    }
+
+    response = staff_api_client.post_graphql(
+        query, variables, permissions=[permission_manage_products]
+    )
+    get_graphql_content(response)
+
+    mocked_update_search_vector_task.delay.assert_called_once_with(
+        [product_variant_list[0].product_id]
+    )
@@ -301,6 +301,32 @@ def test_fetch_unavailable_products(user_api_client, product):
     assert not content["data"]["products"]["edges"]
 
 
+def test_fetch_products_is_available(user_api_client, product_list):
+    product_list[1].variants.get().stocks.update(quantity=0)
+    query = """
+    query {
+        products(first: 10) {
+            edges {
+                node {
+                    id
+                    isAvailable
+                }
+            }
+        }
+    }
+    """
+    response = user_api_client.post_graphql(query)
+    content = get_graphql_content(response)
+    is_available_by_id = {
+        edge["node"]["id"]: edge["node"]["isAvailable"]
+        for edge in content["data"]["products"]["edges"]
+    }
+    assert is_available_by_id == {
+        graphene.Node.to_global_id("Product", product.pk): product != product_list[1]
+        for product in product_list
+    }
+
+
 def test_product_query(staff_api_client, product, permission_manage_products, stock):
     category = Category.objects.first()
     product = category.products.first()
@@ -0,0 +1,232 @@
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+
+from ....product.models import Product, ProductVariant
+from ....product.utils.attributes import associate_attribute_values_to_instance
+from ....warehouse.models import Allocation
+from ...tests.utils import get_graphql_content
+from ..enums import StockAvailability
+from ..facets import get_product_facets
+
+QUERY_PRODUCTS_FACETS = """
+    query products(
+        $filter: ProductFilterInput, $attributes: [String!],
+        $priceRanges: [PriceRangeInput!]
+    ) {
+        products(first: 10, filter: $filter) {
+            totalCount
+            facets(attributes: $attributes, priceRanges: $priceRanges) {
+                attributes {
+                    attribute {
+                        slug
+                    }
+                    values {
+                        value {
+                            slug
+                        }
+                        count
+                    }
+                }
+                priceRanges {
+                    gte
+                    lte
+                    count
+                }
+                stockAvailability {
+                    availability
+                    count
+                }
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture
+def priced_product_list(product_list):
+    for product, price in zip(product_list, [10, 20, 30]):
+        product.minimal_variant_price_amount = Decimal(price)
+        product.save(update_fields=["minimal_variant_price_amount"])
+    return product_list
+
+
+def _get_attribute_counts(facets):
+    return {
+        facet["attribute"]["slug"]: {
+            value_facet["value"]["slug"]: value_facet["count"]
+            for value_facet in facet["values"]
+        }
+        for facet in facets["attributes"]
+    }
+
+
+def test_products_facets(api_client, priced_product_list, color_attribute):
+    variables = {
+        "attributes": [color_attribute.slug],
+        "priceRanges": [{"lte": 15}, {"gte": 15, "lte": 25}, {"gte": 25}],
+    }
+
+    response = api_client.post_graphql(QUERY_PRODUCTS_FACETS, variables)
+
+    content = get_graphql_content(response)
+    facets = content["data"]["products"]["facets"]
+    assert _get_attribute_counts(facets) == {"color": {"red": 3, "blue": 0}}
+    assert facets["priceRanges"] == [
+        {"gte": None, "lte": 15, "count": 1},
+        {"gte": 15, "lte": 25, "count": 1},
+        {"gte": 25, "lte": None, "count": 1},
+    ]
+    assert facets["stockAvailability"] == [
+        {"availability": "IN_STOCK", "count": 3},
+        {"availability": "OUT_OF_STOCK", "count": 0},
+    ]
+
+
+def test_products_facets_use_product_type_attributes_by_default(
+    api_client, product_list
+):
+    response = api_client.post_graphql(QUERY_PRODUCTS_FACETS)
+
+    content = get_graphql_content(response)
+    facets = content["data"]["products"]["facets"]
+    assert _get_attribute_counts(facets) == {
+        "color": {"red": 3, "blue": 0},
+        "size": {"small": 0, "big": 0},
+    }
+    assert facets["priceRanges"] == []
+
+
+def test_products_facets_skip_attributes_hidden_in_storefront(
+    api_client, product_list, color_attribute
+):
+    color_attribute.visible_in_storefront = False
+    color_attribute.save(update_fields=["visible_in_storefront"])
+    variables = {"attributes": [color_attribute.slug]}
+
+    response = api_client.post_graphql(QUERY_PRODUCTS_FACETS, variables)
+
+    content = get_graphql_content(response)
+    assert content["data"]["products"]["facets"]["attributes"] == []
+
+
+def test_products_facets_count_filtered_products(
+    api_client, priced_product_list, color_attribute, order_line
+):
+    stock = priced_product_list[2].variants.first().stocks.first()
+    Allocation.objects.create(
+        order_line=order_line, stock=stock, quantity_allocated=stock.quantity
+    )
+    variables = {
+        "filter": {"minimalPrice": {"gte": 15}},
+        "attributes": [color_attribute.slug],
+        "priceRanges": [{"lte": 25}],
+    }
+
+    response = api_client.post_graphql(QUERY_PRODUCTS_FACETS, variables)
+
+    content = get_graphql_content(response)
+    data = content["data"]["products"]
+    assert data["totalCount"] == 2
+    assert _get_attribute_counts(data["facets"]) == {"color": {"red": 2, "blue": 0}}
+    assert data["facets"]["priceRanges"] == [{"gte": None, "lte": 25, "count": 1}]
+    assert data["facets"]["stockAvailability"] == [
+        {"availability": "IN_STOCK", "count": 1},
+        {"availability": "OUT_OF_STOCK", "count": 1},
+    ]
+
+
+def test_products_facets_count_variant_attribute_values(
+    api_client, product, size_attribute
+):
+    value = product.variants.first().attributes.get().values.get()
+    variables = {"attributes": [size_attribute.slug]}
+
+    response = api_client.post_graphql(QUERY_PRODUCTS_FACETS, variables)
+
+    content = get_graphql_content(response)
+    counts = _get_attribute_counts(content["data"]["products"]["facets"])
+    assert counts["size"][value.slug] == 1
+
+
+def test_get_product_facets_count_product_once_for_many_variants(
+    product, size_attribute
+):
+    value = product.variants.get().attributes.get().values.get()
+    variant = ProductVariant.objects.create(
+        product=product, sku="456", price_amount=Decimal(10)
+    )
+    associate_attribute_values_to_instance(variant, size_attribute, value)
+
+    facets = get_product_facets(Product.objects.all(), [size_attribute.slug])
+
+    counts = {facet.value_id: facet.count for facet in facets.attributes[0].values}
+    assert counts[value.pk] == 1
+
+
+def test_get_product_facets_number_of_queries(
+    product_list, color_attribute, size_attribute, django_assert_num_queries
+):
+    # Attributes, their values, price and stock counts and the values counts of
+    # products and variants
+    with django_assert_num_queries(5):
+        get_product_facets(
+            Product.objects.all(), [color_attribute.slug, size_attribute.slug]
+        )
+
+
+def test_get_product_facets_cached_per_products_query(priced_product_list):
+    products = Product.objects.all()
+    price_ranges = [{"gte": 15}]
+
+    facets = get_product_facets(products, [], price_ranges)
+    Product.objects.update(minimal_variant_price_amount=Decimal(10))
+
+    assert get_product_facets(products, [], price_ranges) == facets
+    assert facets.price_ranges[0].count == 2
+    filtered_facets = get_product_facets(
+        products.filter(name__icontains="product"), [], price_ranges
+    )
+    assert filtered_facets.price_ranges[0].count == 0
+
+
+def test_get_product_facets_for_empty_products_query(product_list):
+    price_ranges = [{"gte": 10, "lte": 20}, {"gte": 20}]
+
+    facets = get_product_facets(Product.objects.filter(pk__in=[]), [], price_ranges)
+
+    assert facets.attributes == []
+    assert [(facet.gte, facet.lte, facet.count) for facet in facets.price_ranges] == [
+        (10, 20, 0),
+        (20, None, 0),
+    ]
+    assert [
+        (facet.availability, facet.count) for facet in facets.stock_availability
+    ] == [
+        (StockAvailability.IN_STOCK.value, 0),
+        (StockAvailability.OUT_OF_STOCK.value, 0),
+    ]
+
+
+def test_get_product_facets_stock_availability_values(product_list):
+    facets = get_product_facets(Product.objects.all(), [])
+
+    assert [facet.availability for facet in facets.stock_availability] == [
+        StockAvailability.IN_STOCK.value,
+        StockAvailability.OUT_OF_STOCK.value,
+    ]
+
+
+def test_products_facets_limit_response_cache_timeout(
+    api_client, priced_product_list, settings
+):
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60
+    settings.PRODUCT_FACETS_CACHE_TIMEOUT = 20
+
+    with mock.patch("saleor.graphql.views.store_response") as mocked_store_response:
+        response = api_client.post_graphql(QUERY_PRODUCTS_FACETS)
+
+    get_graphql_content(response)
+    timeout = mocked_store_response.call_args[0][3]
+    assert timeout == 20
@@ -11,7 +11,10 @@ from ....product.models import (
     ProductType,
     ProductVariant,
 )
-from ....product.utils.attributes import associate_attribute_values_to_instance
+from ....product.utils.attributes import (
+    associate_attribute_values_to_instance,
+    update_products_attribute_sort_keys,
+)
 from ....warehouse.models import Stock
 from ...tests.utils import get_graphql_content
 
@@ -323,6 +326,7 @@ def products_for_pagination(product_type, color_attribute, category, warehouse):
     associate_attribute_values_to_instance(
         products[3], color_attribute, product_attrib_values[1]
     )
+    update_products_attribute_sort_keys(Product.objects.all())
 
     variants = ProductVariant.objects.bulk_create(
         [
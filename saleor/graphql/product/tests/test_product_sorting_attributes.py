@@ -5,7 +5,10 @@ import graphene
 import pytest
 
 from ....product import models as product_models
-from ....product.utils.attributes import associate_attribute_values_to_instance
+from ....product.utils.attributes import (
+    associate_attribute_values_to_instance,
+    update_products_attribute_sort_keys,
+)
 from ...tests.utils import get_graphql_content
 
 HERE = os.path.realpath(os.path.dirname(__file__))
@@ -161,6 +164,7 @@ def products_structures(category):
                 product, trademark_attr, *attr_values
             )
 
+    update_products_attribute_sort_keys(product_models.Product.objects.all())
     return colors_attr, trademark_attr, dummy_attr
 
 
@@ -516,6 +520,8 @@ def test_sort_product_not_having_attribute_data(api_client, category, count_quer
         name="A", slug="a", product_type=other_product_type, **product_create_kwargs
     )
 
+    update_products_attribute_sort_keys(product_models.Product.objects.all())
+
     # Sort the products
     qs = product_models.Product.objects.sort_by_attribute(attribute_pk=attribute.pk)
     qs = qs.values_list("name", flat=True)
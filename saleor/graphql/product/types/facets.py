@@ -0,0 +1,130 @@
+import graphene
+from django.conf import settings
+
+from ....product import models
+from ...core.connection import CountableConnection
+from ...core.types.common import PriceRangeInput
+from ...query_cache import limit_response_cache_timeout
+from ...utils import get_user_or_app_from_context
+from ..dataloaders.attributes import AttributesByAttributeId, AttributeValueByIdLoader
+from ..enums import StockAvailability
+from ..facets import get_product_facets
+from .attributes import Attribute, AttributeValue
+
+
+class AttributeValueFacet(graphene.ObjectType):
+    value = graphene.Field(
+        AttributeValue, description="The attribute value.", required=True
+    )
+    count = graphene.Int(
+        description="Number of products having the attribute value.", required=True
+    )
+
+    class Meta:
+        description = "Number of products having a given attribute value."
+
+    @staticmethod
+    def resolve_value(root, info, **_kwargs):
+        return AttributeValueByIdLoader(info.context).load(root.value_id)
+
+
+class AttributeFacet(graphene.ObjectType):
+    attribute = graphene.Field(Attribute, description="The attribute.", required=True)
+    values = graphene.List(
+        graphene.NonNull(AttributeValueFacet),
+        description="Product counts of the attribute values.",
+        required=True,
+    )
+
+    class Meta:
+        description = "Product counts of the values of an attribute."
+
+    @staticmethod
+    def resolve_attribute(root, info, **_kwargs):
+        return AttributesByAttributeId(info.context).load(root.attribute_id)
+
+
+class PriceRangeFacet(graphene.ObjectType):
+    gte = graphene.Float(description="Price greater than or equal to.")
+    lte = graphene.Float(description="Price less than or equal to.")
+    count = graphene.Int(
+        description="Number of products priced within the range.", required=True
+    )
+
+    class Meta:
+        description = "Number of products with the minimal price in a given range."
+
+
+class StockAvailabilityFacet(graphene.ObjectType):
+    availability = graphene.Field(
+        StockAvailability, description="The stock availability.", required=True
+    )
+    count = graphene.Int(
+        description="Number of products with the stock availability.", required=True
+    )
+
+    class Meta:
+        description = "Number of products with a given stock availability."
+
+
+class ProductFacets(graphene.ObjectType):
+    attributes = graphene.List(
+        graphene.NonNull(AttributeFacet),
+        description="Product counts of attribute values.",
+        required=True,
+    )
+    price_ranges = graphene.List(
+        graphene.NonNull(PriceRangeFacet),
+        description="Product counts of the requested price ranges.",
+        required=True,
+    )
+    stock_availability = graphene.List(
+        graphene.NonNull(StockAvailabilityFacet),
+        description="Product counts of stock availabilities.",
+        required=True,
+    )
+
+    class Meta:
+        description = "Facet counts of a filtered list of products."
+
+
+class ProductCountableConnection(CountableConnection):
+    class Meta:
+        abstract = True
+
+    facets = graphene.Field(
+        ProductFacets,
+        attributes=graphene.List(
+            graphene.NonNull(graphene.String),
+            description=(
+                "Slugs of attributes to count the values of. By default, attributes "
+                "filterable in storefront assigned to the listed products are used."
+            ),
+        ),
+        price_ranges=graphene.List(
+            graphene.NonNull(PriceRangeInput),
+            description="Minimal variant price ranges to count the products in.",
+        ),
+        description=(
+            "Attribute value, price range and stock availability counts of the "
+            "filtered products."
+        ),
+        required=True,
+    )
+
+    @staticmethod
+    def resolve_facets(root, info, attributes=None, price_ranges=None, **_kwargs):
+        requestor = get_user_or_app_from_context(info.context)
+        # Facets may be served from their own cache, which isn't purged along
+        # with the cached response
+        limit_response_cache_timeout(
+            info.context, settings.PRODUCT_FACETS_CACHE_TIMEOUT
+        )
+        return get_product_facets(
+            root.iterable,
+            attribute_slugs=attributes,
+            price_ranges=price_ranges,
+            has_access_to_all=models.Attribute.objects.user_has_access_to_all(
+                requestor
+            ),
+        )
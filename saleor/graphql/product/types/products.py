@@ -20,11 +20,7 @@ from ....product.utils.availability import (
     get_variant_availability,
 )
 from ....product.utils.costs import get_margin_for_variant, get_product_costs_data
-from ....warehouse.availability import (
-    get_available_quantity,
-    get_quantity_allocated,
-    is_product_in_stock,
-)
+from ....warehouse.availability import get_available_quantity, get_quantity_allocated
 from ...account.enums import CountryCodeEnum
 from ...core.connection import CountableDjangoObjectType
 from ...core.enums import ReportingPeriod, TaxRateType
@@ -45,6 +41,7 @@ from ...utils import get_database_id
 from ...utils.filters import reporting_period_to_date
 from ...warehouse.dataloaders import (
     AvailableQuantityByProductVariantIdAndCountryCodeLoader,
+    IsProductInStockByProductIdAndCountryCodeLoader,
 )
 from ...warehouse.types import Stock
 from ..dataloaders import (
@@ -60,6 +57,7 @@ from ..filters import AttributeFilterInput
 from ..resolvers import resolve_attributes
 from .attributes import Attribute, SelectedAttribute
 from .digital_contents import DigitalContent
+from .facets import ProductCountableConnection
 
 
 def resolve_attribute_list(
@@ -484,6 +482,7 @@ class Product(CountableDjangoObjectType):
         description = "Represents an individual item for sale in the storefront."
         interfaces = [relay.Node, ObjectWithMetadata]
         model = models.Product
+        connection_class = ProductCountableConnection
         only_fields = [
             "category",
             "charge_taxes",
@@ -566,9 +565,11 @@ class Product(CountableDjangoObjectType):
 
     @staticmethod
     def resolve_is_available(root: models.Product, info):
-        country = info.context.country
-        in_stock = is_product_in_stock(root, country)
-        return root.is_visible and in_stock
+        if not root.is_visible:
+            return False
+        return IsProductInStockByProductIdAndCountryCodeLoader(info.context).load(
+            (root.id, info.context.country)
+        )
 
     @staticmethod
     def resolve_attributes(root: models.Product, info):
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional, Set
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest
+from django.utils.translation import get_language
+from graphql import GraphQLDocument
+from graphql.error import GraphQLError
+
+from ..core.cache import are_response_tag_versions_current, get_response_tag_versions
+
+PERSISTED_QUERY_CACHE_KEY = "graphql_persisted_query:{}"
+RESPONSE_CACHE_KEY = "graphql_response:{}"
+
+# Matches the quoted table names Django puts after FROM, JOIN, UPDATE and INTO
+TABLE_NAME_PATTERN = re.compile(r'\b(?:FROM|JOIN|UPDATE|INTO)\s+"([^"]+)"', re.I)
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE")
+
+
+class PersistedQueryNotFound(GraphQLError):
+    def __init__(self):
+        super().__init__("PersistedQueryNotFound")
+
+
+class PersistedQueryNotSupported(GraphQLError):
+    def __init__(self):
+        super().__init__("PersistedQueryNotSupported")
+
+
+class PersistedQueryHashMismatch(GraphQLError):
+    def __init__(self):
+        super().__init__("Provided sha256Hash does not match the query.")
+
+
+def get_query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+class DocumentCache:
+    """Bounded LRU cache of parsed and validated GraphQL documents.
+
+    Documents are keyed by the SHA-256 hash of the query string, the same hash
+    that clients send when using Automatic Persisted Queries.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None):
+        self._maxsize = maxsize
+        self._documents: "OrderedDict[str, GraphQLDocument]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def maxsize(self) -> int:
+        if self._maxsize is None:
+            return settings.GRAPHQL_QUERY_CACHE_SIZE
+        return self._maxsize
+
+    def __len__(self):
+        return len(self._documents)
+
+    def get(self, query_hash: str) -> Optional[GraphQLDocument]:
+        with self._lock:
+            document = self._documents.get(query_hash)
+            if document is not None:
+                self._documents.move_to_end(query_hash)
+            return document
+
+    def set(self, query_hash: str, document: GraphQLDocument):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._documents[query_hash] = document
+            self._documents.move_to_end(query_hash)
+            while len(self._documents) > self.maxsize:
+                self._documents.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+
+
+# Views are instantiated per request, so the cache is shared at the process level.
+document_cache = DocumentCache()
+
+
+def get_persisted_query_hash(extensions: Optional[dict]) -> Optional[str]:
+    """Return the sha256Hash sent by a client following the APQ protocol."""
+    if not isinstance(extensions, dict):
+        return None
+    persisted_query = extensions.get("persistedQuery")
+    if not isinstance(persisted_query, dict):
+        return None
+    if persisted_query.get("version", 1) != 1:
+        raise PersistedQueryNotSupported()
+    return persisted_query.get("sha256Hash")
+
+
+def get_persisted_query(query_hash: str) -> Optional[str]:
+    return cache.get(PERSISTED_QUERY_CACHE_KEY.format(query_hash))
+
+
+def store_persisted_query(query_hash: str, query: str):
+    cache.set(
+        PERSISTED_QUERY_CACHE_KEY.format(query_hash),
+        query,
+        settings.GRAPHQL_PERSISTED_QUERY_TIMEOUT,
+    )
+
+
+class TableTracker:
+    """Database execute wrapper collecting the tables read and written by queries.
+
+    Response cache entries are tagged with the tables read while executing
+    the operation; writing to a table purges the entries tagged with it.
+    """
+
+    def __init__(self):
+        self.read_tables: Set[str] = set()
+        self.written_tables: Set[str] = set()
+
+    def __call__(self, execute, sql, params, many, context):
+        tables = TABLE_NAME_PATTERN.findall(sql)
+        if tables:
+            if sql.lstrip()[:6].upper() in WRITE_STATEMENTS:
+                self.written_tables.update(tables)
+            else:
+                self.read_tables.update(tables)
+        return execute(sql, params, many, context)
+
+
+def get_response_cache_key(
+    request: HttpRequest, query_hash: str, variables: Optional[dict], operation_name
+) -> str:
+    country = getattr(request, "country", None)
+    key = json.dumps(
+        [
+            query_hash,
+            variables,
+            operation_name,
+            country.code if country else None,
+            getattr(request, "currency", None),
+            get_language(),
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    return RESPONSE_CACHE_KEY.format(hashlib.sha256(key.encode("utf-8")).hexdigest())
+
+
+def get_cached_response(cache_key: str) -> Optional[dict]:
+    """Return a cached response unless any of its tags was purged since storing."""
+    cached = cache.get(cache_key)
+    if cached is None:
+        return None
+    tag_versions, response = cached
+    if not are_response_tag_versions_current(tag_versions):
+        return None
+    return response
+
+
+def limit_response_cache_timeout(request: HttpRequest, timeout: int):
+    """Cache the response to the request for at most `timeout` seconds.
+
+    Called by resolvers serving data from other caches, which expire on their
+    own instead of being purged with the tables the data comes from. Caches
+    disabled with a timeout of 0 don't limit the response cache.
+    """
+    if timeout <= 0 or not hasattr(request, "response_cache_timeout"):
+        return
+    request.response_cache_timeout = min(  # type: ignore
+        request.response_cache_timeout, timeout  # type: ignore
+    )
+
+
+def store_response(cache_key: str, response: dict, tags: Iterable[str], timeout: int):
+    if timeout <= 0:
+        return
+    tag_versions = get_response_tag_versions(tags)
+    cache.set(cache_key, (tag_versions, response), timeout)
@@ -24,6 +24,13 @@ def filter_by_query_param(queryset, query, search_fields):
     return queryset
 
 
+def filter_by_search_document(queryset, query):
+    """Filter queryset by the trigram indexed search document of its model."""
+    if query:
+        return queryset.filter(search_document__contains=query.lower())
+    return queryset
+
+
 def reporting_period_to_date(period):
     now = timezone.now()
     if period == ReportingPeriod.TODAY:
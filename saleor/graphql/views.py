@@ -2,12 +2,14 @@ import fnmatch
 import json
 import logging
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import opentracing
 import opentracing.tags
 from django.conf import settings
-from django.db import connection
+from django.db import connection, connections
 from django.db.backends.postgresql.base import DatabaseWrapper
 from django.http import HttpRequest, HttpResponseNotAllowed, JsonResponse
 from django.shortcuts import render
@@ -16,7 +18,7 @@ from django.utils.functional import SimpleLazyObject
 from django.views.generic import View
 from graphene_django.settings import graphene_settings
 from graphene_django.views import instantiate_middleware
-from graphql import GraphQLDocument, get_default_backend
+from graphql import GraphQLDocument, get_default_backend, validate
 from graphql.error import (
     GraphQLError,
     GraphQLSyntaxError,
@@ -25,11 +27,28 @@ from graphql.error import (
 from graphql.execution import ExecutionResult
 from jwt.exceptions import PyJWTError
 
+from ..core.cache import is_response_cache_enabled, purge_response_cache
 from ..core.exceptions import PermissionDenied, ReadOnlyException
 from ..core.utils import is_valid_ipv4, is_valid_ipv6
+from .query_cache import (
+    PersistedQueryHashMismatch,
+    PersistedQueryNotFound,
+    TableTracker,
+    document_cache,
+    get_cached_response,
+    get_persisted_query,
+    get_persisted_query_hash,
+    get_query_hash,
+    get_response_cache_key,
+    store_persisted_query,
+    store_response,
+)
 
 API_PATH = SimpleLazyObject(lambda: reverse("api"))
 
+# Parsed document of an operation or the error returned instead of executing it
+ParsedOperation = Tuple[Optional[GraphQLDocument], Optional[ExecutionResult]]
+
 unhandled_errors_logger = logging.getLogger("saleor.graphql.errors.unhandled")
 handled_errors_logger = logging.getLogger("saleor.graphql.errors.handled")
 
@@ -53,12 +72,17 @@ class GraphQLView(View):
     # - file upload (https://github.com/lmcgartland/graphene-file-upload)
     # - query batching
     # - CORS
+    # - in-memory cache of parsed and validated documents
+    # - Automatic Persisted Queries (see
+    # https://github.com/apollographql/apollo-link-persisted-queries)
+    # - opt-in cache of responses to anonymous queries
 
     schema = None
     executor = None
     backend = None
     middleware = None
     root_value = None
+    document_cache = None
 
     HANDLED_EXCEPTIONS = (GraphQLError, PyJWTError, ReadOnlyException, PermissionDenied)
 
@@ -78,6 +102,8 @@ class GraphQLView(View):
         self.executor = executor
         self.root_value = root_value
         self.backend = backend
+        if settings.GRAPHQL_QUERY_CACHE_SIZE > 0:
+            self.document_cache = document_cache
 
     def dispatch(self, request, *args, **kwargs):
         # Handle options method the GraphQlView restricts it.
@@ -119,7 +145,7 @@ class GraphQLView(View):
             )
 
         if isinstance(data, list):
-            responses = [self.get_response(request, entry) for entry in data]
+            responses = self.get_batch_responses(request, data)
             result: Union[list, Optional[dict]] = [
                 response for response, code in responses
             ]
@@ -161,9 +187,65 @@ class GraphQLView(View):
             return response
 
     def get_response(
-        self, request: HttpRequest, data: dict
+        self,
+        request: HttpRequest,
+        data: dict,
+        parsed_operation: Optional[ParsedOperation] = None,
     ) -> Tuple[Optional[Dict[str, List[Any]]], int]:
-        execution_result = self.execute_graphql_request(request, data)
+        if parsed_operation is None:
+            parsed_operation = self.parse_operation(request, data)
+        if not is_response_cache_enabled():
+            return self.execute_response(request, data, parsed_operation)
+
+        cache_key = self.get_response_cache_key(request, data, parsed_operation)
+        if cache_key is not None:
+            cached_response = get_cached_response(cache_key)
+            if cached_response is not None:
+                return cached_response, 200
+
+        # Lowered by resolvers serving data from caches expiring on their own
+        request.response_cache_timeout = (  # type: ignore
+            settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT
+        )
+        table_tracker = TableTracker()
+        with connection.execute_wrapper(table_tracker):
+            result, status_code = self.execute_response(request, data, parsed_operation)
+        if table_tracker.written_tables:
+            purge_response_cache(*table_tracker.written_tables)
+        elif cache_key is not None and result and not result.get("errors"):
+            store_response(
+                cache_key,
+                result,
+                table_tracker.read_tables,
+                request.response_cache_timeout,  # type: ignore
+            )
+        return result, status_code
+
+    def get_response_cache_key(
+        self, request: HttpRequest, data: dict, parsed_operation: ParsedOperation
+    ) -> Optional[str]:
+        """Return the response cache key of an operation if its response is cached.
+
+        Only queries sent without credentials are cached, their responses are
+        the same for all visitors from a country.
+        """
+        if request.META.get("HTTP_AUTHORIZATION") or not isinstance(data, dict):
+            return None
+        if request.content_type == "multipart/form-data":
+            return None
+        if self.get_operation_type(request, data, parsed_operation) != "query":
+            return None
+        query, variables, operation_name = self.get_graphql_params(request, data)
+        if query:
+            query_hash = get_query_hash(query)
+        else:
+            query_hash = get_persisted_query_hash(data.get("extensions"))
+        return get_response_cache_key(request, query_hash, variables, operation_name)
+
+    def execute_response(
+        self, request: HttpRequest, data: dict, parsed_operation: ParsedOperation
+    ) -> Tuple[Optional[Dict[str, List[Any]]], int]:
+        execution_result = self.execute_graphql_request(request, data, parsed_operation)
         status_code = 200
         if execution_result:
             response = {}
@@ -181,17 +263,102 @@ class GraphQLView(View):
 
         return result, status_code
 
+    def get_batch_responses(
+        self, request: HttpRequest, data: List[dict]
+    ) -> List[Tuple[Optional[Dict[str, List[Any]]], int]]:
+        """Execute all operations of a batched request.
+
+        Operations are executed one after another and share the data loaders
+        stored on the request, so the same keys are fetched only once per batch.
+        Loaders are dropped after a mutation to not serve stale data to
+        the following operations.
+
+        If `GRAPHQL_BATCH_MAX_WORKERS` is set and the batch contains only queries,
+        the operations are executed concurrently on a thread pool instead.
+        """
+        # Every operation is parsed once, the documents are reused for execution
+        parsed_operations = [self.parse_operation(request, entry) for entry in data]
+        operation_types = [
+            self.get_operation_type(request, entry, parsed_operation)
+            for entry, parsed_operation in zip(data, parsed_operations)
+        ]
+        max_workers = min(settings.GRAPHQL_BATCH_MAX_WORKERS, len(data))
+        if max_workers > 1 and all(
+            operation_type == "query" for operation_type in operation_types
+        ):
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(
+                    executor.map(
+                        lambda args: self.get_isolated_response(request, *args),
+                        zip(data, parsed_operations),
+                    )
+                )
+
+        responses = []
+        for entry, parsed_operation, operation_type in zip(
+            data, parsed_operations, operation_types
+        ):
+            responses.append(self.get_response(request, entry, parsed_operation))
+            if operation_type != "query":
+                request.dataloaders = {}  # type: ignore
+        return responses
+
+    def get_isolated_response(
+        self, request: HttpRequest, data: dict, parsed_operation: ParsedOperation
+    ) -> Tuple[Optional[Dict[str, List[Any]]], int]:
+        # Data loaders are not thread-safe, each thread gets its own set of them
+        # by executing the operation against a shallow copy of the request.
+        isolated_request = copy(request)
+        isolated_request.dataloaders = {}  # type: ignore
+        try:
+            return self.get_response(isolated_request, data, parsed_operation)
+        finally:
+            connections.close_all()
+
+    def get_operation_type(
+        self, request: HttpRequest, data: dict, parsed_operation: ParsedOperation
+    ) -> Optional[str]:
+        document, error = parsed_operation
+        if error:
+            return None
+        _, _, operation_name = self.get_graphql_params(request, data)
+        return document.get_operation_type(operation_name)  # type: ignore
+
+    def parse_operation(self, request: HttpRequest, data: dict) -> ParsedOperation:
+        """Resolve the query of an operation and parse it to a gql document object.
+
+        Returns the error to respond with if the query can't be executed.
+        """
+        if not isinstance(data, dict):
+            return (
+                None,
+                ExecutionResult(
+                    errors=[ValueError("Must provide a query string.")], invalid=True
+                ),
+            )
+        query, _, _ = self.get_graphql_params(request, data)
+        try:
+            query, query_hash = self.resolve_persisted_query(query, data)
+        except PersistedQueryNotFound as e:
+            return None, ExecutionResult(errors=[e])
+        except GraphQLError as e:
+            return None, ExecutionResult(errors=[e], invalid=True)
+        return self.parse_query(query, query_hash)
+
     def get_root_value(self):
         return self.root_value
 
     def parse_query(
-        self, query: str
+        self, query: str, query_hash: Optional[str] = None
     ) -> Tuple[Optional[GraphQLDocument], Optional[ExecutionResult]]:
         """Attempt to parse a query (mandatory) to a gql document object.
 
         If no query was given or query is not a string, it returns an error.
         If the query is invalid, it returns an error as well.
         Otherwise, it returns the parsed gql document.
+
+        When the document cache is enabled, the query is also validated against
+        the schema and the resulting document is cached under the query hash.
         """
         if not query or not isinstance(query, str):
             return (
@@ -201,28 +368,68 @@ class GraphQLView(View):
                 ),
             )
 
+        if self.document_cache is not None:
+            query_hash = query_hash or get_query_hash(query)
+            document = self.document_cache.get(query_hash)
+            if document is not None and document.schema is self.schema:
+                return document, None
+
         # Attempt to parse the query, if it fails, return the error
         try:
-            return (
-                self.backend.document_from_string(  # type: ignore
-                    self.schema, query
-                ),
-                None,
+            document = self.backend.document_from_string(  # type: ignore
+                self.schema, query
             )
         except (ValueError, GraphQLSyntaxError) as e:
             return None, ExecutionResult(errors=[e], invalid=True)
 
-    def execute_graphql_request(self, request: HttpRequest, data: dict):
+        if self.document_cache is not None:
+            validation_errors = validate(self.schema, document.document_ast)
+            if validation_errors:
+                return None, ExecutionResult(errors=validation_errors, invalid=True)
+            self.document_cache.set(query_hash, document)
+        return document, None
+
+    def resolve_persisted_query(
+        self, query: Optional[str], data: dict
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Resolve the query text of an Automatic Persisted Query.
+
+        Returns the query and its hash if the client sent one. A client sending
+        only the hash of a query that is not registered yet gets
+        the `PersistedQueryNotFound` error and is expected to retry the request
+        with the full query text.
+        """
+        query_hash = get_persisted_query_hash(data.get("extensions"))
+        if not query_hash:
+            return query, None
+        if not query:
+            document = None
+            if self.document_cache is not None:
+                document = self.document_cache.get(query_hash)
+            if document is not None:
+                return document.document_string, query_hash
+            query = get_persisted_query(query_hash)
+            if query is None:
+                raise PersistedQueryNotFound()
+            return query, query_hash
+        if not isinstance(query, str) or get_query_hash(query) != query_hash:
+            raise PersistedQueryHashMismatch()
+        store_persisted_query(query_hash, query)
+        return query, query_hash
+
+    def execute_graphql_request(
+        self, request: HttpRequest, data: dict, parsed_operation: ParsedOperation
+    ):
         with opentracing.global_tracer().start_active_span("graphql_query") as scope:
             span = scope.span
             span.set_tag(opentracing.tags.COMPONENT, "GraphQL")
 
-            query, variables, operation_name = self.get_graphql_params(request, data)
-
-            document, error = self.parse_query(query)
+            document, error = parsed_operation
             if error:
                 return error
 
+            _, variables, operation_name = self.get_graphql_params(request, data)
+
             if document is not None:
                 raw_query_string = document.document_string[
                     : settings.OPENTRACING_MAX_QUERY_LENGTH_LOG
@@ -235,6 +442,9 @@ class GraphQLView(View):
                 # We only include it optionally since
                 # executor is not a valid argument in all backends
                 extra_options["executor"] = self.executor
+            if self.document_cache is not None:
+                # Documents were already validated when put into the cache
+                extra_options["validate"] = False
             try:
                 with connection.execute_wrapper(tracing_wrapper):
                     return document.execute(  # type: ignore
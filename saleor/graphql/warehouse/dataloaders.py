@@ -78,3 +78,39 @@ class AvailableQuantityByProductVariantIdAndCountryCodeLoader(
             )
             for variant_id in variant_ids
         ]
+
+
+ProductIdAndCountryCode = Tuple[int, CountryCode]
+
+
+class IsProductInStockByProductIdAndCountryCodeLoader(
+    DataLoader[ProductIdAndCountryCode, bool]
+):
+    """Checks if any variant of a product is in stock in a given country.
+
+    Matches `is_product_in_stock`, answering all products that share a country code
+    with a single grouped stock query.
+    """
+
+    context_key = "product_in_stock_by_product_and_country"
+
+    def batch_load(self, keys):
+        products_by_country: DefaultDict[CountryCode, List[int]] = defaultdict(list)
+        for product_id, country_code in keys:
+            products_by_country[country_code].append(product_id)
+
+        in_stock_products = set()
+        for country_code, product_ids in products_by_country.items():
+            results = Stock.objects.filter(product_variant__product_id__in=product_ids)
+            if country_code:
+                results = results.for_country(country_code)
+            results = (
+                results.annotate_available_quantity()
+                .filter(available_quantity__gt=0)
+                .values_list("product_variant__product_id", flat=True)
+            )
+            in_stock_products.update(
+                (product_id, country_code) for product_id in results
+            )
+
+        return [key in in_stock_products for key in keys]
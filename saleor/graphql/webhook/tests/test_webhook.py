@@ -6,6 +6,7 @@ import pytest
 from ....app.models import App
 from ....webhook.event_types import WebhookEventType
 from ....webhook.models import Webhook
+from ....webhook.utils import is_event_subscribed
 from ...tests.utils import assert_no_permission, get_graphql_content
 from ..enums import WebhookEventTypeEnum, WebhookSampleEventTypeEnum
 
@@ -50,6 +51,27 @@ def test_webhook_create_by_app(app_api_client, permission_manage_orders):
     assert events[0].event_type == WebhookEventTypeEnum.ORDER_CREATED.value
 
 
+def test_webhook_create_invalidates_subscriptions_cache(
+    app_api_client, permission_manage_orders
+):
+    assert not is_event_subscribed(WebhookEventType.ORDER_CREATED)
+    variables = {
+        "name": "New integration",
+        "target_url": "https://www.example.com",
+        "events": [WebhookEventTypeEnum.ORDER_CREATED.name],
+    }
+
+    response = app_api_client.post_graphql(
+        WEBHOOK_CREATE_BY_APP,
+        variables=variables,
+        permissions=[permission_manage_orders],
+        check_no_permissions=False,
+    )
+
+    get_graphql_content(response)
+    assert is_event_subscribed(WebhookEventType.ORDER_CREATED)
+
+
 def test_webhook_create_inactive_app(app_api_client, app, permission_manage_orders):
     app.is_active = False
     app.save()
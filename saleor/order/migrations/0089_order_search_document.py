@@ -0,0 +1,56 @@
+# Generated by Django 3.1 on 2020-08-25 09:12
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+CHUNK_SIZE = 1000
+
+
+def populate_order_search_document(apps, schema_editor):
+    Order = apps.get_model("order", "Order")
+    orders = Order.objects.order_by("pk").select_related("user")
+    last_pk = 0
+    while True:
+        chunk = list(orders.filter(pk__gt=last_pk)[:CHUNK_SIZE])
+        if not chunk:
+            return
+        for order in chunk:
+            search_document = [
+                order.user_email,
+                order.discount_name,
+                order.translated_discount_name,
+            ]
+            if order.user:
+                search_document.extend(
+                    [order.user.email, order.user.first_name, order.user.last_name]
+                )
+            order.search_document = "\n".join(
+                value for value in search_document if value
+            ).lower()
+        Order.objects.bulk_update(chunk, ["search_document"])
+        last_pk = chunk[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0088_auto_20200812_1101"),
+        ("product", "0037_auto_20171124_0847"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="search_document",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_document"],
+                name="order_search_gin",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.RunPython(populate_order_search_document, migrations.RunPython.noop),
+    ]
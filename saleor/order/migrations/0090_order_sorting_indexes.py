@@ -0,0 +1,32 @@
+# Generated by Django 3.1 on 2020-08-27 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0089_order_search_document"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["created", "status", "id"], name="order_created_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["status", "user_email", "id"], name="order_status_email_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["total_gross_amount", "status", "id"],
+                name="order_total_status_idx",
+            ),
+        ),
+    ]
@@ -5,6 +5,7 @@ from typing import Optional
 from uuid import uuid4
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.db.models import JSONField  # type: ignore
@@ -26,6 +27,11 @@ from ..giftcard.models import GiftCard
 from ..payment import ChargeStatus, TransactionKind
 from ..shipping.models import ShippingMethod
 from . import FulfillmentStatus, OrderEvents, OrderStatus
+from .search import (
+    ORDER_SEARCH_ATTNAMES,
+    ORDER_SEARCH_FIELDS,
+    prepare_order_search_document_value,
+)
 
 
 class OrderQueryset(models.QuerySet):
@@ -169,16 +175,58 @@ class Order(ModelWithMetadata):
     weight = MeasurementField(
         measurement=Weight, unit_choices=WeightUnits.CHOICES, default=zero_weight
     )
+    search_document = models.TextField(blank=True, default="")
     objects = OrderQueryset.as_manager()
 
     class Meta:
         ordering = ("-pk",)
         permissions = ((OrderPermissions.MANAGE_ORDERS.codename, "Manage orders."),)
+        indexes = [
+            GinIndex(
+                name="order_search_gin",
+                fields=["search_document"],
+                opclasses=["gin_trgm_ops"],
+            ),
+            # Paginating orders sorted by date, status or total.
+            models.Index(
+                name="order_created_status_idx", fields=["created", "status", "id"]
+            ),
+            models.Index(
+                name="order_status_email_idx", fields=["status", "user_email", "id"]
+            ),
+            models.Index(
+                name="order_total_status_idx",
+                fields=["total_gross_amount", "status", "id"],
+            ),
+        ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._search_values = self._get_search_values()
+
+    def _get_search_values(self) -> tuple:
+        # Deferred fields are left out instead of being fetched to compare them
+        return tuple(self.__dict__.get(attname) for attname in ORDER_SEARCH_ATTNAMES)
 
     def save(self, *args, **kwargs):
         if not self.token:
             self.token = str(uuid4())
-        return super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            search_fields_changed = (
+                self._state.adding or self._get_search_values() != self._search_values
+            )
+        else:
+            search_fields_changed = bool(
+                ORDER_SEARCH_FIELDS.intersection(update_fields)
+            )
+        if search_fields_changed:
+            self.search_document = prepare_order_search_document_value(self)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "search_document"}
+        result = super().save(*args, **kwargs)
+        self._search_values = self._get_search_values()
+        return result
 
     def is_fully_paid(self):
         total_paid = self._total_paid()
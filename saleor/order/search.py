@@ -0,0 +1,31 @@
+# Fields which are a part of the search document of an order
+ORDER_SEARCH_FIELDS = {
+    "user",
+    "user_email",
+    "discount_name",
+    "translated_discount_name",
+    "search_document",
+}
+
+# Attributes holding the values of the search fields, compared on save to find out
+# whether the search document changed
+ORDER_SEARCH_ATTNAMES = (
+    "user_id",
+    "user_email",
+    "discount_name",
+    "translated_discount_name",
+)
+
+
+def prepare_order_search_document_value(order) -> str:
+    """Return the lowercase text matched by the dashboard order search."""
+    search_document = [
+        order.user_email,
+        order.discount_name,
+        order.translated_discount_name,
+    ]
+    if order.user:
+        search_document.extend(
+            [order.user.email, order.user.first_name, order.user.last_name]
+        )
+    return "\n".join(value for value in search_document if value).lower()
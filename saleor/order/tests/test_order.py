@@ -760,3 +760,54 @@ def test_email_sent_event_without_user_and_user_pk(order):
         "email": order.get_customer_email(),
         "email_type": email_type,
     }
+
+
+def test_order_search_document_updated_on_save(order, customer_user):
+    order.discount_name = "Summer Sale"
+    order.save(update_fields=["discount_name"])
+
+    order.refresh_from_db()
+    assert order.search_document == (
+        "test@example.com\nsummer sale\ntest@example.com\nleslie\nwade"
+    )
+
+
+def test_order_search_document_updated_on_customer_save(order, customer_user):
+    customer_user.email = "new@example.com"
+    customer_user.last_name = "Smith"
+    customer_user.save(update_fields=["email", "last_name"])
+
+    order.refresh_from_db()
+    assert order.search_document == ("test@example.com\nnew@example.com\nleslie\nsmith")
+
+
+def test_order_search_document_not_updated_on_unrelated_customer_save(
+    order, customer_user
+):
+    Order.objects.filter(pk=order.pk).update(search_document="")
+
+    customer_user.note = "Note"
+    customer_user.save(update_fields=["note"])
+
+    order.refresh_from_db()
+    assert order.search_document == ""
+
+
+def test_order_search_document_updated_on_save_without_update_fields(order):
+    order.discount_name = "Summer Sale"
+    order.save()
+
+    order.refresh_from_db()
+    assert "summer sale" in order.search_document
+
+
+@patch("saleor.order.models.prepare_order_search_document_value")
+def test_order_search_document_not_prepared_on_unrelated_save(
+    mocked_prepare_value, order
+):
+    order = Order.objects.get(pk=order.pk)
+
+    order.customer_note = "Note"
+    order.save()
+
+    mocked_prepare_value.assert_not_called()
@@ -1,8 +1,11 @@
+from copy import deepcopy
 from decimal import Decimal
 from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Union
+from uuid import uuid4
 
 import opentracing
 from django.conf import settings
+from django.core.cache import cache
 from django.core.handlers.wsgi import WSGIRequest
 from django.http import HttpResponse, HttpResponseNotFound
 from django.utils.module_loading import import_string
@@ -10,15 +13,16 @@ from django_countries.fields import Country
 from prices import Money, MoneyRange, TaxedMoney, TaxedMoneyRange
 
 from ..checkout import base_calculations
+from ..core.cache import ALL_RESPONSES_TAG, purge_response_cache
 from ..core.payments import PaymentInterface
 from ..core.prices import quantize_price
 from ..core.taxes import TaxType, zero_taxed_money
 from ..discount import DiscountInfo
+from .base_plugin import BasePlugin
 from .models import PluginConfiguration
 
 if TYPE_CHECKING:
     # flake8: noqa
-    from .base_plugin import BasePlugin
     from ..checkout.models import Checkout, CheckoutLine
     from ..product.models import Product, ProductType
     from ..account.models import Address, User
@@ -33,6 +37,11 @@ if TYPE_CHECKING:
     )
 
 
+PLUGIN_CONFIGS_VERSION_CACHE_KEY = "plugin_configurations_version"
+
+_plugin_configs_cache: Dict[str, Any] = {}
+
+
 class PluginsManager(PaymentInterface):
     """Base manager for handling plugins logic."""
 
@@ -51,16 +60,37 @@ class PluginsManager(PaymentInterface):
                 plugin_config = PluginClass.DEFAULT_CONFIGURATION
                 active = PluginClass.get_default_active()
             self.plugins.append(PluginClass(configuration=plugin_config, active=active))
+        self._plugins_by_method: Dict[str, List["BasePlugin"]] = {}
+
+    def _get_plugins_implementing(self, method_name: str) -> List["BasePlugin"]:
+        """Return active plugins that override the given method of the base plugin.
+
+        The result is memoized per method name, as hooks are called many times
+        during a request, e.g. once per checkout line.
+        """
+        plugins = self._plugins_by_method.get(method_name)
+        if plugins is None:
+            base_method = getattr(BasePlugin, method_name, None)
+            plugins = [
+                plugin
+                for plugin in self.get_active_plugins()
+                if getattr(type(plugin), method_name, base_method) is not base_method
+            ]
+            self._plugins_by_method[method_name] = plugins
+        return plugins
 
     def __run_method_on_plugins(
         self, method_name: str, default_value: Any, *args, **kwargs
     ):
         """Try to run a method with the given name on each declared plugin."""
+        plugins = self._get_plugins_implementing(method_name)
+        if not plugins:
+            return default_value
         with opentracing.global_tracer().start_active_span(
             f"ExtensionsManager.{method_name}"
         ):
             value = default_value
-            for plugin in self.plugins:
+            for plugin in plugins:
                 value = self.__run_method_on_single_plugin(
                     plugin, method_name, value, *args, **kwargs
                 )
@@ -102,11 +132,23 @@ class PluginsManager(PaymentInterface):
         checkout: "Checkout",
         lines: Iterable["CheckoutLine"],
         discounts: Iterable[DiscountInfo],
+        subtotal: Optional[TaxedMoney] = None,
+        shipping_price: Optional[TaxedMoney] = None,
     ) -> TaxedMoney:
+        """Calculate the checkout total.
 
+        Subtotal and shipping price already calculated for the checkout can be
+        passed to avoid calculating them again.
+        """
+        if subtotal is None:
+            subtotal = self.calculate_checkout_subtotal(checkout, lines, discounts)
+        if shipping_price is None:
+            shipping_price = self.calculate_checkout_shipping(
+                checkout, lines, discounts
+            )
         default_value = base_calculations.base_checkout_total(
-            subtotal=self.calculate_checkout_subtotal(checkout, lines, discounts),
-            shipping_price=self.calculate_checkout_shipping(checkout, lines, discounts),
+            subtotal=subtotal,
+            shipping_price=shipping_price,
             discount=checkout.discount,
             currency=checkout.currency,
         )
@@ -119,10 +161,17 @@ class PluginsManager(PaymentInterface):
         checkout: "Checkout",
         lines: Iterable["CheckoutLine"],
         discounts: Iterable[DiscountInfo],
+        line_totals: Optional[List[TaxedMoney]] = None,
     ) -> TaxedMoney:
-        line_totals = [
-            self.calculate_checkout_line_total(line, discounts) for line in lines
-        ]
+        """Calculate the checkout subtotal.
+
+        Totals already calculated for the lines can be passed to avoid calculating
+        them again.
+        """
+        if line_totals is None:
+            line_totals = [
+                self.calculate_checkout_line_total(line, discounts) for line in lines
+            ]
         default_value = base_calculations.base_checkout_subtotal(
             line_totals, checkout.currency
         )
@@ -416,9 +465,7 @@ class PluginsManager(PaymentInterface):
 
     def _get_all_plugin_configs(self):
         if not hasattr(self, "_plugin_configs"):
-            self._plugin_configs = {
-                pc.identifier: pc for pc in PluginConfiguration.objects.all()
-            }
+            self._plugin_configs = get_plugin_configs()
         return self._plugin_configs
 
     # FIXME these methods should be more generic
@@ -454,9 +501,11 @@ class PluginsManager(PaymentInterface):
                     identifier=plugin_id,
                     defaults={"configuration": plugin.configuration},
                 )
-                return plugin.save_plugin_configuration(
+                plugin_configuration = plugin.save_plugin_configuration(
                     plugin_configuration, cleaned_data
                 )
+                invalidate_plugin_configs_cache()
+                return plugin_configuration
 
     def get_plugin(self, plugin_id: str) -> Optional["BasePlugin"]:
         for plugin in self.plugins:
@@ -483,6 +532,34 @@ class PluginsManager(PaymentInterface):
         )
 
 
+def get_plugin_configs() -> Dict[str, PluginConfiguration]:
+    """Return plugin configurations stored in the database, keyed by identifier.
+
+    Configurations are cached at the process level and are loaded again only when
+    the version stored in the shared cache changes, so building a manager
+    for a warm request doesn't query the database. Plugins modify their
+    configuration in place, that's why each caller gets its own copy.
+    """
+    version = cache.get(PLUGIN_CONFIGS_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(PLUGIN_CONFIGS_VERSION_CACHE_KEY, uuid4().hex, None)
+        version = cache.get(PLUGIN_CONFIGS_VERSION_CACHE_KEY)
+    if version is None or _plugin_configs_cache.get("version") != version:
+        configs = {pc.identifier: pc for pc in PluginConfiguration.objects.all()}
+        _plugin_configs_cache.update({"version": version, "configs": configs})
+    else:
+        configs = _plugin_configs_cache["configs"]
+    return deepcopy(configs)
+
+
+def invalidate_plugin_configs_cache():
+    """Force all processes to reload plugin configurations from the database."""
+    _plugin_configs_cache.clear()
+    cache.set(PLUGIN_CONFIGS_VERSION_CACHE_KEY, uuid4().hex, None)
+    # Plugins may change prices, taxes and other data of any response
+    purge_response_cache(ALL_RESPONSES_TAG)
+
+
 def get_plugins_manager(
     manager_path: str = None, plugins: List[str] = None
 ) -> PluginsManager:
@@ -2,11 +2,24 @@ import pytest
 from django_prices_vatlayer.models import VAT
 from django_prices_vatlayer.utils import get_tax_for_rate
 
+from ...webhook.utils import invalidate_webhook_subscriptions_cache
 from ..base_plugin import ConfigurationTypeField
+from ..manager import invalidate_plugin_configs_cache
 from ..models import PluginConfiguration
 from .sample_plugins import PluginInactive, PluginSample
 
 
+@pytest.fixture(autouse=True)
+def clear_plugin_configs_cache():
+    # Configurations cached by one test could be rolled back from the database
+    invalidate_plugin_configs_cache()
+
+
+@pytest.fixture(autouse=True)
+def clear_webhook_subscriptions_cache():
+    invalidate_webhook_subscriptions_cache()
+
+
 @pytest.fixture
 def plugin_configuration(db):
     configuration, _ = PluginConfiguration.objects.get_or_create(
@@ -1,5 +1,6 @@
 import json
 from decimal import Decimal
+from unittest import mock
 
 import pytest
 from django.http import HttpResponseNotFound, JsonResponse
@@ -384,3 +385,50 @@ def test_manager_inncorrect_plugin(rf):
     response = manager.webhook(request, "incorrect.plugin.id")
     assert isinstance(response, HttpResponseNotFound)
     assert response.status_code == 404
+
+
+def test_plugin_configs_are_cached_between_managers(
+    plugin_configuration, django_assert_num_queries
+):
+    plugins = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+    PluginsManager(plugins=plugins)
+
+    with django_assert_num_queries(0):
+        manager = PluginsManager(plugins=plugins)
+
+    assert manager.get_plugin(PluginSample.PLUGIN_ID).active
+
+
+def test_save_plugin_configuration_invalidates_cached_configs(plugin_configuration):
+    plugins = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+    manager = PluginsManager(plugins=plugins)
+
+    manager.save_plugin_configuration(PluginSample.PLUGIN_ID, {"active": False})
+
+    manager = PluginsManager(plugins=plugins)
+    assert not manager.get_plugin(PluginSample.PLUGIN_ID).active
+
+
+def test_manager_skips_plugins_not_implementing_method(address):
+    plugins = [
+        "saleor.plugins.tests.sample_plugins.PluginSample",
+        "saleor.plugins.tests.sample_plugins.PluginInactive",
+    ]
+    manager = PluginsManager(plugins=plugins)
+
+    with mock.patch("saleor.plugins.manager.opentracing") as mocked_opentracing:
+        assert manager.change_user_address(address, None, None) == address
+
+    mocked_opentracing.global_tracer.assert_not_called()
+    assert manager._plugins_by_method["change_user_address"] == []
+
+
+def test_manager_skips_inactive_plugins(product):
+    plugins = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+    manager = PluginsManager(plugins=plugins)
+    manager.get_plugin(PluginSample.PLUGIN_ID).active = False
+    manager._plugins_by_method.clear()
+
+    tax_rate = manager.get_tax_rate_percentage_value(product, Country("PL"))
+
+    assert tax_rate == Decimal("0")
@@ -1,16 +1,26 @@
-from typing import TYPE_CHECKING, Any, Optional
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import partial
+from typing import TYPE_CHECKING, Any, DefaultDict, List, Optional
+
+from django.db import transaction
 
 from ...webhook.event_types import WebhookEventType
 from ...webhook.payloads import (
-    generate_checkout_payload,
     generate_customer_payload,
     generate_fulfillment_payload,
     generate_invoice_payload,
-    generate_order_payload,
     generate_product_payload,
 )
+from ...webhook.utils import is_event_subscribed
 from ..base_plugin import BasePlugin
-from .tasks import trigger_webhooks_for_event
+from .tasks import (
+    trigger_webhooks_for_checkout_event,
+    trigger_webhooks_for_event,
+    trigger_webhooks_for_order_event,
+    trigger_webhooks_for_orders_event,
+)
 
 if TYPE_CHECKING:
     from ...order.models import Fulfillment, Order
@@ -20,6 +30,31 @@ if TYPE_CHECKING:
     from ...invoice.models import Invoice
 
 
+_batched_order_events = threading.local()
+
+
+@contextmanager
+def batch_order_events():
+    """Trigger webhooks for the order events sent within the block together.
+
+    Instead of a task per order, a single task per event type generates
+    the payloads of all the orders at once, after the transaction is committed.
+    """
+    if getattr(_batched_order_events, "order_pks", None) is not None:
+        yield
+        return
+    order_pks: DefaultDict[str, List[int]] = defaultdict(list)
+    _batched_order_events.order_pks = order_pks
+    try:
+        yield
+    finally:
+        _batched_order_events.order_pks = None
+    for event_type, pks in order_pks.items():
+        transaction.on_commit(
+            partial(trigger_webhooks_for_orders_event.delay, event_type, pks)
+        )
+
+
 class WebhookPlugin(BasePlugin):
     PLUGIN_ID = "mirumee.webhooks"
     PLUGIN_NAME = "Webhooks"
@@ -29,23 +64,44 @@ class WebhookPlugin(BasePlugin):
         super().__init__(*args, **kwargs)
         self.active = True
 
+    @staticmethod
+    def _trigger_order_event(event_type: str, order: "Order"):
+        # The payload is generated by the worker, once the order is committed
+        if not is_event_subscribed(event_type):
+            return
+        batched_order_pks = getattr(_batched_order_events, "order_pks", None)
+        if batched_order_pks is not None:
+            batched_order_pks[event_type].append(order.pk)
+        else:
+            transaction.on_commit(
+                lambda: trigger_webhooks_for_order_event.delay(event_type, order.pk)
+            )
+
+    @staticmethod
+    def _trigger_checkout_event(event_type: str, checkout: "Checkout"):
+        # The payload is generated by the worker, once the checkout is committed
+        if is_event_subscribed(event_type):
+            checkout_token = str(checkout.pk)
+            transaction.on_commit(
+                lambda: trigger_webhooks_for_checkout_event.delay(
+                    event_type, checkout_token
+                )
+            )
+
     def order_created(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_CREATED, order_data)
+        self._trigger_order_event(WebhookEventType.ORDER_CREATED, order)
 
     def order_fully_paid(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_FULLY_PAID, order_data)
+        self._trigger_order_event(WebhookEventType.ORDER_FULLY_PAID, order)
 
     def order_updated(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_UPDATED, order_data)
+        self._trigger_order_event(WebhookEventType.ORDER_UPDATED, order)
 
     def invoice_request(
         self,
@@ -54,7 +110,9 @@ class WebhookPlugin(BasePlugin):
         number: Optional[str],
         previous_value: Any,
     ) -> Any:
-        if not self.active:
+        if not self.active or not is_event_subscribed(
+            WebhookEventType.INVOICE_REQUESTED
+        ):
             return previous_value
         invoice_data = generate_invoice_payload(invoice)
         trigger_webhooks_for_event.delay(
@@ -62,13 +120,13 @@ class WebhookPlugin(BasePlugin):
         )
 
     def invoice_delete(self, invoice: "Invoice", previous_value: Any):
-        if not self.active:
+        if not self.active or not is_event_subscribed(WebhookEventType.INVOICE_DELETED):
             return previous_value
         invoice_data = generate_invoice_payload(invoice)
         trigger_webhooks_for_event.delay(WebhookEventType.INVOICE_DELETED, invoice_data)
 
     def invoice_sent(self, invoice: "Invoice", email: str, previous_value: Any) -> Any:
-        if not self.active:
+        if not self.active or not is_event_subscribed(WebhookEventType.INVOICE_SENT):
             return previous_value
         invoice_data = generate_invoice_payload(invoice)
         trigger_webhooks_for_event.delay(WebhookEventType.INVOICE_SENT, invoice_data)
@@ -76,17 +134,17 @@ class WebhookPlugin(BasePlugin):
     def order_cancelled(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_CANCELLED, order_data)
+        self._trigger_order_event(WebhookEventType.ORDER_CANCELLED, order)
 
     def order_fulfilled(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_FULFILLED, order_data)
+        self._trigger_order_event(WebhookEventType.ORDER_FULFILLED, order)
 
     def fulfillment_created(self, fulfillment: "Fulfillment", previous_value):
-        if not self.active:
+        if not self.active or not is_event_subscribed(
+            WebhookEventType.FULFILLMENT_CREATED
+        ):
             return previous_value
         fulfillment_data = generate_fulfillment_payload(fulfillment)
         trigger_webhooks_for_event.delay(
@@ -94,7 +152,9 @@ class WebhookPlugin(BasePlugin):
         )
 
     def customer_created(self, customer: "User", previous_value: Any) -> Any:
-        if not self.active:
+        if not self.active or not is_event_subscribed(
+            WebhookEventType.CUSTOMER_CREATED
+        ):
             return previous_value
         customer_data = generate_customer_payload(customer)
         trigger_webhooks_for_event.delay(
@@ -102,7 +162,7 @@ class WebhookPlugin(BasePlugin):
         )
 
     def product_created(self, product: "Product", previous_value: Any) -> Any:
-        if not self.active:
+        if not self.active or not is_event_subscribed(WebhookEventType.PRODUCT_CREATED):
             return previous_value
         product_data = generate_product_payload(product)
         trigger_webhooks_for_event.delay(WebhookEventType.PRODUCT_CREATED, product_data)
@@ -113,23 +173,16 @@ class WebhookPlugin(BasePlugin):
     ) -> Any:
         if not self.active:
             return previous_value
-        checkout_data = generate_checkout_payload(checkout)
-        trigger_webhooks_for_event.delay(
-            WebhookEventType.CHECKOUT_QUANTITY_CHANGED, checkout_data
+        self._trigger_checkout_event(
+            WebhookEventType.CHECKOUT_QUANTITY_CHANGED, checkout
         )
 
     def checkout_created(self, checkout: "Checkout", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        checkout_data = generate_checkout_payload(checkout)
-        trigger_webhooks_for_event.delay(
-            WebhookEventType.CHECKOUT_CREATED, checkout_data
-        )
+        self._trigger_checkout_event(WebhookEventType.CHECKOUT_CREATED, checkout)
 
     def checkout_updated(self, checkout: "Checkout", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        checkout_data = generate_checkout_payload(checkout)
-        trigger_webhooks_for_event.delay(
-            WebhookEventType.CHECKOUT_UPADTED, checkout_data
-        )
+        self._trigger_checkout_event(WebhookEventType.CHECKOUT_UPADTED, checkout)
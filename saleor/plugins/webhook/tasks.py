@@ -1,22 +1,43 @@
+import json
 import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from functools import lru_cache
+from typing import Dict, Iterator, List, Tuple
 from urllib.parse import urlparse, urlunparse
 
 import boto3
 import requests
+from django.conf import settings
 from google.cloud import pubsub_v1
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
 
 from ...celeryconf import app
+from ...checkout.models import Checkout
+from ...order.models import Order
 from ...site.models import Site
 from ...webhook.event_types import WebhookEventType
 from ...webhook.models import Webhook
+from ...webhook.payloads import (
+    generate_checkout_payload,
+    generate_order_payload,
+    generate_orders_payload,
+)
 from . import signature_for_payload
 
 logger = logging.getLogger(__name__)
 
 WEBHOOK_TIMEOUT = 10
 
+# The maximum number of messages accepted by a single SQS SendMessageBatch call
+SQS_MAX_BATCH_SIZE = 10
+
+# The maximum total size (in bytes) of the messages, attributes included, accepted
+# by a single SQS SendMessageBatch call
+SQS_MAX_BATCH_PAYLOAD_SIZE = 256 * 1024
+
 
 class WebhookSchemes(str, Enum):
     HTTP = "http"
@@ -25,8 +46,7 @@ class WebhookSchemes(str, Enum):
     GOOGLE_CLOUD_PUBSUB = "gcpubsub"
 
 
-@app.task
-def trigger_webhooks_for_event(event_type, data):
+def get_webhooks_for_event(event_type) -> List[Webhook]:
     permissions = {}
     required_permission = WebhookEventType.PERMISSIONS[event_type].value
     if required_permission:
@@ -43,6 +63,13 @@ def trigger_webhooks_for_event(event_type, data):
     webhooks = webhooks.select_related("app").prefetch_related(
         "app__permissions__content_type"
     )
+    return list(webhooks)
+
+
+def send_webhook_requests(webhooks: List[Webhook], event_type, data):
+    if settings.WEBHOOK_BATCH_DELIVERY:
+        send_webhook_requests_in_batch(webhooks, event_type, data)
+        return
 
     for webhook in webhooks:
         send_webhook_request.delay(
@@ -50,7 +77,55 @@ def trigger_webhooks_for_event(event_type, data):
         )
 
 
-def send_webhook_using_http(target_url, message, domain, signature, event_type):
+@app.task
+def trigger_webhooks_for_event(event_type, data):
+    send_webhook_requests(get_webhooks_for_event(event_type), event_type, data)
+
+
+@app.task
+def trigger_webhooks_for_order_event(event_type, order_pk):
+    order = Order.objects.filter(pk=order_pk).first()
+    if order is None:
+        logger.warning("Order %r for event %r does not exist", order_pk, event_type)
+        return
+    trigger_webhooks_for_event(event_type, generate_order_payload(order))
+
+
+@app.task
+def trigger_webhooks_for_orders_event(event_type, order_pks):
+    """Trigger webhooks for an event of many orders.
+
+    Payloads of all the orders are generated at once, but every order is still
+    delivered in a separate request.
+    """
+    orders_by_pk = Order.objects.in_bulk(order_pks)
+    missing_order_pks = set(order_pks) - set(orders_by_pk)
+    if missing_order_pks:
+        logger.warning(
+            "Orders %r for event %r do not exist", missing_order_pks, event_type
+        )
+    orders = [orders_by_pk[pk] for pk in order_pks if pk in orders_by_pk]
+    if not orders:
+        return
+    webhooks = get_webhooks_for_event(event_type)
+    for order_data in json.loads(generate_orders_payload(orders)):
+        # Same as the payload of a single order
+        data = json.dumps([order_data], ensure_ascii=False)
+        send_webhook_requests(webhooks, event_type, data)
+
+
+@app.task
+def trigger_webhooks_for_checkout_event(event_type, checkout_token):
+    checkout = Checkout.objects.filter(token=checkout_token).first()
+    if checkout is None:
+        logger.warning(
+            "Checkout %r for event %r does not exist", checkout_token, event_type
+        )
+        return
+    trigger_webhooks_for_event(event_type, generate_checkout_payload(checkout))
+
+
+def get_http_headers(domain, signature, event_type):
     headers = {
         "Content-Type": "application/json",
         "X-Saleor-Event": event_type,
@@ -61,38 +136,53 @@ def send_webhook_using_http(target_url, message, domain, signature, event_type):
     if signature:
         # This header is depreceated and will be removed in Saleor3.0
         headers["X-Saleor-HMAC-SHA256"] = f"sha1={signature}"
+    return headers
+
 
+def send_webhook_using_http(target_url, message, domain, signature, event_type):
+    headers = get_http_headers(domain, signature, event_type)
     response = requests.post(
         target_url, data=message, headers=headers, timeout=WEBHOOK_TIMEOUT
     )
     response.raise_for_status()
 
 
-def send_webhook_using_aws_sqs(target_url, message, domain, signature, event_type):
+def parse_aws_sqs_target_url(target_url) -> Tuple[str, str, str, str]:
+    """Return the region, the credentials and the queue URL of an SQS webhook."""
     parts = urlparse(target_url)
     region = "us-east-1"
     hostname_parts = parts.hostname.split(".")
     if len(hostname_parts) == 4 and hostname_parts[0] == "sqs":
         region = hostname_parts[1]
-    client = boto3.client(
-        "sqs",
-        region_name=region,
-        aws_access_key_id=parts.username,
-        aws_secret_access_key=parts.password,
-    )
     queue_url = urlunparse(
         ("https", parts.hostname, parts.path, parts.params, parts.query, parts.fragment)
     )
+    return region, parts.username, parts.password, queue_url
+
 
+def get_aws_sqs_message_attributes(domain, signature, event_type):
     msg_attributes = {
         "SaleorDomain": {"DataType": "String", "StringValue": domain},
         "EventType": {"DataType": "String", "StringValue": event_type},
     }
     if signature:
         msg_attributes["Signature"] = {"DataType": "String", "StringValue": signature}
+    return msg_attributes
+
+
+def send_webhook_using_aws_sqs(target_url, message, domain, signature, event_type):
+    region, access_key_id, secret_access_key, queue_url = parse_aws_sqs_target_url(
+        target_url
+    )
+    client = boto3.client(
+        "sqs",
+        region_name=region,
+        aws_access_key_id=access_key_id,
+        aws_secret_access_key=secret_access_key,
+    )
     client.send_message(
         QueueUrl=queue_url,
-        MessageAttributes=msg_attributes,
+        MessageAttributes=get_aws_sqs_message_attributes(domain, signature, event_type),
         MessageBody=message.decode("utf-8"),
     )
 
@@ -138,3 +228,180 @@ def send_webhook_request(webhook_id, target_url, secret, event_type, data):
         target_url,
         event_type,
     )
+
+
+@lru_cache(maxsize=None)
+def get_http_session() -> requests.Session:
+    """Return the HTTP session shared by batch deliveries of the process."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=settings.WEBHOOK_DELIVERY_MAX_WORKERS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@lru_cache(maxsize=None)
+def get_aws_sqs_client(region, access_key_id, secret_access_key):
+    return boto3.client(
+        "sqs",
+        region_name=region,
+        aws_access_key_id=access_key_id,
+        aws_secret_access_key=secret_access_key,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_google_cloud_pubsub_client() -> pubsub_v1.PublisherClient:
+    return pubsub_v1.PublisherClient()
+
+
+def _get_aws_sqs_entry_size(entry: dict) -> int:
+    size = len(entry["MessageBody"].encode("utf-8"))
+    for name, attribute in entry["MessageAttributes"].items():
+        for value in [name, attribute["DataType"], attribute["StringValue"]]:
+            size += len(value.encode("utf-8"))
+    return size
+
+
+def chunk_aws_sqs_entries(entries: List[dict]) -> Iterator[List[dict]]:
+    """Split SQS messages into chunks accepted by single `SendMessageBatch` calls."""
+    chunk: List[dict] = []
+    chunk_size = 0
+    for entry in entries:
+        entry_size = _get_aws_sqs_entry_size(entry)
+        if chunk and (
+            len(chunk) == SQS_MAX_BATCH_SIZE
+            or chunk_size + entry_size > SQS_MAX_BATCH_PAYLOAD_SIZE
+        ):
+            yield chunk
+            chunk = []
+            chunk_size = 0
+        chunk.append(entry)
+        chunk_size += entry_size
+    if chunk:
+        yield chunk
+
+
+def send_webhook_requests_in_batch(webhooks: List[Webhook], event_type, data):
+    """Deliver an event to all given webhooks from the current worker.
+
+    HTTP requests are sent in parallel on a thread pool, SQS messages sent to
+    the same queue are grouped in `SendMessageBatch` calls and all deliveries
+    reuse the clients pooled by the process. Deliveries that fail are handed over
+    to `send_webhook_request` tasks, which retry them with a backoff.
+    """
+    domain = Site.objects.get_current().domain
+    message = data.encode("utf-8")
+    http_webhooks = []
+    sqs_webhooks: Dict[Tuple[str, str, str, str], List[Webhook]] = defaultdict(list)
+    pubsub_futures = []
+    failed_webhooks = []
+
+    # A failure of a single delivery can't prevent the other ones, nor retrying
+    # the failed ones, so errors of any kind are caught and retried separately
+    for webhook in webhooks:
+        scheme = urlparse(webhook.target_url).scheme.lower()
+        try:
+            if scheme in [WebhookSchemes.HTTP, WebhookSchemes.HTTPS]:
+                http_webhooks.append(webhook)
+            elif scheme == WebhookSchemes.AWS_SQS:
+                sqs_target = parse_aws_sqs_target_url(webhook.target_url)
+                sqs_webhooks[sqs_target].append(webhook)
+            elif scheme == WebhookSchemes.GOOGLE_CLOUD_PUBSUB:
+                topic_name = urlparse(webhook.target_url).path[1:]
+                future = get_google_cloud_pubsub_client().publish(
+                    topic_name,
+                    message,
+                    saleorDomain=domain,
+                    eventType=event_type,
+                    signature=signature_for_payload(message, webhook.secret_key),
+                )
+                pubsub_futures.append((webhook, future))
+            else:
+                logger.warning(
+                    "[Webhook ID:%r] Unknown webhook scheme: %r", webhook.pk, scheme
+                )
+        except Exception:
+            logger.warning(
+                "[Webhook ID:%r] Failed to send payload", webhook.pk, exc_info=True
+            )
+            failed_webhooks.append(webhook)
+
+    def send_using_http_session(webhook):
+        signature = signature_for_payload(message, webhook.secret_key)
+        response = get_http_session().post(
+            webhook.target_url,
+            data=message,
+            headers=get_http_headers(domain, signature, event_type),
+            timeout=WEBHOOK_TIMEOUT,
+        )
+        response.raise_for_status()
+
+    if http_webhooks:
+        max_workers = min(settings.WEBHOOK_DELIVERY_MAX_WORKERS, len(http_webhooks))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(send_using_http_session, webhook)
+                for webhook in http_webhooks
+            ]
+        for webhook, future in zip(http_webhooks, futures):
+            exception = future.exception()
+            if exception is not None:
+                logger.warning(
+                    "[Webhook ID:%r] Failed to send payload",
+                    webhook.pk,
+                    exc_info=exception,
+                )
+                failed_webhooks.append(webhook)
+
+    for sqs_target, queue_webhooks in sqs_webhooks.items():
+        region, access_key_id, secret_access_key, queue_url = sqs_target
+        webhooks_by_id = {str(webhook.pk): webhook for webhook in queue_webhooks}
+        entries = [
+            {
+                "Id": webhook_id,
+                "MessageBody": data,
+                "MessageAttributes": get_aws_sqs_message_attributes(
+                    domain,
+                    signature_for_payload(message, webhook.secret_key),
+                    event_type,
+                ),
+            }
+            for webhook_id, webhook in webhooks_by_id.items()
+        ]
+        for entries_chunk in chunk_aws_sqs_entries(entries):
+            try:
+                client = get_aws_sqs_client(region, access_key_id, secret_access_key)
+                response = client.send_message_batch(
+                    QueueUrl=queue_url, Entries=entries_chunk
+                )
+            except Exception:
+                logger.warning(
+                    "Failed to send payloads to SQS queue %r", queue_url, exc_info=True
+                )
+                failed_entries = entries_chunk
+            else:
+                failed_entries = response.get("Failed", [])
+            failed_webhooks.extend(
+                webhooks_by_id[entry["Id"]] for entry in failed_entries
+            )
+
+    for webhook, future in pubsub_futures:
+        try:
+            future.result(timeout=WEBHOOK_TIMEOUT)
+        except Exception:
+            logger.warning(
+                "[Webhook ID:%r] Failed to send payload", webhook.pk, exc_info=True
+            )
+            failed_webhooks.append(webhook)
+
+    for webhook in failed_webhooks:
+        send_webhook_request.delay(
+            webhook.pk, webhook.target_url, webhook.secret_key, event_type, data
+        )
+    logger.debug(
+        "Payload of event %r sent to %r webhooks, %r deliveries scheduled for retry",
+        event_type,
+        len(webhooks),
+        len(failed_webhooks),
+    )
@@ -3,6 +3,7 @@ from unittest import mock
 import pytest
 
 from ....app.models import App
+from ....tests.utils import flush_post_commit_hooks
 from ....webhook.event_types import WebhookEventType
 from ....webhook.payloads import (
     generate_checkout_payload,
@@ -12,12 +13,24 @@ from ....webhook.payloads import (
     generate_product_payload,
 )
 from ...manager import get_plugins_manager
-from ...webhook.tasks import trigger_webhooks_for_event
+from ...webhook.plugin import batch_order_events
+from ...webhook.tasks import (
+    trigger_webhooks_for_checkout_event,
+    trigger_webhooks_for_event,
+    trigger_webhooks_for_order_event,
+    trigger_webhooks_for_orders_event,
+)
 
 first_url = "http://www.example.com/first/"
 third_url = "http://www.example.com/third/"
 
 
+@pytest.fixture
+def subscribed_webhook(webhook):
+    webhook.events.create(event_type=WebhookEventType.ANY)
+    return webhook
+
+
 @pytest.mark.parametrize(
     "event_name, total_webhook_calls, expected_target_urls",
     [
@@ -74,20 +87,24 @@ def test_trigger_webhooks_for_event_calls_expected_events(
     assert target_url_calls == expected_target_urls
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_created(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_order_event.delay")
+def test_order_created(
+    mocked_webhook_trigger, settings, subscribed_webhook, order_with_lines
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.order_created(order_with_lines)
+    flush_post_commit_hooks()
 
-    expected_data = generate_order_payload(order_with_lines)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.ORDER_CREATED, expected_data
+        WebhookEventType.ORDER_CREATED, order_with_lines.pk
     )
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_customer_created(mocked_webhook_trigger, settings, customer_user):
+def test_customer_created(
+    mocked_webhook_trigger, settings, subscribed_webhook, customer_user
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.customer_created(customer_user)
@@ -98,20 +115,22 @@ def test_customer_created(mocked_webhook_trigger, settings, customer_user):
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_fully_paid(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_order_event.delay")
+def test_order_fully_paid(
+    mocked_webhook_trigger, settings, subscribed_webhook, order_with_lines
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.order_fully_paid(order_with_lines)
+    flush_post_commit_hooks()
 
-    expected_data = generate_order_payload(order_with_lines)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.ORDER_FULLY_PAID, expected_data
+        WebhookEventType.ORDER_FULLY_PAID, order_with_lines.pk
     )
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_product_created(mocked_webhook_trigger, settings, product):
+def test_product_created(mocked_webhook_trigger, settings, subscribed_webhook, product):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.product_created(product)
@@ -122,70 +141,110 @@ def test_product_created(mocked_webhook_trigger, settings, product):
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_updated(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_order_event.delay")
+def test_order_updated(
+    mocked_webhook_trigger, settings, subscribed_webhook, order_with_lines
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.order_updated(order_with_lines)
+    flush_post_commit_hooks()
 
-    expected_data = generate_order_payload(order_with_lines)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.ORDER_UPDATED, expected_data
+        WebhookEventType.ORDER_UPDATED, order_with_lines.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_cancelled(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_order_event.delay")
+def test_order_cancelled(
+    mocked_webhook_trigger, settings, subscribed_webhook, order_with_lines
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.order_cancelled(order_with_lines)
+    flush_post_commit_hooks()
 
-    expected_data = generate_order_payload(order_with_lines)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.ORDER_CANCELLED, expected_data
+        WebhookEventType.ORDER_CANCELLED, order_with_lines.pk
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_orders_event.delay")
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_order_event.delay")
+def test_batch_order_events(
+    mocked_webhook_trigger,
+    mocked_orders_webhook_trigger,
+    settings,
+    subscribed_webhook,
+    order_list,
+):
+    settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
+    manager = get_plugins_manager()
+
+    with batch_order_events():
+        for order in order_list:
+            manager.order_cancelled(order)
+            manager.order_updated(order)
+    flush_post_commit_hooks()
+
+    mocked_webhook_trigger.assert_not_called()
+    order_pks = [order.pk for order in order_list]
+    mocked_orders_webhook_trigger.assert_has_calls(
+        [
+            mock.call(WebhookEventType.ORDER_CANCELLED, order_pks),
+            mock.call(WebhookEventType.ORDER_UPDATED, order_pks),
+        ],
+        any_order=True,
+    )
+    assert mocked_orders_webhook_trigger.call_count == 2
+
+
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_checkout_event.delay")
 def test_checkout_quantity_changed(
-    mocked_webhook_trigger, settings, checkout_with_items
+    mocked_webhook_trigger, settings, subscribed_webhook, checkout_with_items
 ):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.checkout_quantity_changed(checkout_with_items)
+    flush_post_commit_hooks()
 
-    expected_data = generate_checkout_payload(checkout_with_items)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.CHECKOUT_QUANTITY_CHANGED, expected_data
+        WebhookEventType.CHECKOUT_QUANTITY_CHANGED, str(checkout_with_items.pk)
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_checkout_created(mocked_webhook_trigger, settings, checkout_with_items):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_checkout_event.delay")
+def test_checkout_created(
+    mocked_webhook_trigger, settings, subscribed_webhook, checkout_with_items
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.checkout_created(checkout_with_items)
+    flush_post_commit_hooks()
 
-    expected_data = generate_checkout_payload(checkout_with_items)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.CHECKOUT_CREATED, expected_data
+        WebhookEventType.CHECKOUT_CREATED, str(checkout_with_items.pk)
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_checkout_updated(mocked_webhook_trigger, settings, checkout_with_items):
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_checkout_event.delay")
+def test_checkout_updated(
+    mocked_webhook_trigger, settings, subscribed_webhook, checkout_with_items
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.checkout_updated(checkout_with_items)
+    flush_post_commit_hooks()
 
-    expected_data = generate_checkout_payload(checkout_with_items)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.CHECKOUT_UPADTED, expected_data
+        WebhookEventType.CHECKOUT_UPADTED, str(checkout_with_items.pk)
     )
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_invoice_request(mocked_webhook_trigger, settings, fulfilled_order):
+def test_invoice_request(
+    mocked_webhook_trigger, settings, subscribed_webhook, fulfilled_order
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     invoice = fulfilled_order.invoices.first()
@@ -197,7 +256,9 @@ def test_invoice_request(mocked_webhook_trigger, settings, fulfilled_order):
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_invoice_delete(mocked_webhook_trigger, settings, fulfilled_order):
+def test_invoice_delete(
+    mocked_webhook_trigger, settings, subscribed_webhook, fulfilled_order
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     invoice = fulfilled_order.invoices.first()
@@ -209,7 +270,9 @@ def test_invoice_delete(mocked_webhook_trigger, settings, fulfilled_order):
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_invoice_sent(mocked_webhook_trigger, settings, fulfilled_order):
+def test_invoice_sent(
+    mocked_webhook_trigger, settings, subscribed_webhook, fulfilled_order
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     invoice = fulfilled_order.invoices.first()
@@ -218,3 +281,92 @@ def test_invoice_sent(mocked_webhook_trigger, settings, fulfilled_order):
     mocked_webhook_trigger.assert_called_once_with(
         WebhookEventType.INVOICE_SENT, expected_data
     )
+
+
+@mock.patch("saleor.plugins.webhook.plugin.generate_product_payload")
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_order_event.delay")
+def test_events_without_subscribers_are_skipped(
+    mocked_order_webhook_trigger,
+    mocked_webhook_trigger,
+    mocked_generate_product_payload,
+    settings,
+    order_with_lines,
+    product,
+):
+    settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
+    manager = get_plugins_manager()
+    manager.order_updated(order_with_lines)
+    manager.product_created(product)
+    flush_post_commit_hooks()
+
+    mocked_order_webhook_trigger.assert_not_called()
+    mocked_webhook_trigger.assert_not_called()
+    mocked_generate_product_payload.assert_not_called()
+
+
+@mock.patch("saleor.plugins.webhook.tasks.trigger_webhooks_for_event")
+def test_trigger_webhooks_for_order_event(mocked_webhook_trigger, order_with_lines):
+    trigger_webhooks_for_order_event(
+        WebhookEventType.ORDER_CREATED, order_with_lines.pk
+    )
+
+    expected_data = generate_order_payload(order_with_lines)
+    mocked_webhook_trigger.assert_called_once_with(
+        WebhookEventType.ORDER_CREATED, expected_data
+    )
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_requests")
+def test_trigger_webhooks_for_orders_event(
+    mocked_send_webhook_requests,
+    subscribed_webhook,
+    order_with_lines,
+    order_list,
+    permission_manage_orders,
+):
+    subscribed_webhook.app.permissions.add(permission_manage_orders)
+    orders = [order_with_lines, *order_list]
+    missing_order_pk = max(order.pk for order in orders) + 1
+
+    trigger_webhooks_for_orders_event(
+        WebhookEventType.ORDER_UPDATED,
+        [order.pk for order in orders] + [missing_order_pk],
+    )
+
+    # Every order is delivered separately, with the same payload as a single order
+    mocked_send_webhook_requests.assert_has_calls(
+        [
+            mock.call(
+                [subscribed_webhook],
+                WebhookEventType.ORDER_UPDATED,
+                generate_order_payload(order),
+            )
+            for order in orders
+        ]
+    )
+    assert mocked_send_webhook_requests.call_count == len(orders)
+
+
+@mock.patch("saleor.plugins.webhook.tasks.trigger_webhooks_for_event")
+def test_trigger_webhooks_for_checkout_event(
+    mocked_webhook_trigger, checkout_with_items
+):
+    trigger_webhooks_for_checkout_event(
+        WebhookEventType.CHECKOUT_UPADTED, str(checkout_with_items.pk)
+    )
+
+    expected_data = generate_checkout_payload(checkout_with_items)
+    mocked_webhook_trigger.assert_called_once_with(
+        WebhookEventType.CHECKOUT_UPADTED, expected_data
+    )
+
+
+@mock.patch("saleor.plugins.webhook.tasks.trigger_webhooks_for_event")
+def test_trigger_webhooks_for_deleted_order(mocked_webhook_trigger, order):
+    order_pk = order.pk
+    order.delete()
+
+    trigger_webhooks_for_order_event(WebhookEventType.ORDER_UPDATED, order_pk)
+
+    mocked_webhook_trigger.assert_not_called()
@@ -23,12 +23,18 @@ SORT_BY_FIELDS = OrderedDict(
 T_PRODUCT_FILTER_QUERIES = Dict[int, Iterable[int]]
 
 
+def get_products_attribute_values_query(values_pk: Iterable[int]) -> Q:
+    """Match products having any of the values, assigned to them or their variants."""
+    return Q(**{"attributes__values__pk__in": values_pk}) | Q(
+        **{"variants__attributes__values__pk__in": values_pk}
+    )
+
+
 def filter_products_by_attributes_values(qs, queries: T_PRODUCT_FILTER_QUERIES):
     # Combine filters of the same attribute with OR operator
     # and then combine full query with AND operator.
     combine_and = [
-        Q(**{"attributes__values__pk__in": values_pk})
-        | Q(**{"variants__attributes__values__pk__in": values_pk})
+        get_products_attribute_values_query(values_pk)
         for _, values_pk in queries.items()
     ]
     query = functools.reduce(operator.and_, combine_and)
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from ...models import Product
+from ...utils.attributes import update_products_attribute_sort_keys
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the keys used to sort all products by their attributes."
+
+    def handle(self, *args, **options):
+        self.stdout.write("Updating attribute sort keys of all the products.")
+        update_products_attribute_sort_keys(Product.objects.all())
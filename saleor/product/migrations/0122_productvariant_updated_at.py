@@ -0,0 +1,18 @@
+# Generated by Django 3.1 on 2020-08-20 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0121_auto_20200810_1415"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="productvariant",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, null=True),
+        ),
+    ]
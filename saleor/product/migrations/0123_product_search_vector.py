@@ -0,0 +1,74 @@
+# Generated by Django 3.1 on 2020-08-24 10:37
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import TextField, Value
+
+from saleor.core.utils.draftjs import json_content_to_raw_text
+
+CHUNK_SIZE = 1000
+
+
+def get_search_vector(content, weight):
+    text = " ".join(part for part in content if part)
+    return SearchVector(Value(text, output_field=TextField()), weight=weight)
+
+
+def get_attribute_values(instance):
+    for assigned_attribute in instance.attributes.all():
+        for value in assigned_attribute.values.all():
+            yield value.name
+
+
+def populate_product_search_vector(apps, schema_editor):
+    Product = apps.get_model("product", "Product")
+    products = Product.objects.order_by("pk").prefetch_related(
+        "attributes__values", "variants__attributes__values"
+    )
+    last_pk = 0
+    while True:
+        chunk = list(products.filter(pk__gt=last_pk)[:CHUNK_SIZE])
+        if not chunk:
+            return
+        for product in chunk:
+            variants_content = list(get_attribute_values(product))
+            for variant in product.variants.all():
+                variants_content.extend([variant.sku, variant.name])
+                variants_content.extend(get_attribute_values(variant))
+            description_content = [
+                product.description,
+                json_content_to_raw_text(product.description_json),
+            ]
+            product.search_vector = (
+                get_search_vector([product.name], "A")
+                + get_search_vector(variants_content, "B")
+                + get_search_vector(description_content, "C")
+            )
+        Product.objects.bulk_update(chunk, ["search_vector"])
+        last_pk = chunk[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0122_productvariant_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                blank=True, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="product_search_gin"
+            ),
+        ),
+        migrations.RunPython(populate_product_search_vector, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 3.1 on 2020-08-26 08:41
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+CHUNK_SIZE = 500
+
+
+def populate_product_attribute_sort_keys(apps, schema_editor):
+    AttributeProduct = apps.get_model("product", "AttributeProduct")
+    AttributeValue = apps.get_model("product", "AttributeValue")
+    Product = apps.get_model("product", "Product")
+    ProductAttributeSortKey = apps.get_model("product", "ProductAttributeSortKey")
+
+    attribute_ids_by_product_type = defaultdict(list)
+    for product_type_id, attribute_id in AttributeProduct.objects.values_list(
+        "product_type_id", "attribute_id"
+    ):
+        attribute_ids_by_product_type[product_type_id].append(attribute_id)
+
+    products = Product.objects.order_by("pk").values_list("pk", "product_type_id")
+    last_pk = 0
+    while True:
+        chunk = list(products.filter(pk__gt=last_pk)[:CHUNK_SIZE])
+        if not chunk:
+            return
+        last_pk = chunk[-1][0]
+
+        # Values are returned in their default ordering which the sorting follows
+        values_names = defaultdict(list)
+        for product_id, attribute_id, name in AttributeValue.objects.filter(
+            assignedproductattribute__product_id__in=[pk for pk, _ in chunk]
+        ).values_list("assignedproductattribute__product_id", "attribute_id", "name"):
+            values_names[(product_id, attribute_id)].append(name)
+
+        sort_keys = []
+        for product_id, product_type_id in chunk:
+            for attribute_id in attribute_ids_by_product_type[product_type_id]:
+                names = values_names[(product_id, attribute_id)]
+                sort_keys.append(
+                    ProductAttributeSortKey(
+                        product_id=product_id,
+                        attribute_id=attribute_id,
+                        values_order=0 if names else 1,
+                        concatenated_values=",".join(names),
+                    )
+                )
+        ProductAttributeSortKey.objects.bulk_create(sort_keys)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0123_product_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductAttributeSortKey",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("values_order", models.PositiveSmallIntegerField()),
+                ("concatenated_values", models.TextField(blank=True, default="")),
+                (
+                    "attribute",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="product.Attribute",
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attribute_sort_keys",
+                        to="product.Product",
+                    ),
+                ),
+            ],
+            options={"unique_together": {("product", "attribute")}},
+        ),
+        migrations.AddIndex(
+            model_name="productattributesortkey",
+            index=models.Index(
+                fields=["attribute", "values_order", "concatenated_values"],
+                name="product_attr_sort_key_idx",
+            ),
+        ),
+        migrations.RunPython(
+            populate_product_attribute_sort_keys, migrations.RunPython.noop
+        ),
+    ]
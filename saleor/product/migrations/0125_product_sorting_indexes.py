@@ -0,0 +1,37 @@
+# Generated by Django 3.1 on 2020-08-27 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0124_productattributesortkey"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["name", "slug"], name="product_name_slug_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["minimal_variant_price_amount", "name", "slug"],
+                name="product_min_price_name_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["updated_at", "name", "slug"], name="product_updated_name_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["is_published", "name", "slug"],
+                name="product_published_name_idx",
+            ),
+        ),
+    ]
@@ -2,10 +2,11 @@ from typing import TYPE_CHECKING, Iterable, Optional, Union
 from uuid import uuid4
 
 from django.conf import settings
-from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.db.models import JSONField  # type: ignore
-from django.db.models import Case, Count, F, FilteredRelation, Q, Value, When
+from django.db.models import F, FilteredRelation, Q, Value
 from django.urls import reverse
 from django.utils.encoding import smart_text
 from django_measurement.models import MeasurementField
@@ -32,6 +33,7 @@ from ..discount import DiscountInfo
 from ..discount.utils import calculate_discounted_price
 from ..seo.models import SeoModel, SeoModelTranslation
 from . import AttributeInputType
+from .search import prepare_product_search_vector_value
 
 if TYPE_CHECKING:
     # flake8: noqa
@@ -151,72 +153,21 @@ class ProductsQueryset(PublishedQuerySet):
                 concatenated_values=Value(None, output_field=models.CharField()),
             )
 
-        # Retrieve all the products' attribute data IDs (assignments) and
-        # product types that have the given attribute associated to them
-        associated_values = tuple(
-            AttributeProduct.objects.filter(attribute_id=attribute_pk).values_list(
-                "pk", "product_type_id"
-            )
+        qs = qs.annotate(
+            # Products which don't have the attribute in their product type don't
+            # have a sort key, so their values are null and they are sorted last.
+            # Refer to `ProductAttributeSortKey`.
+            attribute_sort_key=FilteredRelation(
+                relation_name="attribute_sort_keys",
+                condition=Q(attribute_sort_keys__attribute_id=attribute_pk),
+            ),
+            concatenated_values_order=F("attribute_sort_key__values_order"),
+            concatenated_values=F("attribute_sort_key__concatenated_values"),
         )
 
-        if not associated_values:
-            qs = qs.annotate(
-                concatenated_values_order=Value(
-                    None, output_field=models.IntegerField()
-                ),
-                concatenated_values=Value(None, output_field=models.CharField()),
-            )
-
-        else:
-            attribute_associations, product_types_associated_to_attribute = zip(
-                *associated_values
-            )
-
-            qs = qs.annotate(
-                # Contains to retrieve the attribute data (singular) of each product
-                # Refer to `AttributeProduct`.
-                filtered_attribute=FilteredRelation(
-                    relation_name="attributes",
-                    condition=Q(attributes__assignment_id__in=attribute_associations),
-                ),
-                # Implicit `GROUP BY` required for the `StringAgg` aggregation
-                grouped_ids=Count("id"),
-                # String aggregation of the attribute's values to efficiently sort them
-                concatenated_values=Case(
-                    # If the product has no association data but has
-                    # the given attribute associated to its product type,
-                    # then consider the concatenated values as empty (non-null).
-                    When(
-                        Q(product_type_id__in=product_types_associated_to_attribute)
-                        & Q(filtered_attribute=None),
-                        then=models.Value(""),
-                    ),
-                    default=StringAgg(
-                        F("filtered_attribute__values__name"),
-                        delimiter=",",
-                        ordering=(
-                            [
-                                f"filtered_attribute__values__{field_name}"
-                                for field_name in AttributeValue._meta.ordering or []
-                            ]
-                        ),
-                    ),
-                    output_field=models.CharField(),
-                ),
-                concatenated_values_order=Case(
-                    # Make the products having no such attribute be last in the sorting
-                    When(concatenated_values=None, then=2),
-                    # Put the products having an empty attribute value at the bottom of
-                    # the other products.
-                    When(concatenated_values="", then=1),
-                    # Put the products having an attribute value to be always at the top
-                    default=0,
-                    output_field=models.IntegerField(),
-                ),
-            )
-
-        # Sort by concatenated_values_order then
-        # Sort each group of products (0, 1, 2, ...) per attribute values
+        # Sort by concatenated_values_order then, the products without the attribute
+        # having null values are last in ascending and first in descending order
+        # Sort each group of products (0, 1, null) per attribute values
         # Sort each group of products by name,
         # if they have the same values or not values
         ordering = "-" if descending else ""
@@ -264,6 +215,8 @@ class Product(SeoModel, ModelWithMetadata, PublishableModel):
     weight = MeasurementField(
         measurement=Weight, unit_choices=WeightUnits.CHOICES, blank=True, null=True
     )
+    search_vector = SearchVectorField(null=True, blank=True)
+
     objects = ProductsQueryset.as_manager()
     translated = TranslationProxy()
 
@@ -273,6 +226,41 @@ class Product(SeoModel, ModelWithMetadata, PublishableModel):
         permissions = (
             (ProductPermissions.MANAGE_PRODUCTS.codename, "Manage products."),
         )
+        indexes = [
+            GinIndex(name="product_search_gin", fields=["search_vector"]),
+            # Composite indexes matching the built-in sorting fields, used by the
+            # row value comparisons of the cursor-based pagination.
+            models.Index(name="product_name_slug_idx", fields=["name", "slug"]),
+            models.Index(
+                name="product_min_price_name_idx",
+                fields=["minimal_variant_price_amount", "name", "slug"],
+            ),
+            models.Index(
+                name="product_updated_name_idx", fields=["updated_at", "name", "slug"]
+            ),
+            models.Index(
+                name="product_published_name_idx",
+                fields=["is_published", "name", "slug"],
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            self.search_vector = prepare_product_search_vector_value(
+                self, already_persisted=False
+            )
+        elif kwargs.get("update_fields") is None:
+            # The search vector is updated by queries once the product's variants
+            # or attributes change, the loaded value may be already outdated
+            deferred_fields = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname not in deferred_fields
+                and field.name != "search_vector"
+            ]
+        super().save(*args, **kwargs)
 
     def __iter__(self):
         if not hasattr(self, "__variants"):
@@ -395,6 +383,7 @@ class ProductVariant(ModelWithMetadata):
     weight = MeasurementField(
         measurement=Weight, unit_choices=WeightUnits.CHOICES, blank=True, null=True
     )
+    updated_at = models.DateTimeField(auto_now=True, null=True)
 
     objects = ProductVariantQueryset.as_manager()
     translated = TranslationProxy()
@@ -572,6 +561,32 @@ class AssignedVariantAttribute(BaseAssignedAttribute):
         unique_together = (("variant", "assignment"),)
 
 
+class ProductAttributeSortKey(models.Model):
+    """Precomputed key used to sort products by values of the given attribute.
+
+    Each product has a key for every attribute of its product type.
+    """
+
+    product = models.ForeignKey(
+        Product, related_name="attribute_sort_keys", on_delete=models.CASCADE
+    )
+    attribute = models.ForeignKey(
+        "Attribute", related_name="+", on_delete=models.CASCADE
+    )
+    # 0 when the product has values of the attribute assigned, 1 otherwise
+    values_order = models.PositiveSmallIntegerField()
+    concatenated_values = models.TextField(blank=True, default="")
+
+    class Meta:
+        unique_together = (("product", "attribute"),)
+        indexes = [
+            models.Index(
+                name="product_attr_sort_key_idx",
+                fields=["attribute", "values_order", "concatenated_values"],
+            )
+        ]
+
+
 class AssociatedAttributeQuerySet(BaseAttributeQuerySet):
     def get_public_attributes(self):
         return self.filter(attribute__visible_in_storefront=True)
@@ -0,0 +1,38 @@
+from typing import Iterable, Iterator
+
+from django.contrib.postgres.search import SearchVector
+from django.db.models import TextField, Value
+
+
+def _get_attribute_values(instance) -> Iterator[str]:
+    for assigned_attribute in instance.attributes.all():
+        for value in assigned_attribute.values.all():
+            yield value.name
+
+
+def _get_search_vector(content: Iterable[str], weight: str) -> SearchVector:
+    text = " ".join(part for part in content if part)
+    return SearchVector(Value(text, output_field=TextField()), weight=weight)
+
+
+def prepare_product_search_vector_value(
+    product, *, already_persisted: bool = True
+) -> SearchVector:
+    """Return the weighted search document of given product.
+
+    The name has the highest weight, followed by variants' SKUs, names and
+    attribute values, while the description has the lowest one.
+    """
+    variants_content = []
+    # Products which are not saved yet have neither attributes nor variants
+    if already_persisted:
+        variants_content.extend(_get_attribute_values(product))
+        for variant in product.variants.all():
+            variants_content.extend([variant.sku, variant.name])
+            variants_content.extend(_get_attribute_values(variant))
+    description_content = [product.description, product.plain_text_description]
+    return (
+        _get_search_vector([product.name], "A")
+        + _get_search_vector(variants_content, "B")
+        + _get_search_vector(description_content, "C")
+    )
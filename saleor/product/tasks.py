@@ -1,14 +1,20 @@
 from typing import Iterable, List, Optional
 
 from ..celeryconf import app
+from ..core.cache import purge_response_cache
 from ..discount.models import Sale
+from ..search.utils import update_products_search_vector
 from .models import Attribute, Product, ProductType, ProductVariant
-from .utils.attributes import generate_name_for_variant
+from .utils.attributes import (
+    generate_name_for_variant,
+    update_products_attribute_sort_keys,
+)
 from .utils.variant_prices import (
+    get_product_id_chunks,
+    get_products_of_catalogues,
+    get_products_of_discount,
     update_product_minimal_variant_price,
     update_products_minimal_variant_prices,
-    update_products_minimal_variant_prices_of_catalogues,
-    update_products_minimal_variant_prices_of_discount,
 )
 
 
@@ -45,6 +51,14 @@ def update_variants_names(product_type_pk: int, saved_attributes_ids: List[int])
 def update_product_minimal_variant_price_task(product_pk: int):
     product = Product.objects.get(pk=product_pk)
     update_product_minimal_variant_price(product)
+    # Tasks run outside of requests, so the changes aren't tracked by the views
+    purge_response_cache(Product._meta.db_table)
+
+
+def _update_products_minimal_variant_prices_in_chunks(products):
+    # Spread the recalculation of large catalogues over many workers
+    for product_ids in get_product_id_chunks(products):
+        update_products_minimal_variant_prices_task.delay(product_ids)
 
 
 @app.task
@@ -53,18 +67,34 @@ def update_products_minimal_variant_prices_of_catalogues_task(
     category_ids: Optional[List[int]] = None,
     collection_ids: Optional[List[int]] = None,
 ):
-    update_products_minimal_variant_prices_of_catalogues(
-        product_ids, category_ids, collection_ids
-    )
+    products = get_products_of_catalogues(product_ids, category_ids, collection_ids)
+    _update_products_minimal_variant_prices_in_chunks(products)
 
 
 @app.task
 def update_products_minimal_variant_prices_of_discount_task(discount_pk: int):
     discount = Sale.objects.get(pk=discount_pk)
-    update_products_minimal_variant_prices_of_discount(discount)
+    _update_products_minimal_variant_prices_in_chunks(
+        get_products_of_discount(discount)
+    )
 
 
 @app.task
 def update_products_minimal_variant_prices_task(product_ids: List[int]):
     products = Product.objects.filter(pk__in=product_ids)
     update_products_minimal_variant_prices(products)
+    purge_response_cache(Product._meta.db_table)
+
+
+@app.task
+def update_products_attribute_sort_keys_task(product_type_ids: List[int]):
+    products = Product.objects.filter(product_type_id__in=product_type_ids)
+    update_products_attribute_sort_keys(products)
+    purge_response_cache(Product._meta.db_table)
+
+
+@app.task
+def update_products_search_vector_task(product_ids: List[int]):
+    products = Product.objects.filter(pk__in=product_ids)
+    update_products_search_vector(products)
+    purge_response_cache(Product._meta.db_table)
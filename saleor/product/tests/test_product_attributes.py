@@ -9,6 +9,9 @@ from ..tasks import _update_variants_names
 from ..utils.attributes import (
     associate_attribute_values_to_instance,
     generate_name_for_variant,
+    get_attributes_lookup,
+    invalidate_attributes_lookup,
+    update_product_attribute_sort_keys,
 )
 
 
@@ -136,3 +139,60 @@ def test_associate_attribute_to_product_instance_without_values(product):
     # Ensure the values were cleared and no new assignment entry was created
     assert new_assignment.pk == old_assignment.pk
     assert new_assignment.values.count() == 0
+
+
+def test_update_product_attribute_sort_keys(
+    product, color_attribute, pink_attribute_value
+):
+    associate_attribute_values_to_instance(
+        product, color_attribute, *color_attribute.values.all()
+    )
+
+    update_product_attribute_sort_keys(product)
+
+    sort_key = product.attribute_sort_keys.get()
+    assert sort_key.attribute == color_attribute
+    assert sort_key.values_order == 0
+    assert sort_key.concatenated_values == "Red,Blue,Pink"
+
+
+def test_update_product_attribute_sort_keys_without_values(product, color_attribute):
+    associate_attribute_values_to_instance(product, color_attribute)
+
+    update_product_attribute_sort_keys(product)
+
+    sort_key = product.attribute_sort_keys.get()
+    assert sort_key.values_order == 1
+    assert sort_key.concatenated_values == ""
+
+
+def test_get_attributes_lookup(
+    color_attribute, size_attribute, django_assert_num_queries
+):
+    expected_lookup = {
+        color_attribute.slug: (
+            color_attribute.pk,
+            {value.slug: value.pk for value in color_attribute.values.all()},
+        )
+    }
+
+    with django_assert_num_queries(2):
+        lookup = get_attributes_lookup([color_attribute.slug, "unknown"])
+    assert lookup == expected_lookup
+
+    # The lookup is cached so the next call doesn't hit the database
+    with django_assert_num_queries(0):
+        lookup = get_attributes_lookup([color_attribute.slug])
+    assert lookup == expected_lookup
+
+
+def test_invalidate_attributes_lookup(color_attribute):
+    get_attributes_lookup([color_attribute.slug])
+    value = color_attribute.values.create(name="Pink", slug="pink")
+
+    invalidate_attributes_lookup(color_attribute.slug)
+
+    _, values_lookup = get_attributes_lookup([color_attribute.slug])[
+        color_attribute.slug
+    ]
+    assert values_lookup["pink"] == value.pk
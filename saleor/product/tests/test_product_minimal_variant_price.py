@@ -5,12 +5,17 @@ from graphql_relay import to_global_id
 from prices import Money
 
 from ...graphql.tests.utils import get_graphql_content
-from ..models import ProductVariant
+from ..models import Product, ProductVariant
 from ..tasks import (
-    update_products_minimal_variant_prices_of_catalogues,
+    update_products_minimal_variant_prices_of_catalogues_task,
     update_products_minimal_variant_prices_task,
 )
-from ..utils.variant_prices import update_product_minimal_variant_price
+from ..utils.variant_prices import (
+    get_product_id_chunks,
+    update_product_minimal_variant_price,
+    update_products_minimal_variant_prices,
+    update_products_minimal_variant_prices_of_catalogues,
+)
 
 
 def test_update_product_minimal_variant_price(product):
@@ -137,6 +142,52 @@ def test_update_products_minimal_variant_prices_task(product_list):
         assert product.minimal_variant_price == price
 
 
+def test_update_products_minimal_variant_prices_in_chunks(
+    product_list, django_assert_num_queries
+):
+    price = Money("0.01", "USD")
+    ProductVariant.objects.filter(product__in=product_list).update(
+        price_amount=price.amount
+    )
+
+    # ids, products, variants, collections and the update for each of the two
+    # chunks, followed by the query returning no more ids
+    with django_assert_num_queries(11):
+        update_products_minimal_variant_prices(
+            Product.objects.all(), discounts=[], chunk_size=2
+        )
+
+    for product in product_list:
+        product.refresh_from_db()
+        assert product.minimal_variant_price == price
+
+
+def test_get_product_id_chunks(product_list):
+    product_ids = sorted(product.pk for product in product_list)
+
+    chunks = list(get_product_id_chunks(Product.objects.all(), chunk_size=2))
+
+    assert chunks == [product_ids[:2], product_ids[2:]]
+
+
+@patch("saleor.product.tasks.update_products_minimal_variant_prices_task.delay")
+@patch("saleor.product.tasks.get_product_id_chunks")
+def test_update_products_minimal_variant_prices_of_catalogues_task_in_chunks(
+    mock_get_product_id_chunks, mock_update_task_delay, product_list, category
+):
+    product_ids = [product.pk for product in product_list]
+    mock_get_product_id_chunks.return_value = iter([product_ids[:2], product_ids[2:]])
+
+    update_products_minimal_variant_prices_of_catalogues_task(
+        category_ids=[category.pk]
+    )
+
+    assert [call.args for call in mock_update_task_delay.call_args_list] == [
+        (product_ids[:2],),
+        (product_ids[2:],),
+    ]
+
+
 def test_product_variant_objects_create_updates_minimal_variant_price(product):
     assert product.minimal_variant_price == Money("10.00", "USD")
     ProductVariant.objects.create(product=product, sku="1", price=Money("1.00", "USD"))
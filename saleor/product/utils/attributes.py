@@ -1,20 +1,36 @@
-from typing import TYPE_CHECKING, Optional, Set, Union
+import hashlib
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple, Union
 
+from django.core.cache import cache
+from django.db import transaction
+
+from ...core.cache import purge_response_cache
 from ..models import (
     AssignedProductAttribute,
     AssignedVariantAttribute,
     Attribute,
+    AttributeProduct,
     AttributeValue,
     Product,
+    ProductAttributeSortKey,
     ProductVariant,
 )
 
 AttributeAssignmentType = Union[AssignedProductAttribute, AssignedVariantAttribute]
 
+# Number of products for which attribute sort keys are updated at once
+ATTRIBUTE_SORT_KEYS_CHUNK_SIZE = 1000
+
+ATTRIBUTE_LOOKUP_CACHE_KEY = "attribute_lookup:{}"
+
+# Attribute's primary key and the primary keys of its values by their slugs
+AttributeLookup = Tuple[int, Dict[str, int]]
+
 
 if TYPE_CHECKING:
     # flake8: noqa
-    from ..models import AttributeProduct, AttributeVariant
+    from ..models import AttributeVariant
 
 
 def generate_name_for_variant(variant: ProductVariant) -> str:
@@ -87,3 +103,115 @@ def associate_attribute_values_to_instance(
     assignment = _associate_attribute_to_instance(instance, attribute.pk)
     assignment.values.set(values)
     return assignment
+
+
+def _prepare_attribute_sort_keys(
+    products: Iterable[Product],
+) -> List[ProductAttributeSortKey]:
+    product_type_ids = {product.product_type_id for product in products}
+    attribute_ids_by_product_type = defaultdict(list)
+    for product_type_id, attribute_id in AttributeProduct.objects.filter(
+        product_type_id__in=product_type_ids
+    ).values_list("product_type_id", "attribute_id"):
+        attribute_ids_by_product_type[product_type_id].append(attribute_id)
+
+    # Values are returned in their default ordering which the sorting follows
+    values_names = defaultdict(list)
+    for product_id, attribute_id, name in AttributeValue.objects.filter(
+        assignedproductattribute__product__in=products
+    ).values_list("assignedproductattribute__product_id", "attribute_id", "name"):
+        values_names[(product_id, attribute_id)].append(name)
+
+    sort_keys = []
+    for product in products:
+        for attribute_id in attribute_ids_by_product_type[product.product_type_id]:
+            names = values_names[(product.pk, attribute_id)]
+            sort_keys.append(
+                ProductAttributeSortKey(
+                    product_id=product.pk,
+                    attribute_id=attribute_id,
+                    values_order=0 if names else 1,
+                    concatenated_values=",".join(names),
+                )
+            )
+    return sort_keys
+
+
+@transaction.atomic
+def _replace_attribute_sort_keys(products: List[Product]):
+    ProductAttributeSortKey.objects.filter(product__in=products).delete()
+    ProductAttributeSortKey.objects.bulk_create(_prepare_attribute_sort_keys(products))
+
+
+def update_product_attribute_sort_keys(product: Product):
+    """Update the attribute sort keys after the product's attributes change."""
+    _replace_attribute_sort_keys([product])
+
+
+def update_products_attribute_sort_keys(
+    products, chunk_size: int = ATTRIBUTE_SORT_KEYS_CHUNK_SIZE
+):
+    """Rebuild attribute sort keys of given products, one chunk at a time.
+
+    Needs to be called for all products of the product types using an attribute
+    whenever the attribute is assigned to or unassigned from the product type
+    or its values are renamed, reordered or deleted.
+    """
+    products = products.order_by("pk").only("pk", "product_type")
+    last_pk = 0
+    while True:
+        chunk = list(products.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return
+        _replace_attribute_sort_keys(chunk)
+        last_pk = chunk[-1].pk
+
+
+def _get_attribute_lookup_cache_key(slug: str) -> str:
+    # Slugs may contain unicode characters which are not valid in some cache keys
+    return ATTRIBUTE_LOOKUP_CACHE_KEY.format(
+        hashlib.md5(slug.encode("utf-8")).hexdigest()
+    )
+
+
+def get_attributes_lookup(slugs: Iterable[str]) -> Dict[str, AttributeLookup]:
+    """Return the primary keys of the attributes and their values by their slugs.
+
+    Lookups are cached per attribute, only the attributes missing in the cache are
+    fetched from the database. Unknown slugs are omitted in the result.
+    """
+    cache_keys = {_get_attribute_lookup_cache_key(slug): slug for slug in slugs}
+    lookup = {
+        cache_keys[cache_key]: attribute_lookup
+        for cache_key, attribute_lookup in cache.get_many(cache_keys).items()
+    }
+    missing_slugs = set(cache_keys.values()) - lookup.keys()
+    if missing_slugs:
+        attributes = Attribute.objects.filter(slug__in=missing_slugs)
+        fetched_lookup = {
+            attribute.slug: (
+                attribute.pk,
+                {value.slug: value.pk for value in attribute.values.all()},
+            )
+            for attribute in attributes.prefetch_related("values")
+        }
+        cache.set_many(
+            {
+                _get_attribute_lookup_cache_key(slug): attribute_lookup
+                for slug, attribute_lookup in fetched_lookup.items()
+            }
+        )
+        lookup.update(fetched_lookup)
+    return lookup
+
+
+def invalidate_attributes_lookup(*slugs: str):
+    """Drop cached lookups after the attributes or their values change."""
+    cache_keys = [_get_attribute_lookup_cache_key(slug) for slug in slugs]
+    cache.delete_many(cache_keys)
+    # Clear the cache again once the changes are visible to other connections,
+    # in case a concurrent request stored the old lookup in the meantime.
+    transaction.on_commit(lambda: cache.delete_many(cache_keys))
+    # Responses of products filtered by attributes resolved from the cached
+    # lookups aren't tagged with the attribute tables.
+    purge_response_cache(Product._meta.db_table)
@@ -9,7 +9,7 @@ from saleor.product.models import Collection, Product, ProductVariant
 
 from ...core.utils import to_local_currency
 from ...discount import DiscountInfo
-from ...discount.utils import calculate_discounted_price
+from ...discount.utils import calculate_discounted_price, calculate_discounted_prices
 from ...plugins.manager import get_plugins_manager
 from ...warehouse.availability import (
     are_all_product_variants_in_stock,
@@ -131,15 +131,12 @@ def get_product_price_range(
 ) -> Optional[MoneyRange]:
     with opentracing.global_tracer().start_active_span("get_product_price_range"):
         if variants:
-            prices = [
-                get_variant_price(
-                    variant=variant,
-                    product=product,
-                    collections=collections,
-                    discounts=discounts,
-                )
-                for variant in variants
-            ]
+            prices = calculate_discounted_prices(
+                product=product,
+                prices=[variant.price for variant in variants],
+                collections=collections,
+                discounts=discounts,
+            )
             return MoneyRange(min(prices), max(prices))
 
         return None
@@ -1,24 +1,29 @@
 import operator
 from functools import reduce
-from typing import Optional
+from typing import Iterator, List, Optional
 
 from django.db.models.query_utils import Q
 from prices import Money
 
-from ...discount.utils import fetch_active_discounts
+from ...discount import DiscountsIndex
+from ...discount.utils import calculate_discounted_prices, fetch_active_discounts
 from ..models import Product
 
+# Number of products loaded and updated at once
+MINIMAL_VARIANT_PRICES_CHUNK_SIZE = 1000
+
 
 def _get_product_minimal_variant_price(product, discounts) -> Optional[Money]:
-    # Start with the product's price as the minimal one
-    minimal_variant_price = None
-    for variant in product.variants.all():
-        variant_price = variant.get_price(discounts=discounts)
-        if minimal_variant_price is None:
-            minimal_variant_price = variant_price
-        else:
-            minimal_variant_price = min(minimal_variant_price, variant_price)
-    return minimal_variant_price
+    variants = product.variants.all()
+    if not variants:
+        return None
+    prices = calculate_discounted_prices(
+        product=product,
+        prices=[variant.price for variant in variants],
+        collections=product.collections.all(),
+        discounts=discounts,
+    )
+    return min(prices)
 
 
 def update_product_minimal_variant_price(product, discounts=None, save=True):
@@ -32,25 +37,53 @@ def update_product_minimal_variant_price(product, discounts=None, save=True):
     return product
 
 
-def update_products_minimal_variant_prices(products, discounts=None):
+def get_product_id_chunks(
+    products, chunk_size: int = MINIMAL_VARIANT_PRICES_CHUNK_SIZE
+) -> Iterator[List[int]]:
+    """Yield ids of given products in chunks of consecutive pks."""
+    product_ids = products.order_by("pk").values_list("pk", flat=True)
+    last_pk = 0
+    while True:
+        chunk = list(product_ids.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1]
+
+
+def update_products_minimal_variant_prices(
+    products, discounts=None, chunk_size: int = MINIMAL_VARIANT_PRICES_CHUNK_SIZE
+):
+    """Recalculate minimal variant prices of given products.
+
+    Products are loaded in chunks ordered by pk together with their variants and
+    collections, and each chunk is saved with a single bulk update, so memory use
+    doesn't grow with the number of products.
+    """
     if discounts is None:
         discounts = fetch_active_discounts()
-    changed_products_to_update = []
-    for product in products:
-        old_minimal_variant_price = product.minimal_variant_price
-        updated_product = update_product_minimal_variant_price(
-            product, discounts, save=False
+    if not isinstance(discounts, DiscountsIndex):
+        discounts = DiscountsIndex(discounts)
+    for product_ids in get_product_id_chunks(products, chunk_size):
+        chunk = Product.objects.filter(pk__in=product_ids).prefetch_related(
+            "variants", "collections"
+        )
+        changed_products_to_update = []
+        for product in chunk:
+            old_minimal_variant_price = product.minimal_variant_price
+            updated_product = update_product_minimal_variant_price(
+                product, discounts, save=False
+            )
+            # Check if the "minimal_variant_price" has changed
+            if updated_product.minimal_variant_price != old_minimal_variant_price:
+                changed_products_to_update.append(updated_product)
+        # Bulk update the changed products
+        Product.objects.bulk_update(
+            changed_products_to_update, ["minimal_variant_price_amount"]
         )
-        # Check if the "minimal_variant_price" has changed
-        if updated_product.minimal_variant_price != old_minimal_variant_price:
-            changed_products_to_update.append(updated_product)
-    # Bulk update the changed products
-    Product.objects.bulk_update(
-        changed_products_to_update, ["minimal_variant_price_amount"]
-    )
 
 
-def update_products_minimal_variant_prices_of_catalogues(
+def get_products_of_catalogues(
     product_ids=None, category_ids=None, collection_ids=None
 ):
     # Building the matching products query
@@ -62,17 +95,27 @@ def update_products_minimal_variant_prices_of_catalogues(
     if collection_ids:
         q_list.append(Q(collectionproduct__collection_id__in=collection_ids))
     # Asserting that the function was called with some ids
-    if q_list:
-        # Querying the products
-        q_or = reduce(operator.or_, q_list)
-        products = Product.objects.filter(q_or).distinct()
-
-        update_products_minimal_variant_prices(products)
+    if not q_list:
+        return Product.objects.none()
+    # Querying the products
+    q_or = reduce(operator.or_, q_list)
+    return Product.objects.filter(q_or).distinct()
 
 
-def update_products_minimal_variant_prices_of_discount(discount):
-    update_products_minimal_variant_prices_of_catalogues(
+def get_products_of_discount(discount):
+    return get_products_of_catalogues(
         product_ids=discount.products.all().values_list("id", flat=True),
         category_ids=discount.categories.all().values_list("id", flat=True),
         collection_ids=discount.collections.all().values_list("id", flat=True),
     )
+
+
+def update_products_minimal_variant_prices_of_catalogues(
+    product_ids=None, category_ids=None, collection_ids=None
+):
+    products = get_products_of_catalogues(product_ids, category_ids, collection_ids)
+    update_products_minimal_variant_prices(products)
+
+
+def update_products_minimal_variant_prices_of_discount(discount):
+    update_products_minimal_variant_prices(get_products_of_discount(discount))
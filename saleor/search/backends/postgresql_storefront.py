@@ -1,4 +1,4 @@
-from django.contrib.postgres.search import TrigramSimilarity
+from django.contrib.postgres.search import SearchQuery, TrigramSimilarity
 from django.db.models import Q
 
 from ...product.models import Product
@@ -8,17 +8,17 @@ def search(phrase):
     """Return matching products for storefront views.
 
     Fuzzy storefront search that is resistant to small typing errors made
-    by user. Name is matched using trigram similarity, description uses
-    standard postgres full text search.
+    by user. Name is matched using trigram similarity, while the name, SKUs,
+    attribute values and description are matched against the stored search
+    document of the product using postgres full text search.
 
     Args:
         phrase (str): searched phrase
 
     """
     name_sim = TrigramSimilarity("name", phrase)
-    ft_in_description = Q(description__search=phrase)
-    ft_by_sku = Q(variants__sku__search=phrase)
+    ft_in_document = Q(search_vector=SearchQuery(phrase))
     name_similar = Q(name_sim__gt=0.2)
     return Product.objects.annotate(name_sim=name_sim).filter(
-        (ft_in_description | name_similar | ft_by_sku)
+        ft_in_document | name_similar
     )
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from ....account.models import User
+from ....order.models import Order
+from ...utils import update_orders_search_document, update_users_search_document
+
+
+class Command(BaseCommand):
+    help = "Rebuild the stored search documents of all orders and users."
+
+    def handle(self, *args, **options):
+        updated_count = update_orders_search_document(Order.objects.all())
+        self.stdout.write(f"Updated search documents of {updated_count} orders.")
+        updated_count = update_users_search_document(User.objects.all())
+        self.stdout.write(f"Updated search documents of {updated_count} users.")
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from ....product.models import Product
+from ...utils import update_products_search_vector
+
+
+class Command(BaseCommand):
+    help = "Rebuild the stored search documents of all products."
+
+    def handle(self, *args, **options):
+        updated_count = update_products_search_vector(Product.objects.all())
+        self.stdout.write(f"Updated search vectors of {updated_count} products.")
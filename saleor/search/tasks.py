@@ -0,0 +1,13 @@
+from django.contrib.auth import get_user_model
+
+from ..celeryconf import app
+from .utils import update_orders_search_document
+
+
+@app.task
+def update_user_orders_search_document_task(user_pk: int):
+    """Rebuild search documents of the orders after their customer changes."""
+    # The user model imports this module, so it can't be imported here
+    user = get_user_model().objects.filter(pk=user_pk).first()
+    if user:
+        update_orders_search_document(user.orders.all())
@@ -0,0 +1,80 @@
+from ..account.search import prepare_user_search_document_value
+from ..order.search import prepare_order_search_document_value
+from ..product.models import Product
+from ..product.search import prepare_product_search_vector_value
+
+PRODUCT_SEARCH_PREFETCH = ("attributes__values", "variants__attributes__values")
+
+# Number of products for which search vectors are updated at once
+PRODUCT_SEARCH_CHUNK_SIZE = 1000
+
+# Number of orders or users for which search documents are updated at once
+SEARCH_DOCUMENT_CHUNK_SIZE = 1000
+
+
+def update_product_search_vector(product: Product):
+    """Update the stored search document after the product or its variants change."""
+    search_vector = prepare_product_search_vector_value(product)
+    Product.objects.filter(pk=product.pk).update(search_vector=search_vector)
+
+
+def update_products_search_vector(
+    products, chunk_size: int = PRODUCT_SEARCH_CHUNK_SIZE
+) -> int:
+    """Rebuild search documents of given products, one chunk at a time.
+
+    Return the number of updated products.
+    """
+    products = products.order_by("pk").prefetch_related(*PRODUCT_SEARCH_PREFETCH)
+    updated_count = 0
+    last_pk = 0
+    while True:
+        chunk = list(products.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return updated_count
+        for product in chunk:
+            product.search_vector = prepare_product_search_vector_value(product)
+        Product.objects.bulk_update(chunk, ["search_vector"])
+        updated_count += len(chunk)
+        last_pk = chunk[-1].pk
+
+
+def _update_search_document(queryset, prepare_value, chunk_size: int) -> int:
+    queryset = queryset.order_by("pk")
+    updated_count = 0
+    last_pk = 0
+    while True:
+        chunk = list(queryset.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return updated_count
+        for instance in chunk:
+            instance.search_document = prepare_value(instance)
+        queryset.model.objects.bulk_update(chunk, ["search_document"])
+        updated_count += len(chunk)
+        last_pk = chunk[-1].pk
+
+
+def update_orders_search_document(
+    orders, chunk_size: int = SEARCH_DOCUMENT_CHUNK_SIZE
+) -> int:
+    """Rebuild search documents of given orders, one chunk at a time.
+
+    Return the number of updated orders.
+    """
+    return _update_search_document(
+        orders.select_related("user"), prepare_order_search_document_value, chunk_size
+    )
+
+
+def update_users_search_document(
+    users, chunk_size: int = SEARCH_DOCUMENT_CHUNK_SIZE
+) -> int:
+    """Rebuild search documents of given users, one chunk at a time.
+
+    Return the number of updated users.
+    """
+    return _update_search_document(
+        users.select_related("default_shipping_address"),
+        prepare_user_search_document_value,
+        chunk_size,
+    )
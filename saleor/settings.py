@@ -484,6 +484,47 @@ REAL_IP_ENVIRON = os.environ.get("REAL_IP_ENVIRON", "REMOTE_ADDR")
 # The maximum length of a graphql query to log in tracings
 OPENTRACING_MAX_QUERY_LENGTH_LOG = 2000
 
+# The number of parsed and validated GraphQL documents kept in memory by each
+# process; set to 0 to disable the cache
+GRAPHQL_QUERY_CACHE_SIZE = int(os.environ.get("GRAPHQL_QUERY_CACHE_SIZE", 1000))
+
+# The number of threads used to execute queries of a batched request concurrently;
+# by default, the operations of a batch are executed one after another
+GRAPHQL_BATCH_MAX_WORKERS = int(os.environ.get("GRAPHQL_BATCH_MAX_WORKERS", 0))
+
+# How long (in seconds) queries registered with Automatic Persisted Queries are kept
+GRAPHQL_PERSISTED_QUERY_TIMEOUT = int(
+    os.environ.get("GRAPHQL_PERSISTED_QUERY_TIMEOUT", 60 * 60 * 24)
+)
+
+# How long (in seconds) responses to queries sent without credentials are cached;
+# responses are purged earlier by mutations writing to the tables they were read
+# from, changes made outside of the API are only picked up once they expire.
+# Set to 0 to disable the cache
+GRAPHQL_RESPONSE_CACHE_TIMEOUT = int(
+    os.environ.get("GRAPHQL_RESPONSE_CACHE_TIMEOUT", 0)
+)
+
+# How long (in seconds) the total counts of paginated querysets are cached; counts
+# aren't invalidated when rows are added or removed, so they may be off until
+# they expire. Set to 0 to disable the cache
+GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT = int(
+    os.environ.get("GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT", 0)
+)
+
+# Querysets expected to return at least this many rows get an estimated total
+# count instead of an exact one; set to 0 to always count exactly
+GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD = int(
+    os.environ.get("GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD", 0)
+)
+
+# How long (in seconds) facet counts of filtered product lists are cached
+PRODUCT_FACETS_CACHE_TIMEOUT = int(os.environ.get("PRODUCT_FACETS_CACHE_TIMEOUT", 60))
+
+# The longest time (in seconds) the active discounts are cached; sales changed
+# outside of the API are only picked up once it expires
+DISCOUNTS_CACHE_TIMEOUT = int(os.environ.get("DISCOUNTS_CACHE_TIMEOUT", 60 * 5))
+
 # Slugs for menus precreated in Django migrations
 DEFAULT_MENUS = {"top_menu_name": "navbar", "bottom_menu_name": "footer"}
 
@@ -506,6 +547,11 @@ GRAPHENE = {
 
 PLUGINS_MANAGER = "saleor.plugins.manager.PluginsManager"
 
+# Deliver all webhooks of an event from a single task, reusing pooled connections
+# and sending HTTP requests in parallel; failed deliveries are retried one by one
+WEBHOOK_BATCH_DELIVERY = get_bool_from_env("WEBHOOK_BATCH_DELIVERY", False)
+WEBHOOK_DELIVERY_MAX_WORKERS = int(os.environ.get("WEBHOOK_DELIVERY_MAX_WORKERS", 10))
+
 PLUGINS = [
     "saleor.plugins.avatax.plugin.AvataxPlugin",
     "saleor.plugins.vatlayer.plugin.VatlayerPlugin",
@@ -575,6 +621,14 @@ JWT_TTL_APP_ACCESS = timedelta(
     seconds=parse(os.environ.get("JWT_TTL_APP_ACCESS", "5 minutes"))
 )
 JWT_TTL_REFRESH = timedelta(seconds=parse(os.environ.get("JWT_TTL_REFRESH", "30 days")))
+# How long (in seconds) users authenticated with JWT and their permissions are
+# cached; entries are dropped earlier when the user or permission groups change.
+# Set to 0 to disable the cache
+JWT_USER_CACHE_TIMEOUT = int(os.environ.get("JWT_USER_CACHE_TIMEOUT", 60 * 5))
+# How long (in seconds) apps authenticated with tokens and their permissions are
+# cached; entries are dropped earlier when the app or the token changes.
+# Set to 0 to disable the cache
+APP_TOKEN_CACHE_TIMEOUT = int(os.environ.get("APP_TOKEN_CACHE_TIMEOUT", 60 * 5))
 
 
 JWT_TTL_REQUEST_EMAIL_CHANGE = timedelta(
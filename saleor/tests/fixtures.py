@@ -13,6 +13,7 @@ import pytz
 from django.conf import settings
 from django.contrib.auth.models import Group, Permission
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from django.core.files import File
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import connection
@@ -187,6 +188,12 @@ def setup_vatlayer(settings):
     return settings
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Objects cached by one test could be rolled back from the database
+    cache.clear()
+
+
 @pytest.fixture(autouse=True)
 def setup_dummy_gateways(settings):
     settings.PLUGINS = [
@@ -1,5 +1,6 @@
 from collections import defaultdict
-from typing import TYPE_CHECKING, Dict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
 
 from django.conf import settings
 from django.db.models import Sum
@@ -12,6 +13,19 @@ if TYPE_CHECKING:
     from ..product.models import Product, ProductVariant
 
 
+@dataclass
+class StockQuantity:
+    """Stock of a variant summed over the warehouses shipping to a country."""
+
+    quantity: int = 0
+    quantity_allocated: int = 0
+    stocks_count: int = 0
+
+    @property
+    def available_quantity(self) -> int:
+        return max(self.quantity - self.quantity_allocated, 0)
+
+
 def _get_quantity_allocated(stocks: StockQuerySet) -> int:
     return stocks.aggregate(
         quantity_allocated=Coalesce(Sum("allocations__quantity_allocated"), 0)
@@ -44,6 +58,72 @@ def check_stock_quantity(variant: "ProductVariant", country_code: str, quantity:
             raise InsufficientStock(variant)
 
 
+def get_stock_quantities(
+    variant_country_pairs: Iterable[Tuple["ProductVariant", str]]
+) -> Dict[Tuple[int, str], StockQuantity]:
+    """Return stock quantities for many variants and countries at once.
+
+    The result is keyed by `(variant_pk, country_code)`. Stocks are fetched with
+    a single grouped query per distinct country instead of separate aggregates
+    for every variant.
+    """
+    variant_ids_by_country: Dict[str, set] = defaultdict(set)
+    for variant, country_code in variant_country_pairs:
+        variant_ids_by_country[country_code].add(variant.pk)
+
+    quantities: Dict[Tuple[int, str], StockQuantity] = {}
+    for country_code, variant_ids in variant_ids_by_country.items():
+        for variant_id in variant_ids:
+            quantities[(variant_id, country_code)] = StockQuantity()
+        stocks = (
+            Stock.objects.for_country(country_code)
+            .filter(product_variant_id__in=variant_ids)
+            .annotate(
+                quantity_allocated=Coalesce(Sum("allocations__quantity_allocated"), 0)
+            )
+            .values_list("product_variant_id", "quantity", "quantity_allocated")
+        )
+        for variant_id, quantity, quantity_allocated in stocks:
+            stock_quantity = quantities[(variant_id, country_code)]
+            stock_quantity.quantity += quantity
+            stock_quantity.quantity_allocated += quantity_allocated
+            stock_quantity.stocks_count += 1
+    return quantities
+
+
+def check_stock_quantity_bulk(
+    variants: List["ProductVariant"], country_code: str, quantities: List[int]
+) -> Dict[int, StockQuantity]:
+    """Validate if there is stock available for given variants in given country.
+
+    Works like `check_stock_quantity` for many variants, using a single query.
+    Raise InsufficientStock for the first variant without enough stock, with the
+    available quantity in the exception context. Otherwise return the stock
+    quantities keyed by variant pk.
+    """
+    tracked = [variant for variant in variants if variant.track_inventory]
+    stock_quantities = get_stock_quantities(
+        (variant, country_code) for variant in tracked
+    )
+    result = {
+        variant_pk: stock_quantity
+        for (variant_pk, _), stock_quantity in stock_quantities.items()
+    }
+    for variant, quantity in zip(variants, quantities):
+        if not variant.track_inventory:
+            continue
+        stock_quantity = result[variant.pk]
+        if (
+            not stock_quantity.stocks_count
+            or quantity > stock_quantity.available_quantity
+        ):
+            raise InsufficientStock(
+                variant,
+                context={"available_quantity": stock_quantity.available_quantity},
+            )
+    return result
+
+
 def get_available_quantity(variant: "ProductVariant", country_code: str) -> int:
     """Return available quantity for given product in given country."""
     stocks = Stock.objects.get_variant_stocks_for_country(country_code, variant)
@@ -1,5 +1,5 @@
 from collections import defaultdict
-from typing import TYPE_CHECKING, Dict
+from typing import TYPE_CHECKING, Dict, Iterable
 
 from django.db import transaction
 from django.db.models import F, Sum
@@ -70,6 +70,76 @@ def allocate_stock(
         raise InsufficientStock(order_line.variant)
 
 
+@transaction.atomic
+def allocate_stocks_for_order(order_lines: Iterable["OrderLine"], country_code: str):
+    """Allocate stocks for all given order lines in given country at once.
+
+    Works like `allocate_stock` called for each line with its whole quantity, but
+    lock for update all stocks of the lines' variants in given country with
+    a single statement ordered by pk, compute the allocations in memory and save
+    them with one `bulk_create`. Lines of variants that don't track inventory are
+    skipped. If there is less quantity in stocks then required for any line raise
+    InsufficientStock exception.
+    """
+    order_lines = [
+        line
+        for line in order_lines
+        if line.variant and line.variant.track_inventory  # type: ignore
+    ]
+    if not order_lines:
+        return
+
+    variant_ids = {line.variant_id for line in order_lines}
+    stocks = list(
+        Stock.objects.select_for_update(of=("self",))
+        .for_country(country_code)
+        .filter(product_variant_id__in=variant_ids)
+        .order_by("pk")
+    )
+
+    quantity_allocation_list = (
+        Allocation.objects.filter(stock__in=stocks, quantity_allocated__gt=0)
+        .values("stock")
+        .annotate(Sum("quantity_allocated"))
+    )
+    quantity_allocation_for_stocks: Dict = defaultdict(int)
+    for allocation in quantity_allocation_list:
+        quantity_allocation_for_stocks[allocation["stock"]] += allocation[
+            "quantity_allocated__sum"
+        ]
+
+    stocks_for_variants = defaultdict(list)
+    for stock in stocks:
+        stocks_for_variants[stock.product_variant_id].append(stock)
+
+    allocations = []
+    for line in order_lines:
+        quantity_allocated = 0
+        for stock in stocks_for_variants[line.variant_id]:
+            quantity_available_in_stock = (
+                stock.quantity - quantity_allocation_for_stocks[stock.pk]
+            )
+            quantity_to_allocate = min(
+                (line.quantity - quantity_allocated), quantity_available_in_stock
+            )
+            if quantity_to_allocate > 0:
+                allocations.append(
+                    Allocation(
+                        order_line=line,
+                        stock=stock,
+                        quantity_allocated=quantity_to_allocate,
+                    )
+                )
+                quantity_allocation_for_stocks[stock.pk] += quantity_to_allocate
+                quantity_allocated += quantity_to_allocate
+                if quantity_allocated == line.quantity:
+                    break
+        if not quantity_allocated == line.quantity:
+            raise InsufficientStock(line.variant)
+
+    Allocation.objects.bulk_create(allocations)
+
+
 @transaction.atomic
 def deallocate_stock(order_line: "OrderLine", quantity: int):
     """Deallocate stocks for given `order_line`.
@@ -5,9 +5,11 @@ from ...core.exceptions import InsufficientStock
 from ..availability import (
     are_all_product_variants_in_stock,
     check_stock_quantity,
+    check_stock_quantity_bulk,
     get_available_quantity,
     get_available_quantity_for_customer,
     get_quantity_allocated,
+    get_stock_quantities,
 )
 from ..models import Allocation, Stock
 
@@ -49,6 +51,56 @@ def test_check_stock_quantity_without_one_stock(variant_with_many_stocks):
     assert check_stock_quantity(variant_with_many_stocks, COUNTRY_CODE, 4) is None
 
 
+def test_check_stock_quantity_bulk(variant_with_many_stocks, product_variant_list):
+    variants = [variant_with_many_stocks] + product_variant_list
+    for variant in product_variant_list:
+        variant.track_inventory = False
+
+    result = check_stock_quantity_bulk(variants, COUNTRY_CODE, [7, 100, 100, 100])
+
+    assert set(result) == {variant_with_many_stocks.pk}
+    assert result[variant_with_many_stocks.pk].available_quantity == 7
+
+
+def test_check_stock_quantity_bulk_out_of_stock(
+    variant_with_many_stocks, order_line_with_allocation_in_many_stocks
+):
+    with pytest.raises(InsufficientStock) as exc:
+        check_stock_quantity_bulk([variant_with_many_stocks], COUNTRY_CODE, [5])
+
+    assert exc.value.item == variant_with_many_stocks
+    assert exc.value.context == {"available_quantity": 4}
+
+
+def test_check_stock_quantity_bulk_without_stocks(variant_with_many_stocks):
+    variant_with_many_stocks.stocks.all().delete()
+    with pytest.raises(InsufficientStock):
+        check_stock_quantity_bulk([variant_with_many_stocks], COUNTRY_CODE, [1])
+
+
+def test_get_stock_quantities(
+    variant_with_many_stocks,
+    order_line_with_allocation_in_many_stocks,
+    product_variant_list,
+    django_assert_num_queries,
+):
+    pairs = [(variant_with_many_stocks, COUNTRY_CODE)] + [
+        (variant, COUNTRY_CODE) for variant in product_variant_list
+    ]
+
+    with django_assert_num_queries(1):
+        quantities = get_stock_quantities(pairs)
+
+    stock_quantity = quantities[(variant_with_many_stocks.pk, COUNTRY_CODE)]
+    assert stock_quantity.stocks_count == 2
+    assert stock_quantity.available_quantity == get_available_quantity(
+        variant_with_many_stocks, COUNTRY_CODE
+    )
+    assert stock_quantity.quantity_allocated == get_quantity_allocated(
+        variant_with_many_stocks, COUNTRY_CODE
+    )
+
+
 def test_get_available_quantity_without_allocation(order_line, stock):
     assert not Allocation.objects.filter(order_line=order_line, stock=stock).exists()
     available_quantity = get_available_quantity(order_line.variant, COUNTRY_CODE)
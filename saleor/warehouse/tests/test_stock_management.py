@@ -3,8 +3,10 @@ from django.db.models import Sum
 from django.db.models.functions import Coalesce
 
 from ...core.exceptions import InsufficientStock
+from ...order.models import OrderLine
 from ..management import (
     allocate_stock,
+    allocate_stocks_for_order,
     deallocate_stock,
     deallocate_stock_for_order,
     decrease_stock,
@@ -81,6 +83,49 @@ def test_allocate_stock_insufficient_stocks(order_line, variant_with_many_stocks
     ).exists()
 
 
+def test_allocate_stocks_for_order(order_with_lines):
+    Allocation.objects.filter(order_line__order=order_with_lines).delete()
+    lines = list(order_with_lines.lines.all())
+
+    allocate_stocks_for_order(lines, COUNTRY_CODE)
+
+    for line in lines:
+        allocation = Allocation.objects.get(order_line=line)
+        assert allocation.quantity_allocated == line.quantity
+
+
+def test_allocate_stocks_for_order_lines_of_same_variant(
+    order_line, variant_with_many_stocks
+):
+    second_line = OrderLine.objects.get(pk=order_line.pk)
+    second_line.pk = None
+    second_line.quantity = 3
+    second_line.save()
+    order_line.quantity = 4
+    order_line.save(update_fields=["quantity"])
+
+    allocate_stocks_for_order([order_line, second_line], COUNTRY_CODE)
+
+    stocks = variant_with_many_stocks.stocks.all()
+    allocations = Allocation.objects.filter(stock__in=stocks).order_by("stock__pk")
+    assert [
+        (allocation.order_line, allocation.quantity_allocated)
+        for allocation in allocations
+    ] == [(order_line, 4), (second_line, 3)]
+
+
+def test_allocate_stocks_for_order_insufficient_stocks(order_with_lines):
+    line = order_with_lines.lines.last()
+    Allocation.objects.exclude(order_line=line).delete()
+    allocations_count = Allocation.objects.count()
+
+    with pytest.raises(InsufficientStock) as exc:
+        allocate_stocks_for_order(order_with_lines.lines.all(), COUNTRY_CODE)
+
+    assert exc.value.item == line.variant
+    assert Allocation.objects.count() == allocations_count
+
+
 def test_deallocate_stock(allocation):
     stock = allocation.stock
     stock.quantity = 100
@@ -21,6 +21,7 @@ class PayloadSerializer(JSONSerializer):
         self.additional_fields = {}
         self.extra_dict_data = {}
         self.obj_id_name = "id"
+        self.python_serializer = PythonSerializer()
 
     def serialize(self, queryset, **options):
         self.additional_fields = options.pop("additional_fields", {})
@@ -45,7 +46,7 @@ class PayloadSerializer(JSONSerializer):
             [("type", str(obj._meta.object_name)), (self.obj_id_name, obj_id)]
         )
         # Evaluate and add the "additional fields"
-        python_serializer = PythonSerializer()
+        python_serializer = self.python_serializer
         for field_name, (qs, fields) in self.additional_fields.items():
             data_to_serialize = qs(obj)
             if not data_to_serialize:
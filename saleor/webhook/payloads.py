@@ -1,7 +1,7 @@
 import json
-from typing import Optional
+from typing import Iterable, Optional
 
-from django.db.models import QuerySet
+from django.db.models import QuerySet, prefetch_related_objects
 
 from ..account.models import User
 from ..checkout.models import Checkout
@@ -55,7 +55,32 @@ ORDER_FIELDS = (
 )
 
 
+ORDER_PREFETCH_LOOKUPS = (
+    "shipping_method",
+    "lines",
+    "payments",
+    "shipping_address",
+    "billing_address",
+    "fulfillments",
+)
+
+PRODUCT_PREFETCH_LOOKUPS = ("category", "collections", "variants")
+
+
 def generate_order_payload(order: "Order"):
+    return generate_orders_payload([order])
+
+
+def generate_orders_payload(orders: Iterable["Order"]):
+    """Serialize many orders at once.
+
+    Relations included in the payload are prefetched for all orders together,
+    so the number of queries doesn't depend on the number of orders. A single
+    order is left as is, to not cache its relations on the instance.
+    """
+    orders = list(orders)
+    if len(orders) > 1:
+        prefetch_related_objects(orders, *ORDER_PREFETCH_LOOKUPS)
     serializer = PayloadSerializer()
     fulfillment_fields = ("status", "tracking_number", "created")
     payment_fields = (
@@ -95,7 +120,7 @@ def generate_order_payload(order: "Order"):
     )
     shipping_method_fields = ("name", "type", "currency", "price_amount")
     order_data = serializer.serialize(
-        [order],
+        orders,
         fields=ORDER_FIELDS,
         additional_fields={
             "shipping_method": (lambda o: o.shipping_method, shipping_method_fields),
@@ -183,6 +208,14 @@ def generate_customer_payload(customer: "User"):
 
 
 def generate_product_payload(product: "Product"):
+    return generate_products_payload([product])
+
+
+def generate_products_payload(products: Iterable["Product"]):
+    """Serialize many products at once, prefetching their relations together."""
+    products = list(products)
+    if len(products) > 1:
+        prefetch_related_objects(products, *PRODUCT_PREFETCH_LOOKUPS)
     serializer = PayloadSerializer()
 
     product_fields = (
@@ -212,7 +245,7 @@ def generate_product_payload(product: "Product"):
         "metadata",
     )
     product_payload = serializer.serialize(
-        [product],
+        products,
         fields=product_fields,
         additional_fields={
             "category": (lambda p: p.category, ("name", "slug")),
@@ -276,14 +309,7 @@ def _get_sample_object(qs: QuerySet):
 
 
 def _generate_sample_order_payload(event_name):
-    order_qs = Order.objects.prefetch_related(
-        "payments",
-        "lines",
-        "shipping_method",
-        "shipping_address",
-        "billing_address",
-        "fulfillments",
-    )
+    order_qs = Order.objects.prefetch_related(*ORDER_PREFETCH_LOOKUPS)
     order = None
     if event_name == WebhookEventType.ORDER_CREATED:
         order = _get_sample_object(order_qs.filter(status=OrderStatus.UNFULFILLED))
@@ -316,7 +342,7 @@ def generate_sample_payload(event_name: str) -> Optional[dict]:
         payload = generate_customer_payload(user)
     elif event_name == WebhookEventType.PRODUCT_CREATED:
         product = _get_sample_object(
-            Product.objects.prefetch_related("category", "collections", "variants")
+            Product.objects.prefetch_related(*PRODUCT_PREFETCH_LOOKUPS)
         )
         payload = generate_product_payload(product) if product else None
     elif event_name in checkout_events:
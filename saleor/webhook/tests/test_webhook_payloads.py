@@ -2,7 +2,16 @@ import json
 
 import graphene
 
-from ..payloads import ORDER_FIELDS, generate_order_payload
+from ...order.models import Order
+from ...product.models import Product
+from ..payloads import (
+    ORDER_FIELDS,
+    ORDER_PREFETCH_LOOKUPS,
+    PRODUCT_PREFETCH_LOOKUPS,
+    generate_order_payload,
+    generate_orders_payload,
+    generate_products_payload,
+)
 
 
 def test_generate_order_payload(
@@ -24,3 +33,38 @@ def test_generate_order_payload(
     assert payload.get("shipping_address")
     assert payload.get("billing_address")
     assert payload.get("fulfillments")
+
+
+def test_generate_orders_payload(
+    order_with_lines, order_list, payment_txn_captured, django_assert_max_num_queries
+):
+    orders = list(
+        Order.objects.filter(pk__in=[order_with_lines.pk] + [o.pk for o in order_list])
+    )
+
+    # at most one query per prefetched relation, regardless of the number of orders
+    with django_assert_max_num_queries(len(ORDER_PREFETCH_LOOKUPS)):
+        payload = json.loads(generate_orders_payload(orders))
+
+    assert {data["id"] for data in payload} == {
+        graphene.Node.to_global_id("Order", order.id) for order in orders
+    }
+    lines_by_order_id = {data["id"]: len(data["lines"]) for data in payload}
+    order_with_lines_id = graphene.Node.to_global_id("Order", order_with_lines.id)
+    assert lines_by_order_id[order_with_lines_id] == order_with_lines.lines.count()
+
+
+def test_generate_products_payload(
+    product, product_with_two_variants, django_assert_max_num_queries
+):
+    products = Product.objects.filter(pk__in=[product.pk, product_with_two_variants.pk])
+
+    # the products are fetched by the first query
+    with django_assert_max_num_queries(len(PRODUCT_PREFETCH_LOOKUPS) + 1):
+        payload = json.loads(generate_products_payload(products))
+
+    variants_by_product_id = {data["id"]: len(data["variants"]) for data in payload}
+    assert variants_by_product_id == {
+        graphene.Node.to_global_id("Product", product.id): 1,
+        graphene.Node.to_global_id("Product", product_with_two_variants.id): 2,
+    }
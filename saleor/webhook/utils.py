@@ -0,0 +1,48 @@
+from typing import Set
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .event_types import WebhookEventType
+from .models import WebhookEvent
+
+WEBHOOK_SUBSCRIPTIONS_CACHE_KEY = "webhook_subscribed_event_types"
+# Subscriptions changed through the API are invalidated right away, the timeout
+# only bounds how long changes made outside of it can go unnoticed
+WEBHOOK_SUBSCRIPTIONS_CACHE_TIMEOUT = 60 * 5
+
+
+def get_subscribed_event_types() -> Set[str]:
+    """Return event types of all active webhooks that belong to active apps."""
+    event_types = cache.get(WEBHOOK_SUBSCRIPTIONS_CACHE_KEY)
+    if event_types is None:
+        event_types = set(
+            WebhookEvent.objects.filter(
+                webhook__is_active=True, webhook__app__is_active=True
+            )
+            .values_list("event_type", flat=True)
+            .distinct()
+        )
+        cache.set(
+            WEBHOOK_SUBSCRIPTIONS_CACHE_KEY,
+            event_types,
+            WEBHOOK_SUBSCRIPTIONS_CACHE_TIMEOUT,
+        )
+    return event_types
+
+
+def is_event_subscribed(event_type: str) -> bool:
+    """Check if any webhook may be interested in the given event.
+
+    App permissions are not taken into account, the final list of webhooks
+    to call is resolved when the event is triggered.
+    """
+    event_types = get_subscribed_event_types()
+    return event_type in event_types or WebhookEventType.ANY in event_types
+
+
+def invalidate_webhook_subscriptions_cache():
+    cache.delete(WEBHOOK_SUBSCRIPTIONS_CACHE_KEY)
+    # Clear the cache again once the changes are visible to other connections,
+    # in case a concurrent request stored the old subscriptions in the meantime.
+    transaction.on_commit(lambda: cache.delete(WEBHOOK_SUBSCRIPTIONS_CACHE_KEY))